@@ -26,7 +26,7 @@ final class AppConfig
 
         $stmt = Db::connection()->prepare(
             'INSERT INTO app_config (singleton, ui_skin) VALUES (1, :ui_skin) '
-            . 'ON DUPLICATE KEY UPDATE ui_skin = VALUES(ui_skin)'
+            . 'ON DUPLICATE KEY UPDATE ui_skin = VALUES(ui_skin), config_version = config_version + 1'
         );
         $stmt->execute(['ui_skin' => $normalized]);
     }
@@ -50,7 +50,7 @@ final class AppConfig
 
         $stmt = Db::connection()->prepare(
             'INSERT INTO app_config (singleton, locale) VALUES (1, :locale) '
-            . 'ON DUPLICATE KEY UPDATE locale = VALUES(locale)'
+            . 'ON DUPLICATE KEY UPDATE locale = VALUES(locale), config_version = config_version + 1'
         );
         $stmt->execute(['locale' => $normalized]);
     }
@@ -77,7 +77,7 @@ final class AppConfig
         $stmt = Db::connection()->prepare(
             'INSERT INTO app_config (singleton, artist_discovery_enabled) '
             . 'VALUES (1, :enabled) '
-            . 'ON DUPLICATE KEY UPDATE artist_discovery_enabled = VALUES(artist_discovery_enabled)'
+            . 'ON DUPLICATE KEY UPDATE artist_discovery_enabled = VALUES(artist_discovery_enabled), config_version = config_version + 1'
         );
         $stmt->execute(['enabled' => $enabled ? 1 : 0]);
     }
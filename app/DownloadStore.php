@@ -4,26 +4,6 @@ declare(strict_types=1);
 
 final class DownloadStore
 {
-    private static function jobsDir(): string
-    {
-        $dir = project_root() . '/.download_jobs';
-        if (!is_dir($dir) && !mkdir($dir, 0775, true) && !is_dir($dir)) {
-            throw new RuntimeException('Could not create download jobs directory.');
-        }
-
-        return $dir;
-    }
-
-    private static function jobPath(string $jobId): string
-    {
-        $safeId = preg_replace('/[^a-zA-Z0-9-]/', '', $jobId) ?? '';
-        if ($safeId === '') {
-            throw new InvalidArgumentException('Invalid job id.');
-        }
-
-        return self::jobsDir() . '/' . $safeId . '.json';
-    }
-
     private static function resolvePythonExecutable(): string
     {
         $root = project_root();
@@ -106,25 +86,10 @@ PY;
             );
         }
 
-        $jobId = self::generateUuid();
-        $now = gmdate('c');
-        $job = [
-            'job_id' => $jobId,
-            'status' => 'running',
-            'phase' => 'queued',
-            'message' => 'Preparing download…',
+        $jobId = JobStore::create('download', 'Preparing download…', [
             'track_total' => $trackCount,
             'output_dir' => $outputDir,
-            'created_at' => $now,
-            'updated_at' => $now,
-            'result' => null,
-            'error' => null,
-        ];
-
-        $path = self::jobPath($jobId);
-        if (file_put_contents($path, json_encode($job, JSON_UNESCAPED_UNICODE | JSON_UNESCAPED_SLASHES)) === false) {
-            throw new RuntimeException('Could not create download job.');
-        }
+        ]);
 
         $python = self::resolvePythonExecutable();
         $root = project_root();
@@ -144,26 +109,6 @@ PY;
     /** @return array<string, mixed>|null */
     public static function status(string $jobId): ?array
     {
-        $path = self::jobPath($jobId);
-        if (!is_readable($path)) {
-            return null;
-        }
-
-        $raw = file_get_contents($path);
-        if ($raw === false || trim($raw) === '') {
-            return null;
-        }
-
-        $job = json_decode($raw, true);
-        return is_array($job) ? $job : null;
-    }
-
-    private static function generateUuid(): string
-    {
-        $data = random_bytes(16);
-        $data[6] = chr((ord($data[6]) & 0x0f) | 0x40);
-        $data[8] = chr((ord($data[8]) & 0x3f) | 0x80);
-
-        return vsprintf('%s%s-%s-%s-%s-%s%s%s', str_split(bin2hex($data), 4));
+        return JobStore::load('download', $jobId);
     }
 }
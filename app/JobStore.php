@@ -0,0 +1,185 @@
+<?php
+
+declare(strict_types=1);
+
+/**
+ * Rows of the job table shared with spotify_playlist/job_queue.py: indexed
+ * columns plus a JSON `state` column holding the progress fields.
+ */
+final class JobStore
+{
+    private const RETENTION_DAYS = 7;
+
+    /** Columns stored outside the JSON state. */
+    private const COLUMNS = ['job_id', 'kind', 'status', 'worker_pid', 'created_at', 'updated_at'];
+
+    private static bool $schemaChecked = false;
+
+    private static function ensureSchema(): void
+    {
+        if (self::$schemaChecked) {
+            return;
+        }
+
+        Db::connection()->exec(
+            'CREATE TABLE IF NOT EXISTS job ('
+            . 'job_id CHAR(36) CHARACTER SET ascii NOT NULL PRIMARY KEY, '
+            . 'kind VARCHAR(16) CHARACTER SET ascii NOT NULL, '
+            . 'status VARCHAR(16) CHARACTER SET ascii NOT NULL, '
+            . 'worker_pid INT UNSIGNED NULL, '
+            . 'state MEDIUMTEXT NOT NULL, '
+            . 'created_at DATETIME(6) NOT NULL, '
+            . 'updated_at DATETIME(6) NOT NULL, '
+            . 'KEY idx_job_kind_status (kind, status, updated_at), '
+            . 'KEY idx_job_status_updated (status, updated_at)'
+            . ') ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci'
+        );
+        self::$schemaChecked = true;
+    }
+
+    private static function now(): string
+    {
+        return (new DateTimeImmutable('now', new DateTimeZone('UTC')))->format('Y-m-d H:i:s.u');
+    }
+
+    /**
+     * @param array<string, mixed> $fields
+     */
+    public static function create(string $kind, string $message, array $fields = []): string
+    {
+        self::ensureSchema();
+        self::deleteFinished();
+
+        $state = array_merge([
+            'phase' => 'queued',
+            'message' => $message,
+            'result' => null,
+            'error' => null,
+        ], array_diff_key($fields, array_flip(self::COLUMNS)));
+
+        $jobId = self::generateUuid();
+        $now = self::now();
+        $stmt = Db::connection()->prepare(
+            'INSERT INTO job (job_id, kind, status, worker_pid, state, created_at, updated_at) '
+            . "VALUES (:job_id, :kind, 'running', NULL, :state, :created_at, :updated_at)"
+        );
+        $stmt->execute([
+            'job_id' => $jobId,
+            'kind' => $kind,
+            'state' => json_encode($state, JSON_UNESCAPED_UNICODE | JSON_UNESCAPED_SLASHES),
+            'created_at' => $now,
+            'updated_at' => $now,
+        ]);
+
+        return $jobId;
+    }
+
+    /** @return array<string, mixed>|null */
+    public static function load(string $kind, string $jobId): ?array
+    {
+        self::ensureSchema();
+        $stmt = Db::connection()->prepare('SELECT * FROM job WHERE job_id = :job_id AND kind = :kind');
+        $stmt->execute(['job_id' => $jobId, 'kind' => $kind]);
+        $row = $stmt->fetch();
+
+        return is_array($row) ? self::fromRow($row) : null;
+    }
+
+    /** @return list<array<string, mixed>> Running jobs of $kind, most recently updated first. */
+    public static function findRunning(string $kind): array
+    {
+        self::ensureSchema();
+        $stmt = Db::connection()->prepare(
+            "SELECT * FROM job WHERE kind = :kind AND status = 'running' ORDER BY updated_at DESC"
+        );
+        $stmt->execute(['kind' => $kind]);
+
+        return array_map([self::class, 'fromRow'], $stmt->fetchAll());
+    }
+
+    /** Mark a running job as failed; a job that already finished is left alone. */
+    public static function fail(string $jobId, string $message): void
+    {
+        self::ensureSchema();
+        $pdo = Db::connection();
+        $pdo->beginTransaction();
+        try {
+            $stmt = $pdo->prepare(
+                "SELECT state FROM job WHERE job_id = :job_id AND status = 'running' FOR UPDATE"
+            );
+            $stmt->execute(['job_id' => $jobId]);
+            $row = $stmt->fetch();
+            if (!is_array($row)) {
+                $pdo->rollBack();
+                return;
+            }
+
+            $state = json_decode((string) $row['state'], true);
+            $state = is_array($state) ? $state : [];
+            $state['phase'] = 'error';
+            $state['message'] = $message;
+            $state['error'] = $message;
+
+            $stmt = $pdo->prepare(
+                "UPDATE job SET status = 'error', state = :state, updated_at = :updated_at "
+                . 'WHERE job_id = :job_id'
+            );
+            $stmt->execute([
+                'state' => json_encode($state, JSON_UNESCAPED_UNICODE | JSON_UNESCAPED_SLASHES),
+                'updated_at' => self::now(),
+                'job_id' => $jobId,
+            ]);
+            $pdo->commit();
+        } catch (Throwable $e) {
+            $pdo->rollBack();
+            throw $e;
+        }
+    }
+
+    private static function deleteFinished(): void
+    {
+        $cutoff = (new DateTimeImmutable('now', new DateTimeZone('UTC')))
+            ->modify('-' . self::RETENTION_DAYS . ' days')
+            ->format('Y-m-d H:i:s.u');
+        $stmt = Db::connection()->prepare(
+            "DELETE FROM job WHERE status <> 'running' AND updated_at < :cutoff"
+        );
+        $stmt->execute(['cutoff' => $cutoff]);
+    }
+
+    /**
+     * @param array<string, mixed> $row
+     * @return array<string, mixed>
+     */
+    private static function fromRow(array $row): array
+    {
+        $job = json_decode((string) ($row['state'] ?? ''), true);
+        $job = is_array($job) ? $job : [];
+        $job['job_id'] = $row['job_id'];
+        $job['kind'] = $row['kind'];
+        $job['status'] = $row['status'];
+        $job['worker_pid'] = $row['worker_pid'] !== null ? (int) $row['worker_pid'] : null;
+        $job['created_at'] = self::isoTimestamp($row['created_at'] ?? null);
+        $job['updated_at'] = self::isoTimestamp($row['updated_at'] ?? null);
+
+        return $job;
+    }
+
+    private static function isoTimestamp(mixed $value): ?string
+    {
+        if (!is_string($value) || $value === '') {
+            return null;
+        }
+
+        return str_replace(' ', 'T', $value) . 'Z';
+    }
+
+    private static function generateUuid(): string
+    {
+        $data = random_bytes(16);
+        $data[6] = chr((ord($data[6]) & 0x0f) | 0x40);
+        $data[8] = chr((ord($data[8]) & 0x3f) | 0x80);
+
+        return vsprintf('%s%s-%s-%s-%s-%s%s%s', str_split(bin2hex($data), 4));
+    }
+}
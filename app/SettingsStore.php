@@ -438,7 +438,7 @@ final class SettingsStore
 
             $stmt = $pdo->prepare(
                 'INSERT INTO app_config (singleton, destination_playlist_ref_id) VALUES (1, :playlist_ref_id) '
-                . 'ON DUPLICATE KEY UPDATE destination_playlist_ref_id = VALUES(destination_playlist_ref_id)'
+                . 'ON DUPLICATE KEY UPDATE destination_playlist_ref_id = VALUES(destination_playlist_ref_id), config_version = config_version + 1'
             );
             $stmt->execute(['playlist_ref_id' => $destinationRefId]);
 
@@ -590,7 +590,7 @@ final class SettingsStore
                 'INSERT INTO app_config (singleton, sync_start_date, sync_start_updated) '
                 . 'VALUES (1, NULL, :sync_start_updated) '
                 . 'ON DUPLICATE KEY UPDATE sync_start_date = NULL, '
-                . 'sync_start_updated = VALUES(sync_start_updated)'
+                . 'sync_start_updated = VALUES(sync_start_updated), config_version = config_version + 1'
             );
             $stmt->execute(['sync_start_updated' => $now]);
             return;
@@ -605,7 +605,7 @@ final class SettingsStore
             'INSERT INTO app_config (singleton, sync_start_date, sync_start_updated) '
             . 'VALUES (1, :sync_start_date, :sync_start_updated) '
             . 'ON DUPLICATE KEY UPDATE sync_start_date = VALUES(sync_start_date), '
-            . 'sync_start_updated = VALUES(sync_start_updated)'
+            . 'sync_start_updated = VALUES(sync_start_updated), config_version = config_version + 1'
         );
         $stmt->execute([
             'sync_start_date' => date('Y-m-d 00:00:00', $timestamp),
@@ -639,7 +639,7 @@ final class SettingsStore
                 'INSERT INTO app_config (singleton, tracking_start_date, tracking_start_updated) '
                 . 'VALUES (1, NULL, :tracking_start_updated) '
                 . 'ON DUPLICATE KEY UPDATE tracking_start_date = NULL, '
-                . 'tracking_start_updated = VALUES(tracking_start_updated)'
+                . 'tracking_start_updated = VALUES(tracking_start_updated), config_version = config_version + 1'
             );
             $stmt->execute(['tracking_start_updated' => $now]);
             return;
@@ -654,7 +654,7 @@ final class SettingsStore
             'INSERT INTO app_config (singleton, tracking_start_date, tracking_start_updated) '
             . 'VALUES (1, :tracking_start_date, :tracking_start_updated) '
             . 'ON DUPLICATE KEY UPDATE tracking_start_date = VALUES(tracking_start_date), '
-            . 'tracking_start_updated = VALUES(tracking_start_updated)'
+            . 'tracking_start_updated = VALUES(tracking_start_updated), config_version = config_version + 1'
         );
         $stmt->execute([
             'tracking_start_date' => date('Y-m-d 00:00:00', $timestamp),
@@ -689,6 +689,7 @@ final class SettingsStore
         self::ensureAppConfigColumn($pdo, 'sync_start_updated', 'DATETIME NULL');
         self::ensureAppConfigColumn($pdo, 'locale', "VARCHAR(16) NOT NULL DEFAULT 'en'");
         self::ensureAppConfigColumn($pdo, 'artist_discovery_enabled', 'TINYINT(1) NOT NULL DEFAULT 1');
+        self::ensureAppConfigColumn($pdo, 'config_version', 'INT UNSIGNED NOT NULL DEFAULT 0');
 
         $pdo->exec(
             'CREATE TABLE IF NOT EXISTS playlist_source ('
@@ -1,62 +1,163 @@
-"""Storage facade: MySQL persistence for playlists, tracks, and URLs."""
+"""Storage facade: MySQL or SQLite persistence for playlists, tracks, and URLs."""
 from __future__ import annotations
 
+import os
+
 from store_common import normalize_reference_url
-from mysql_store import (  # noqa: F401
-    backfill_playlist_names,
-    create_new_track,
-    delete_new_track,
-    get_connection,
-    increment_new_track_copy_title_count,
-    load_genre_images,
-    load_historical_data,
-    load_new_tracks,
-    load_playlists,
-    load_playlists_config,
-    load_sync_start_date,
-    load_tracking_start_date,
-    load_ui_skin,
-    load_locale,
-    load_artist_discovery_enabled,
-    resolve_genre_image,
-    save_genre_image,
-    save_historical_data,
-    save_new_tracks,
-    save_playlists_config,
-    resolve_sync_days_back,
-    resolve_sync_since_date,
-    save_sync_start_date,
-    save_tracking_start_date,
-    save_ui_skin,
-    save_locale,
-    save_artist_discovery_enabled,
-    strip_radio_suffixes_from_db,
-    update_new_track_reference_url,
-    upsert_playlist,
-)
+
+# DB_BACKEND=sqlite keeps everything in one local file (see sqlite_store); default is MySQL.
+DB_BACKEND = (os.environ.get("DB_BACKEND") or "mysql").strip().lower()
+if DB_BACKEND not in ("mysql", "sqlite"):
+    raise ValueError(f"Unknown DB_BACKEND {DB_BACKEND!r}; expected 'mysql' or 'sqlite'")
+
+if DB_BACKEND == "sqlite":
+    from sqlite_store import (  # noqa: F401
+        NewTrack,
+        backfill_playlist_names,
+        create_job,
+        create_new_track,
+        delete_finished_jobs,
+        delete_new_track,
+        get_connection,
+        increment_new_track_copy_title_count,
+        iter_historical_track_ids,
+        iter_new_tracks,
+        load_genre_counts,
+        load_genre_images,
+        load_historical_data,
+        load_historical_other_uris,
+        load_job,
+        load_new_tracks,
+        load_playlists,
+        load_playlists_config,
+        load_playlist_membership,
+        load_playlist_names,
+        load_playlist_snapshots,
+        load_running_jobs,
+        load_sync_start_date,
+        load_tracking_start_date,
+        load_ui_skin,
+        load_locale,
+        load_artist_discovery_enabled,
+        load_artist_release_catalog,
+        resolve_genre_image,
+        save_genre_image,
+        save_historical_changes,
+        save_historical_data,
+        save_new_tracks,
+        save_playlists_config,
+        save_playlist_membership,
+        save_playlist_snapshots,
+        query_new_tracks,
+        resolve_sync_days_back,
+        resolve_sync_since_date,
+        save_sync_start_date,
+        save_tracking_start_date,
+        save_ui_skin,
+        save_locale,
+        save_artist_discovery_enabled,
+        save_artist_release_catalog,
+        search_new_tracks,
+        store_session,
+        strip_radio_suffixes_from_db,
+        update_job,
+        update_new_track_reference_url,
+        upsert_playlist,
+    )
+else:
+    from mysql_store import (  # noqa: F401
+        NewTrack,
+        backfill_playlist_names,
+        create_job,
+        create_new_track,
+        delete_finished_jobs,
+        delete_new_track,
+        get_connection,
+        increment_new_track_copy_title_count,
+        iter_historical_track_ids,
+        iter_new_tracks,
+        load_genre_counts,
+        load_genre_images,
+        load_historical_data,
+        load_historical_other_uris,
+        load_job,
+        load_new_tracks,
+        load_playlists,
+        load_playlists_config,
+        load_playlist_membership,
+        load_playlist_names,
+        load_playlist_snapshots,
+        load_running_jobs,
+        load_sync_start_date,
+        load_tracking_start_date,
+        load_ui_skin,
+        load_locale,
+        load_artist_discovery_enabled,
+        load_artist_release_catalog,
+        resolve_genre_image,
+        save_genre_image,
+        save_historical_changes,
+        save_historical_data,
+        save_new_tracks,
+        save_playlists_config,
+        save_playlist_membership,
+        save_playlist_snapshots,
+        query_new_tracks,
+        resolve_sync_days_back,
+        resolve_sync_since_date,
+        save_sync_start_date,
+        save_tracking_start_date,
+        save_ui_skin,
+        save_locale,
+        save_artist_discovery_enabled,
+        save_artist_release_catalog,
+        search_new_tracks,
+        store_session,
+        strip_radio_suffixes_from_db,
+        update_job,
+        update_new_track_reference_url,
+        upsert_playlist,
+    )
 
 __all__ = [
+    "NewTrack",
     "backfill_playlist_names",
+    "create_job",
     "create_new_track",
+    "delete_finished_jobs",
     "delete_new_track",
     "get_connection",
     "increment_new_track_copy_title_count",
+    "iter_historical_track_ids",
+    "iter_new_tracks",
+    "load_genre_counts",
     "load_genre_images",
     "load_historical_data",
+    "load_historical_other_uris",
+    "load_job",
     "load_new_tracks",
     "load_playlists",
     "load_playlists_config",
+    "load_playlist_membership",
+    "load_playlist_names",
+    "load_playlist_snapshots",
+    "load_running_jobs",
     "load_sync_start_date",
     "load_tracking_start_date",
     "load_ui_skin",
     "load_locale",
     "load_artist_discovery_enabled",
+    "load_artist_release_catalog",
     "normalize_reference_url",
     "resolve_genre_image",
     "save_genre_image",
+    "save_historical_changes",
     "save_historical_data",
     "save_new_tracks",
     "save_playlists_config",
+    "save_playlist_membership",
+    "save_playlist_snapshots",
+    "query_new_tracks",
     "resolve_sync_days_back",
     "resolve_sync_since_date",
     "save_sync_start_date",
@@ -64,7 +165,11 @@ __all__ = [
     "save_ui_skin",
     "save_locale",
     "save_artist_discovery_enabled",
+    "save_artist_release_catalog",
+    "search_new_tracks",
+    "store_session",
     "strip_radio_suffixes_from_db",
+    "update_job",
     "update_new_track_reference_url",
     "upsert_playlist",
 ]
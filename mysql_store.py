@@ -1,23 +1,50 @@
 """MySQL persistence for playlist_sync."""
 from __future__ import annotations
 
+import hashlib
+import json
 import os
+import threading
+import time
 from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
 
 from normalize_track_name import normalize_track_name
+from settings_cache import SETTINGS_SQL, SettingsCache, settings_from_rows
 from spotify_playlist.release_year import normalize_release_year
 from spotify_playlist.spotify_track_energy import normalize_energy
-from store_common import dt_to_iso_str, normalize_reference_url, parse_datetime
+from store_common import (
+    DEFAULT_SYNC_DAYS_BACK,
+    TRACK_ID_LENGTH,
+    TRACK_URI_PREFIX,
+    UNCATEGORIZED_GENRE,
+    NewTrack,
+    dt_to_iso_str,
+    escape_like,
+    job_from_row,
+    new_track_from_row,
+    normalize_locale,
+    normalize_reference_url,
+    normalize_ui_skin,
+    parse_datetime,
+    search_terms,
+    split_job_fields,
+    track_id_from_uri,
+    utc_now,
+)
 
 try:
     import pymysql
-    from pymysql.cursors import DictCursor
+    from pymysql.constants import SERVER_STATUS
+    from pymysql.cursors import DictCursor, SSCursor
     from pymysql.err import IntegrityError
 except ImportError:
     pymysql = None
+    SERVER_STATUS = None  # type: ignore
     DictCursor = None  # type: ignore
+    SSCursor = None  # type: ignore
     IntegrityError = Exception  # type: ignore
 
 
@@ -28,8 +55,7 @@ def _require_pymysql() -> None:
         )
 
 
-def get_connection():
-    """Return a new MySQL connection (caller must close or use try/finally)."""
+def _connect():
     _require_pymysql()
     return pymysql.connect(
         host=os.environ.get("MYSQL_HOST", "127.0.0.1"),
@@ -43,51 +69,253 @@ def get_connection():
     )
 
 
-def load_playlists_config() -> Dict[str, Any]:
-    """Load source, destination, and tracking playlist Spotify IDs."""
+class ConnectionPool:
+    """Thread-safe pool of MySQL connections.
+
+    At most ``max_size`` connections are open at once; callers beyond that wait
+    up to ``timeout`` seconds. Idle connections are pinged on checkout and
+    replaced once they are older than ``recycle`` seconds.
+    """
+
+    def __init__(self, max_size: int = 10, recycle: float = 1800.0, timeout: float = 30.0) -> None:
+        self._max_size = max(1, max_size)
+        self._recycle = recycle
+        self._timeout = timeout
+        self._slots = threading.BoundedSemaphore(self._max_size)
+        self._lock = threading.Lock()
+        self._idle: List[tuple] = []
+        self._pid = os.getpid()
+
+    def acquire(self):
+        if not self._slots.acquire(timeout=self._timeout):
+            raise TimeoutError(
+                f"No MySQL connection available within {self._timeout:g}s "
+                f"(pool size {self._max_size})"
+            )
+        try:
+            return self._checkout()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _checkout(self):
+        while True:
+            with self._lock:
+                self._reset_after_fork()
+                if not self._idle:
+                    break
+                raw, created_at = self._idle.pop()
+            if time.monotonic() - created_at >= self._recycle:
+                _close_quietly(raw)
+                continue
+            try:
+                raw.ping(reconnect=False)
+            except Exception:
+                _close_quietly(raw)
+                continue
+            return _PooledConnection(self, raw, created_at)
+        return _PooledConnection(self, _connect(), time.monotonic())
+
+    def release(self, raw, created_at: float) -> None:
+        try:
+            if raw.open and SERVER_STATUS is not None and (
+                raw.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS
+            ):
+                raw.rollback()
+            reusable = raw.open and time.monotonic() - created_at < self._recycle
+        except Exception:
+            reusable = False
+        if reusable:
+            with self._lock:
+                if os.getpid() == self._pid:
+                    self._idle.append((raw, created_at))
+                    raw = None
+        if raw is not None:
+            _close_quietly(raw)
+        self._slots.release()
+
+    def _reset_after_fork(self) -> None:
+        # Sockets inherited from a parent process must not be shared.
+        if os.getpid() != self._pid:
+            self._idle = []
+            self._pid = os.getpid()
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for raw, _created_at in idle:
+            _close_quietly(raw)
+
+
+class _PooledConnection:
+    """Connection handle whose close() returns the connection to its pool."""
+
+    def __init__(self, pool: ConnectionPool, raw, created_at: float) -> None:
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+
+    def __getattr__(self, name: str):
+        raw = self.__dict__.get("_raw")
+        if raw is None:
+            raise AttributeError(f"connection already returned to the pool ({name})")
+        return getattr(raw, name)
+
+    def close(self) -> None:
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            self._pool.release(raw, self._created_at)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _close_quietly(raw) -> None:
+    try:
+        raw.close()
+    except Exception:
+        pass
+
+
+_pool = ConnectionPool(
+    max_size=int(os.environ.get("MYSQL_POOL_SIZE", "10")),
+    recycle=float(os.environ.get("MYSQL_POOL_RECYCLE", "1800")),
+)
+
+
+def get_connection():
+    """Check out a pooled MySQL connection (caller must close or use try/finally).
+
+    close() hands the connection back to the pool; an open transaction is
+    rolled back first. Inside ``store_session()`` the session's connection is
+    returned instead (see StoreSession).
+    """
+    session = getattr(_session_local, "session", None)
+    if session is not None:
+        return session.connection()
+    return _pool.acquire()
+
+
+class StoreSession:
+    """One connection and one settings read shared by the store calls of a run.
+
+    While the session is open, ``get_connection()`` on the same thread hands out
+    this connection. Each store call still commits (or rolls back) on its own,
+    as it does outside a session and as the SQLite backend does: a run-wide
+    transaction would hold row locks through minutes of Spotify paging and
+    block saves from the web UI. Settings are read once and reread after a save.
+    """
+
+    def __init__(self, conn) -> None:
+        self.conn = conn
+        self._settings: Optional[Dict[str, Any]] = None
+        self._settings_generation = _settings.generation
+
+    def connection(self) -> "_SessionConnection":
+        return _SessionConnection(self.conn)
+
+    def settings(self) -> Dict[str, Any]:
+        generation = _settings.generation
+        if self._settings is None or generation != self._settings_generation:
+            with self.conn.cursor() as cur:
+                cur.execute(SETTINGS_SQL)
+                self._settings = settings_from_rows(cur.fetchall())
+            self._settings_generation = generation
+        return self._settings
+
+
+class _SessionConnection:
+    """A store call's handle on the session connection; close() keeps it open."""
+
+    def __init__(self, conn) -> None:
+        self._conn = conn
+        self._closed = False
+
+    def __getattr__(self, name: str):
+        return getattr(self._conn, name)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        # Same as handing a pooled connection back: drop what was not committed.
+        self._conn.rollback()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+_session_local = threading.local()
+
+
+@contextmanager
+def store_session() -> Iterator[StoreSession]:
+    """Run a batch of store calls (e.g. one sync run) on one connection.
+
+    Every call commits on its own, so work saved before a later failure is
+    kept. Nested sessions on the same thread join the open one; usable as a
+    decorator.
+    """
+    session = getattr(_session_local, "session", None)
+    if session is not None:
+        yield session
+        return
+
+    conn = _pool.acquire()
+    try:
+        _ensure_schema(conn)
+        _session_local.session = StoreSession(conn)
+        yield _session_local.session
+    finally:
+        _session_local.session = None
+        conn.close()
+
+
+_settings = SettingsCache()
+
+
+def _refresh_settings(cached_version: Optional[int]) -> Optional[Dict[str, Any]]:
     conn = get_connection()
     try:
-        _ensure_playlist_config_schema(conn)
+        _ensure_schema(conn)
         with conn.cursor() as cur:
-            cur.execute(
-                "SELECT p.spotify_id "
-                "FROM app_config ac "
-                "LEFT JOIN playlist p ON p.id = ac.destination_playlist_ref_id "
-                "WHERE ac.singleton = 1 LIMIT 1"
-            )
-            row = cur.fetchone()
-            destination = (row or {}).get("spotify_id") or ""
+            if cached_version is not None:
+                cur.execute("SELECT config_version FROM app_config WHERE singleton = 1")
+                row = cur.fetchone()
+                if row and int(row["config_version"]) == cached_version:
+                    return None
+            cur.execute(SETTINGS_SQL)
+            return settings_from_rows(cur.fetchall())
+    finally:
+        conn.close()
 
-            cur.execute(
-                "SELECT p.spotify_id "
-                "FROM playlist_source ps "
-                "INNER JOIN playlist p ON p.id = ps.playlist_ref_id "
-                "ORDER BY ps.sort_order ASC, p.spotify_id ASC"
-            )
-            source_playlists = [
-                r["spotify_id"] for r in cur.fetchall() if r.get("spotify_id")
-            ]
 
-            cur.execute(
-                "SELECT p.spotify_id "
-                "FROM playlist_tracking pt "
-                "INNER JOIN playlist p ON p.id = pt.playlist_ref_id "
-                "ORDER BY pt.sort_order ASC, p.spotify_id ASC"
-            )
-            tracking_playlists = [
-                r["spotify_id"] for r in cur.fetchall() if r.get("spotify_id")
-            ]
+def _load_settings() -> Dict[str, Any]:
+    """Return the app_config settings from the in-process cache (see SettingsCache)."""
+    session = getattr(_session_local, "session", None)
+    if session is not None:
+        return session.settings()
+    return _settings.get(_refresh_settings)
 
-        return {
-            "source_playlists": source_playlists,
-            "destination_playlist": destination,
-            "tracking_playlists": tracking_playlists,
-        }
+
+def load_playlists_config() -> Dict[str, Any]:
+    """Load source, destination, and tracking playlist Spotify IDs."""
+    try:
+        settings = _load_settings()
     except Exception as e:
         print(f"❌ Error loading playlist configuration from database: {e}")
         return {"source_playlists": [], "destination_playlist": "", "tracking_playlists": []}
-    finally:
-        conn.close()
+    return {
+        "source_playlists": list(settings["source_playlists"]),
+        "destination_playlist": settings["destination_playlist"],
+        "tracking_playlists": list(settings["tracking_playlists"]),
+    }
 
 
 def save_playlists_config(
@@ -121,7 +349,7 @@ def save_playlists_config(
             except RuntimeError:
                 pass
 
-        _ensure_playlist_config_schema(conn)
+        _ensure_schema(conn)
         kept_ref_ids: Set[int] = set()
         with conn.cursor() as cur:
             dest_ref_id = None
@@ -138,7 +366,7 @@ def save_playlists_config(
                 "INSERT INTO app_config (singleton, destination_playlist_ref_id) "
                 "VALUES (1, %s) "
                 "ON DUPLICATE KEY UPDATE destination_playlist_ref_id = "
-                "VALUES(destination_playlist_ref_id)",
+                "VALUES(destination_playlist_ref_id), config_version = config_version + 1",
                 (dest_ref_id,),
             )
 
@@ -180,6 +408,7 @@ def save_playlists_config(
 
             _prune_unused_config_playlists(cur, kept_ref_ids)
         conn.commit()
+        _settings.invalidate()
         _try_backfill_playlist_names()
     except Exception as e:
         conn.rollback()
@@ -189,13 +418,150 @@ def save_playlists_config(
         conn.close()
 
 
-def load_historical_data(bron_playlists: Optional[List[str]] = None) -> Dict[str, Set[str]]:
-    """Load known track URIs per playlist key (including '__artist_releases__')."""
+def _ensure_historical_tables(conn) -> None:
+    """Create the compact history tables and move legacy track rows into them.
+
+    ``historical_track`` stores a CHAR(22) track id per integer key reference;
+    URIs that are not plain track URIs (local files, episodes) stay in the
+    legacy ``historical_tracks`` table.
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            "CREATE TABLE IF NOT EXISTS historical_key ("
+            "id INT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY, "
+            "playlist_key VARCHAR(64) NOT NULL, "
+            "UNIQUE KEY uq_historical_key (playlist_key)"
+            ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci"
+        )
+        cur.execute(
+            "CREATE TABLE IF NOT EXISTS historical_track ("
+            "key_id INT UNSIGNED NOT NULL, "
+            "track_id CHAR(22) CHARACTER SET ascii COLLATE ascii_bin NOT NULL, "
+            "PRIMARY KEY (key_id, track_id), "
+            "CONSTRAINT fk_historical_track_key FOREIGN KEY (key_id) "
+            "REFERENCES historical_key(id) ON DELETE CASCADE"
+            ") ENGINE=InnoDB"
+        )
+        if _table_exists(conn, "historical_tracks"):
+            cur.execute(
+                "SELECT 1 FROM historical_tracks "
+                "WHERE track_uri LIKE %s AND CHAR_LENGTH(track_uri) = %s LIMIT 1",
+                (TRACK_URI_PREFIX + "%", len(TRACK_URI_PREFIX) + TRACK_ID_LENGTH),
+            )
+            if cur.fetchone():
+                cur.execute(
+                    "INSERT IGNORE INTO historical_key (playlist_key) "
+                    "SELECT DISTINCT playlist_key FROM historical_tracks"
+                )
+                cur.execute(
+                    "INSERT IGNORE INTO historical_track (key_id, track_id) "
+                    "SELECT k.id, SUBSTRING(h.track_uri, %s) "
+                    "FROM historical_tracks h "
+                    "JOIN historical_key k ON k.playlist_key = h.playlist_key "
+                    "WHERE h.track_uri LIKE %s AND CHAR_LENGTH(h.track_uri) = %s",
+                    (
+                        len(TRACK_URI_PREFIX) + 1,
+                        TRACK_URI_PREFIX + "%",
+                        len(TRACK_URI_PREFIX) + TRACK_ID_LENGTH,
+                    ),
+                )
+                cur.execute(
+                    "DELETE FROM historical_tracks "
+                    "WHERE track_uri LIKE %s AND CHAR_LENGTH(track_uri) = %s",
+                    (TRACK_URI_PREFIX + "%", len(TRACK_URI_PREFIX) + TRACK_ID_LENGTH),
+                )
+        else:
+            cur.execute(
+                "CREATE TABLE historical_tracks ("
+                "playlist_key VARCHAR(64) NOT NULL, "
+                "track_uri VARCHAR(255) NOT NULL, "
+                "PRIMARY KEY (playlist_key, track_uri)"
+                ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci"
+            )
+    conn.commit()
+
+
+def _historical_key_ids(cur, keys: List[str]) -> Dict[str, int]:
+    """Return the integer reference for each playlist key, creating missing ones."""
+    unique_keys = [key for key in dict.fromkeys(keys) if key]
+    if not unique_keys:
+        return {}
+    cur.executemany(
+        "INSERT IGNORE INTO historical_key (playlist_key) VALUES (%s)",
+        [(key,) for key in unique_keys],
+    )
+    ids: Dict[str, int] = {}
+    for start in range(0, len(unique_keys), 500):
+        batch = unique_keys[start : start + 500]
+        placeholders = ", ".join(["%s"] * len(batch))
+        cur.execute(
+            f"SELECT id, playlist_key FROM historical_key WHERE playlist_key IN ({placeholders})",
+            batch,
+        )
+        for row in cur.fetchall():
+            ids[row["playlist_key"]] = row["id"]
+    return ids
+
+
+def _split_historical_rows(data: Dict[str, Set[str]], key_ids: Dict[str, int]):
+    """Split (key, uri) pairs into compact track rows and legacy rows for other URIs."""
+    track_rows: List[tuple] = []
+    other_rows: List[tuple] = []
+    for pl_key, uris in data.items():
+        for uri in uris:
+            track_id = track_id_from_uri(uri)
+            if track_id is not None:
+                track_rows.append((key_ids[pl_key], track_id))
+            else:
+                other_rows.append((pl_key, uri))
+    return track_rows, other_rows
+
+
+def _insert_historical_rows(cur, track_rows: List[tuple], other_rows: List[tuple]) -> None:
+    for start in range(0, len(track_rows), 1000):
+        cur.executemany(
+            "INSERT IGNORE INTO historical_track (key_id, track_id) VALUES (%s, %s)",
+            track_rows[start : start + 1000],
+        )
+    for start in range(0, len(other_rows), 1000):
+        cur.executemany(
+            "INSERT IGNORE INTO historical_tracks (playlist_key, track_uri) VALUES (%s, %s)",
+            other_rows[start : start + 1000],
+        )
+
+
+def load_historical_data(
+    bron_playlists: Optional[List[str]] = None,
+    keys: Optional[List[str]] = None,
+) -> Dict[str, Set[str]]:
+    """Load known track URIs per playlist key (including '__artist_releases__').
+
+    With ``keys`` only those history keys are read; a sync passes the keys it
+    updates and checks everything else through iter_historical_track_ids.
+    """
     data: Dict[str, Set[str]] = defaultdict(set)
+    key_filter = ""
+    params: List[str] = []
+    if keys is not None:
+        params = list(dict.fromkeys(keys))
+        key_filter = f" WHERE {{}} IN ({', '.join(['%s'] * len(params))})" if params else " WHERE 1 = 0"
     conn = get_connection()
     try:
+        _ensure_schema(conn)
         with conn.cursor() as cur:
-            cur.execute("SELECT playlist_key, track_uri FROM historical_tracks")
+            cur.execute(
+                "SELECT k.playlist_key, h.track_id "
+                "FROM historical_track h JOIN historical_key k ON k.id = h.key_id"
+                + key_filter.format("k.playlist_key"),
+                params,
+            )
+            for row in cur.fetchall():
+                data[row["playlist_key"]].add(TRACK_URI_PREFIX + row["track_id"])
+            cur.execute(
+                "SELECT playlist_key, track_uri FROM historical_tracks"
+                + key_filter.format("playlist_key"),
+                params,
+            )
             for row in cur.fetchall():
                 data[row["playlist_key"]].add(row["track_uri"])
     except Exception as e:
@@ -213,22 +579,90 @@ def load_historical_data(bron_playlists: Optional[List[str]] = None) -> Dict[str
     return out
 
 
+def iter_historical_track_ids() -> Iterator[str]:
+    """Stream the distinct track ids of every history key in ascending order.
+
+    ``track_id`` is ascii_bin, so this order is also the ids' base62 value order.
+    Holds the connection like iter_new_tracks does until the iterator is done.
+    """
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        with conn.cursor(SSCursor) as cur:
+            cur.execute("SELECT DISTINCT track_id FROM historical_track ORDER BY track_id")
+            for (track_id,) in cur:
+                yield track_id
+    finally:
+        conn.close()
+
+
+def load_historical_other_uris() -> Set[str]:
+    """History URIs that are not plain track URIs (local files, episodes), across all keys."""
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        with conn.cursor() as cur:
+            cur.execute("SELECT DISTINCT track_uri FROM historical_tracks")
+            return {row["track_uri"] for row in cur.fetchall()}
+    finally:
+        conn.close()
+
+
 def save_historical_data(data: Dict[str, Set[str]]) -> None:
     """Persist full historical snapshot."""
     conn = get_connection()
     try:
-        rows: List[tuple] = []
-        for pl_key, uris in data.items():
-            for uri in uris:
-                rows.append((pl_key, uri))
-
+        _ensure_schema(conn)
         with conn.cursor() as cur:
+            cur.execute("DELETE FROM historical_track")
             cur.execute("DELETE FROM historical_tracks")
-            if rows:
+            key_ids = _historical_key_ids(cur, [key for key, uris in data.items() if uris])
+            track_rows, other_rows = _split_historical_rows(data, key_ids)
+            _insert_historical_rows(cur, track_rows, other_rows)
+        conn.commit()
+        print("\n✅ Historical data saved to the database")
+    except Exception as e:
+        conn.rollback()
+        print(f"Error saving historical data: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def save_historical_changes(
+    added: Dict[str, Set[str]],
+    removed: Optional[Dict[str, Set[str]]] = None,
+) -> None:
+    """Apply per-key additions and removals to the history tables."""
+    added = {pl_key: uris for pl_key, uris in added.items() if uris}
+    removed = {pl_key: uris for pl_key, uris in (removed or {}).items() if uris}
+    if not added and not removed:
+        return
+
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        with conn.cursor() as cur:
+            key_ids = _historical_key_ids(cur, list(added) + list(removed))
+            removed_tracks, removed_other = _split_historical_rows(removed, key_ids)
+            by_key: Dict[int, List[str]] = defaultdict(list)
+            for key_id, track_id in removed_tracks:
+                by_key[key_id].append(track_id)
+            for key_id, track_ids in by_key.items():
+                for start in range(0, len(track_ids), 500):
+                    batch = track_ids[start : start + 500]
+                    placeholders = ", ".join(["%s"] * len(batch))
+                    cur.execute(
+                        "DELETE FROM historical_track "
+                        f"WHERE key_id = %s AND track_id IN ({placeholders})",
+                        [key_id, *batch],
+                    )
+            if removed_other:
                 cur.executemany(
-                    "INSERT INTO historical_tracks (playlist_key, track_uri) VALUES (%s, %s)",
-                    rows,
+                    "DELETE FROM historical_tracks WHERE playlist_key = %s AND track_uri = %s",
+                    removed_other,
                 )
+            _insert_historical_rows(cur, *_split_historical_rows(added, key_ids))
         conn.commit()
         print("\n✅ Historical data saved to the database")
     except Exception as e:
@@ -239,51 +673,303 @@ def save_historical_data(data: Dict[str, Set[str]]) -> None:
         conn.close()
 
 
-def load_tracking_start_date() -> Optional[datetime]:
+def _ensure_artist_release_tables(conn) -> None:
+    with conn.cursor() as cur:
+        cur.execute(
+            "CREATE TABLE IF NOT EXISTS artist_release_check ("
+            "artist_id VARCHAR(64) NOT NULL PRIMARY KEY, "
+            "album_total INT UNSIGNED NULL, "
+            "scanned_since DATETIME NULL, "
+            "last_checked DATETIME NOT NULL"
+            ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci"
+        )
+        cur.execute(
+            "CREATE TABLE IF NOT EXISTS artist_release ("
+            "artist_id VARCHAR(64) NOT NULL, "
+            "album_id VARCHAR(64) NOT NULL, "
+            "album_name VARCHAR(512) NULL, "
+            "album_type VARCHAR(32) NULL, "
+            "release_date VARCHAR(10) NULL, "
+            "tracks_json MEDIUMTEXT NULL, "
+            "last_checked DATETIME NOT NULL, "
+            "PRIMARY KEY (artist_id, album_id), "
+            "KEY idx_artist_release_album (album_id)"
+            ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci"
+        )
+    conn.commit()
+
+
+def load_artist_release_catalog(artist_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Load known albums and last scan state per artist (see get_artist_new_releases)."""
+    catalog: Dict[str, Dict[str, Any]] = {}
+    unique_ids = [artist_id for artist_id in dict.fromkeys(artist_ids) if artist_id]
+    if not unique_ids:
+        return catalog
+
     conn = get_connection()
     try:
-        _ensure_app_config_schema(conn)
+        _ensure_schema(conn)
+        with conn.cursor() as cur:
+            for start in range(0, len(unique_ids), 500):
+                batch = unique_ids[start : start + 500]
+                placeholders = ", ".join(["%s"] * len(batch))
+                cur.execute(
+                    "SELECT artist_id, album_total, scanned_since, last_checked "
+                    f"FROM artist_release_check WHERE artist_id IN ({placeholders})",
+                    batch,
+                )
+                for row in cur.fetchall():
+                    catalog[row["artist_id"]] = {
+                        "album_total": row.get("album_total"),
+                        "scanned_since": parse_datetime(row.get("scanned_since")),
+                        "last_checked": parse_datetime(row.get("last_checked")),
+                        "albums": {},
+                    }
+
+                cur.execute(
+                    "SELECT artist_id, album_id, album_name, album_type, release_date, tracks_json "
+                    f"FROM artist_release WHERE artist_id IN ({placeholders}) "
+                    "ORDER BY release_date DESC, album_id ASC",
+                    batch,
+                )
+                for row in cur.fetchall():
+                    entry = catalog.get(row["artist_id"])
+                    if entry is None:
+                        continue
+                    tracks_json = row.get("tracks_json")
+                    entry["albums"][row["album_id"]] = {
+                        "name": row.get("album_name") or "Unknown",
+                        "album_type": row.get("album_type"),
+                        "release_date": row.get("release_date") or "",
+                        "tracks": json.loads(tracks_json) if tracks_json else None,
+                    }
+        return catalog
+    except Exception as e:
+        print(f"Error loading artist release catalog: {e}")
+        return {}
+    finally:
+        conn.close()
+
+
+def save_artist_release_catalog(catalog: Dict[str, Dict[str, Any]]) -> None:
+    """Persist scan state per artist and every album marked dirty during the scan."""
+    if not catalog:
+        return
+
+    now = datetime.now()
+    check_rows: List[tuple] = []
+    album_rows: List[tuple] = []
+    for artist_id, entry in catalog.items():
+        if not entry.get("last_checked"):
+            continue
+        check_rows.append(
+            (
+                artist_id,
+                entry.get("album_total"),
+                entry.get("scanned_since"),
+                entry.get("last_checked"),
+            )
+        )
+        for album_id, album in (entry.get("albums") or {}).items():
+            if not album.get("dirty"):
+                continue
+            tracks = album.get("tracks")
+            album_rows.append(
+                (
+                    artist_id,
+                    album_id,
+                    (album.get("name") or "")[:512] or None,
+                    album.get("album_type"),
+                    (album.get("release_date") or "")[:10] or None,
+                    json.dumps(tracks, ensure_ascii=False) if tracks is not None else None,
+                    now,
+                )
+            )
+
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        with conn.cursor() as cur:
+            if check_rows:
+                cur.executemany(
+                    "INSERT INTO artist_release_check "
+                    "(artist_id, album_total, scanned_since, last_checked) "
+                    "VALUES (%s, %s, %s, %s) "
+                    "ON DUPLICATE KEY UPDATE album_total = VALUES(album_total), "
+                    "scanned_since = VALUES(scanned_since), "
+                    "last_checked = VALUES(last_checked)",
+                    check_rows,
+                )
+            if album_rows:
+                cur.executemany(
+                    "INSERT INTO artist_release "
+                    "(artist_id, album_id, album_name, album_type, release_date, "
+                    "tracks_json, last_checked) "
+                    "VALUES (%s, %s, %s, %s, %s, %s, %s) "
+                    "ON DUPLICATE KEY UPDATE album_name = VALUES(album_name), "
+                    "album_type = VALUES(album_type), "
+                    "release_date = VALUES(release_date), "
+                    "tracks_json = COALESCE(VALUES(tracks_json), tracks_json), "
+                    "last_checked = VALUES(last_checked)",
+                    album_rows,
+                )
+        conn.commit()
+        for entry in catalog.values():
+            for album in (entry.get("albums") or {}).values():
+                album.pop("dirty", None)
+    except Exception as e:
+        conn.rollback()
+        print(f"Error saving artist release catalog: {e}")
+    finally:
+        conn.close()
+
+
+def _ensure_playlist_membership_tables(conn) -> None:
+    with conn.cursor() as cur:
+        cur.execute(
+            "CREATE TABLE IF NOT EXISTS playlist_membership_state ("
+            "spotify_id VARCHAR(64) NOT NULL PRIMARY KEY, "
+            "snapshot_id VARCHAR(128) NOT NULL, "
+            "updated_at DATETIME NOT NULL"
+            ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci"
+        )
+        cur.execute(
+            "CREATE TABLE IF NOT EXISTS playlist_membership ("
+            "spotify_id VARCHAR(64) NOT NULL, "
+            "track_uri VARCHAR(64) NOT NULL, "
+            "PRIMARY KEY (spotify_id, track_uri)"
+            ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci"
+        )
+    conn.commit()
+
+
+def _ensure_playlist_membership_uri_hash(conn) -> None:
+    """Key playlist_membership by an MD5 of the URI so long local-file URIs fit.
+
+    The old VARCHAR(64) key silently truncated ``spotify:local:…`` URIs. The
+    table is only a cache of destination contents, so it is recreated empty and
+    every destination is re-read once on its next sync.
+    """
+    if _column_exists(conn, "playlist_membership", "uri_hash"):
+        return
+    with conn.cursor() as cur:
+        cur.execute("DROP TABLE IF EXISTS playlist_membership")
+        cur.execute(
+            "CREATE TABLE playlist_membership ("
+            "spotify_id VARCHAR(64) NOT NULL, "
+            "uri_hash BINARY(16) NOT NULL, "
+            "track_uri TEXT NOT NULL, "
+            "PRIMARY KEY (spotify_id, uri_hash)"
+            ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci"
+        )
+        cur.execute("DELETE FROM playlist_membership_state")
+    conn.commit()
+
+
+def _membership_uri_hash(uri: str) -> bytes:
+    return hashlib.md5(uri.encode("utf-8")).digest()
+
+
+def load_playlist_membership(spotify_id: str, uris: List[str]) -> tuple[Optional[str], Set[str]]:
+    """Return the snapshot_id the local index matches and which of ``uris`` it contains."""
+    if not spotify_id:
+        return None, set()
+
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
         with conn.cursor() as cur:
             cur.execute(
-                "SELECT tracking_start_date FROM app_config WHERE singleton = 1 LIMIT 1"
+                "SELECT snapshot_id FROM playlist_membership_state WHERE spotify_id = %s",
+                (spotify_id,),
             )
             row = cur.fetchone()
-            if not row or row.get("tracking_start_date") is None:
-                return None
-            return parse_datetime(row["tracking_start_date"])
+            if not row:
+                return None, set()
+
+            present: Set[str] = set()
+            unique_uris = [uri for uri in dict.fromkeys(uris) if uri]
+            for start in range(0, len(unique_uris), 500):
+                batch = unique_uris[start : start + 500]
+                placeholders = ", ".join(["%s"] * len(batch))
+                cur.execute(
+                    "SELECT track_uri FROM playlist_membership "
+                    f"WHERE spotify_id = %s AND uri_hash IN ({placeholders})",
+                    [spotify_id, *(_membership_uri_hash(uri) for uri in batch)],
+                )
+                present.update(r["track_uri"] for r in cur.fetchall())
+            return row["snapshot_id"], present
     except Exception as e:
-        print(f"Error loading tracking start date: {e}")
-        return None
+        print(f"Error loading playlist membership: {e}")
+        return None, set()
     finally:
         conn.close()
 
 
-DEFAULT_SYNC_DAYS_BACK = 7
+def save_playlist_membership(
+    spotify_id: str,
+    snapshot_id: Optional[str],
+    uris: Set[str] | List[str],
+    replace: bool = False,
+) -> bool:
+    """Record playlist contents at ``snapshot_id``. Returns True when stored.
 
+    With ``replace`` the index is rebuilt from ``uris``; otherwise ``uris`` are
+    appended (tracks we added ourselves) and the snapshot moves forward.
+    """
+    if not spotify_id or not snapshot_id:
+        return False
 
-def load_sync_start_date() -> Optional[datetime]:
+    rows = [(spotify_id, _membership_uri_hash(uri), uri) for uri in dict.fromkeys(uris) if uri]
     conn = get_connection()
     try:
-        _ensure_app_config_schema(conn)
+        _ensure_schema(conn)
         with conn.cursor() as cur:
+            if replace:
+                cur.execute("DELETE FROM playlist_membership WHERE spotify_id = %s", (spotify_id,))
+            for start in range(0, len(rows), 1000):
+                cur.executemany(
+                    "INSERT IGNORE INTO playlist_membership (spotify_id, uri_hash, track_uri) "
+                    "VALUES (%s, %s, %s)",
+                    rows[start : start + 1000],
+                )
             cur.execute(
-                "SELECT sync_start_date FROM app_config WHERE singleton = 1 LIMIT 1"
+                "INSERT INTO playlist_membership_state (spotify_id, snapshot_id, updated_at) "
+                "VALUES (%s, %s, %s) "
+                "ON DUPLICATE KEY UPDATE snapshot_id = VALUES(snapshot_id), "
+                "updated_at = VALUES(updated_at)",
+                (spotify_id, snapshot_id, datetime.now()),
             )
-            row = cur.fetchone()
-            if not row or row.get("sync_start_date") is None:
-                return None
-            return parse_datetime(row["sync_start_date"])
+        conn.commit()
+        return True
     except Exception as e:
-        print(f"Error loading sync start date: {e}")
-        return None
+        conn.rollback()
+        print(f"Error saving playlist membership: {e}")
+        return False
     finally:
         conn.close()
 
 
+def load_tracking_start_date() -> Optional[datetime]:
+    try:
+        return _load_settings()["tracking_start_date"]
+    except Exception as e:
+        print(f"Error loading tracking start date: {e}")
+        return None
+
+
+def load_sync_start_date() -> Optional[datetime]:
+    try:
+        return _load_settings()["sync_start_date"]
+    except Exception as e:
+        print(f"Error loading sync start date: {e}")
+        return None
+
+
 def save_sync_start_date(start_date: Any) -> None:
     conn = get_connection()
     try:
-        _ensure_app_config_schema(conn)
+        _ensure_schema(conn)
         now = datetime.now()
         if start_date is None or start_date == "":
             with conn.cursor() as cur:
@@ -291,10 +977,12 @@ def save_sync_start_date(start_date: Any) -> None:
                     "INSERT INTO app_config (singleton, sync_start_date, sync_start_updated) "
                     "VALUES (1, NULL, %s) "
                     "ON DUPLICATE KEY UPDATE sync_start_date = NULL, "
-                    "sync_start_updated = VALUES(sync_start_updated)",
+                    "sync_start_updated = VALUES(sync_start_updated), "
+                    "config_version = config_version + 1",
                     (now,),
                 )
             conn.commit()
+            _settings.invalidate()
             return
 
         dt = start_date
@@ -307,10 +995,12 @@ def save_sync_start_date(start_date: Any) -> None:
                 "INSERT INTO app_config (singleton, sync_start_date, sync_start_updated) "
                 "VALUES (1, %s, %s) "
                 "ON DUPLICATE KEY UPDATE sync_start_date = VALUES(sync_start_date), "
-                "sync_start_updated = VALUES(sync_start_updated)",
+                "sync_start_updated = VALUES(sync_start_updated), "
+                "config_version = config_version + 1",
                 (dt, now),
             )
         conn.commit()
+        _settings.invalidate()
     except Exception as e:
         conn.rollback()
         print(f"Error saving sync start date: {e}")
@@ -335,7 +1025,7 @@ def resolve_sync_days_back() -> int:
 def save_tracking_start_date(start_date: Any) -> None:
     conn = get_connection()
     try:
-        _ensure_app_config_schema(conn)
+        _ensure_schema(conn)
         now = datetime.now()
         if start_date is None or start_date == "":
             with conn.cursor() as cur:
@@ -343,10 +1033,12 @@ def save_tracking_start_date(start_date: Any) -> None:
                     "INSERT INTO app_config (singleton, tracking_start_date, tracking_start_updated) "
                     "VALUES (1, NULL, %s) "
                     "ON DUPLICATE KEY UPDATE tracking_start_date = NULL, "
-                    "tracking_start_updated = VALUES(tracking_start_updated)",
+                    "tracking_start_updated = VALUES(tracking_start_updated), "
+                    "config_version = config_version + 1",
                     (now,),
                 )
             conn.commit()
+            _settings.invalidate()
             return
 
         dt = start_date
@@ -359,10 +1051,12 @@ def save_tracking_start_date(start_date: Any) -> None:
                 "INSERT INTO app_config (singleton, tracking_start_date, tracking_start_updated) "
                 "VALUES (1, %s, %s) "
                 "ON DUPLICATE KEY UPDATE tracking_start_date = VALUES(tracking_start_date), "
-                "tracking_start_updated = VALUES(tracking_start_updated)",
+                "tracking_start_updated = VALUES(tracking_start_updated), "
+                "config_version = config_version + 1",
                 (dt, now),
             )
         conn.commit()
+        _settings.invalidate()
     except Exception as e:
         conn.rollback()
         print(f"Error saving tracking start date: {e}")
@@ -370,24 +1064,6 @@ def save_tracking_start_date(start_date: Any) -> None:
         conn.close()
 
 
-_VALID_UI_SKINS = frozenset({"light", "dark", "retroui", "winxp"})
-_VALID_LOCALES = frozenset({"en", "nl", "brab"})
-
-
-def _normalize_ui_skin(skin: Optional[str]) -> str:
-    value = (skin or "light").strip().lower()
-    if value in {"neon", "colorful"}:
-        value = "winxp"
-    elif value == "simple":
-        value = "light"
-    return value if value in _VALID_UI_SKINS else "light"
-
-
-def _normalize_locale(locale: Optional[str]) -> str:
-    value = (locale or "en").strip().lower()
-    return value if value in _VALID_LOCALES else "en"
-
-
 def _ensure_app_config_schema(conn) -> None:
     _ensure_playlist_table(conn)
 
@@ -533,39 +1209,28 @@ def _prune_unused_config_playlists(cur, kept_ref_ids: Set[int]) -> None:
             cur.execute("DELETE FROM playlist WHERE id = %s", (playlist_id,))
 
 
-def _ensure_app_config_table(conn) -> None:
-    _ensure_app_config_schema(conn)
-
-
 def load_ui_skin() -> str:
-    conn = get_connection()
     try:
-        _ensure_app_config_table(conn)
-        with conn.cursor() as cur:
-            cur.execute(
-                "SELECT ui_skin FROM app_config WHERE singleton = 1 LIMIT 1"
-            )
-            row = cur.fetchone()
-            return _normalize_ui_skin((row or {}).get("ui_skin"))
+        return normalize_ui_skin(_load_settings()["ui_skin"])
     except Exception as e:
         print(f"Error loading UI skin: {e}")
         return "light"
-    finally:
-        conn.close()
 
 
 def save_ui_skin(skin: str) -> None:
-    normalized = _normalize_ui_skin(skin)
+    normalized = normalize_ui_skin(skin)
     conn = get_connection()
     try:
-        _ensure_app_config_table(conn)
+        _ensure_schema(conn)
         with conn.cursor() as cur:
             cur.execute(
                 "INSERT INTO app_config (singleton, ui_skin) VALUES (1, %s) "
-                "ON DUPLICATE KEY UPDATE ui_skin = VALUES(ui_skin)",
+                "ON DUPLICATE KEY UPDATE ui_skin = VALUES(ui_skin), "
+                "config_version = config_version + 1",
                 (normalized,),
             )
         conn.commit()
+        _settings.invalidate()
     except Exception as e:
         conn.rollback()
         print(f"Error saving UI skin: {e}")
@@ -575,34 +1240,27 @@ def save_ui_skin(skin: str) -> None:
 
 
 def load_locale() -> str:
-    conn = get_connection()
     try:
-        _ensure_app_config_table(conn)
-        with conn.cursor() as cur:
-            cur.execute(
-                "SELECT locale FROM app_config WHERE singleton = 1 LIMIT 1"
-            )
-            row = cur.fetchone()
-            return _normalize_locale((row or {}).get("locale"))
+        return normalize_locale(_load_settings()["locale"])
     except Exception as e:
         print(f"Error loading locale: {e}")
         return "en"
-    finally:
-        conn.close()
 
 
 def save_locale(locale: str) -> None:
-    normalized = _normalize_locale(locale)
+    normalized = normalize_locale(locale)
     conn = get_connection()
     try:
-        _ensure_app_config_table(conn)
+        _ensure_schema(conn)
         with conn.cursor() as cur:
             cur.execute(
                 "INSERT INTO app_config (singleton, locale) VALUES (1, %s) "
-                "ON DUPLICATE KEY UPDATE locale = VALUES(locale)",
+                "ON DUPLICATE KEY UPDATE locale = VALUES(locale), "
+                "config_version = config_version + 1",
                 (normalized,),
             )
         conn.commit()
+        _settings.invalidate()
     except Exception as e:
         conn.rollback()
         print(f"Error saving locale: {e}")
@@ -612,36 +1270,28 @@ def save_locale(locale: str) -> None:
 
 
 def load_artist_discovery_enabled() -> bool:
-    conn = get_connection()
     try:
-        _ensure_app_config_table(conn)
-        with conn.cursor() as cur:
-            cur.execute(
-                "SELECT artist_discovery_enabled FROM app_config WHERE singleton = 1 LIMIT 1"
-            )
-            row = cur.fetchone()
-            if not row or row.get("artist_discovery_enabled") is None:
-                return True
-            return bool(int(row["artist_discovery_enabled"]))
+        value = _load_settings()["artist_discovery_enabled"]
     except Exception as e:
         print(f"Error loading artist discovery setting: {e}")
         return True
-    finally:
-        conn.close()
+    return True if value is None else bool(int(value))
 
 
 def save_artist_discovery_enabled(enabled: bool) -> None:
     value = 1 if enabled else 0
     conn = get_connection()
     try:
-        _ensure_app_config_table(conn)
+        _ensure_schema(conn)
         with conn.cursor() as cur:
             cur.execute(
                 "INSERT INTO app_config (singleton, artist_discovery_enabled) VALUES (1, %s) "
-                "ON DUPLICATE KEY UPDATE artist_discovery_enabled = VALUES(artist_discovery_enabled)",
+                "ON DUPLICATE KEY UPDATE artist_discovery_enabled = VALUES(artist_discovery_enabled), "
+                "config_version = config_version + 1",
                 (value,),
             )
         conn.commit()
+        _settings.invalidate()
     except Exception as e:
         conn.rollback()
         print(f"Error saving artist discovery setting: {e}")
@@ -731,6 +1381,7 @@ def _ensure_playlist_table(conn) -> None:
         )
     conn.commit()
     _ensure_playlist_spotify_id_column(conn)
+    _ensure_playlist_snapshot_columns(conn)
 
 
 def _ensure_playlist_spotify_id_column(conn) -> None:
@@ -742,10 +1393,23 @@ def _ensure_playlist_spotify_id_column(conn) -> None:
         )
         if cur.fetchone()["cnt"] == 0:
             cur.execute(
-                "ALTER TABLE playlist ADD COLUMN spotify_id VARCHAR(64) NULL AFTER id"
+                "ALTER TABLE playlist ADD COLUMN spotify_id VARCHAR(64) NULL AFTER id"
+            )
+            cur.execute(
+                "ALTER TABLE playlist ADD UNIQUE KEY uq_playlist_spotify_id (spotify_id)"
+            )
+    conn.commit()
+
+
+def _ensure_playlist_snapshot_columns(conn) -> None:
+    with conn.cursor() as cur:
+        if not _column_exists(conn, "playlist", "snapshot_id"):
+            cur.execute(
+                "ALTER TABLE playlist ADD COLUMN snapshot_id VARCHAR(128) NULL AFTER artwork_url"
             )
+        if not _column_exists(conn, "playlist", "snapshot_since"):
             cur.execute(
-                "ALTER TABLE playlist ADD UNIQUE KEY uq_playlist_spotify_id (spotify_id)"
+                "ALTER TABLE playlist ADD COLUMN snapshot_since DATETIME NULL AFTER snapshot_id"
             )
     conn.commit()
 
@@ -1038,6 +1702,8 @@ def _merge_playlist_rows(cur, *, from_id: int, to_id: int) -> None:
         "WHERE destination_playlist_ref_id = %s",
         (to_id, from_id),
     )
+    # Source and tracking lists may change too; let every process reload its settings.
+    cur.execute("UPDATE app_config SET config_version = config_version + 1 WHERE singleton = 1")
 
     for table in ("playlist_source", "playlist_tracking"):
         cur.execute(
@@ -1182,7 +1848,7 @@ def upsert_playlist(
     """Create or update a playlist row and return its id."""
     conn = get_connection()
     try:
-        _ensure_playlist_table(conn)
+        _ensure_schema(conn)
         with conn.cursor() as cur:
             playlist_id = _upsert_playlist_cur(
                 cur,
@@ -1191,6 +1857,7 @@ def upsert_playlist(
                 spotify_id=spotify_id,
             )
         conn.commit()
+        _settings.invalidate()
         return playlist_id
     except Exception as e:
         conn.rollback()
@@ -1207,7 +1874,7 @@ def backfill_playlist_names(sp) -> int:
     conn = get_connection()
     updated = 0
     try:
-        _ensure_playlist_table(conn)
+        _ensure_schema(conn)
         with conn.cursor() as cur:
             cur.execute(
                 "SELECT id, spotify_id, artwork_url FROM playlist "
@@ -1250,6 +1917,8 @@ def backfill_playlist_names(sp) -> int:
                     )
                 updated += 1
         conn.commit()
+        if updated:
+            _settings.invalidate()
         return updated
     except Exception as e:
         conn.rollback()
@@ -1259,6 +1928,62 @@ def backfill_playlist_names(sp) -> int:
         conn.close()
 
 
+def load_playlist_snapshots(spotify_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Return the last synced snapshot_id and sync window start per Spotify playlist ID."""
+    unique_ids = [spotify_id for spotify_id in dict.fromkeys(spotify_ids) if spotify_id]
+    if not unique_ids:
+        return {}
+
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        with conn.cursor() as cur:
+            placeholders = ", ".join(["%s"] * len(unique_ids))
+            cur.execute(
+                "SELECT spotify_id, snapshot_id, snapshot_since FROM playlist "
+                f"WHERE spotify_id IN ({placeholders}) AND snapshot_id IS NOT NULL",
+                unique_ids,
+            )
+            return {
+                row["spotify_id"]: {
+                    "snapshot_id": row["snapshot_id"],
+                    "since": parse_datetime(row.get("snapshot_since")),
+                }
+                for row in cur.fetchall()
+            }
+    except Exception as e:
+        print(f"Error loading playlist snapshots: {e}")
+        return {}
+    finally:
+        conn.close()
+
+
+def save_playlist_snapshots(snapshots: Dict[str, str], since: Optional[datetime]) -> None:
+    """Record the snapshot_id each source playlist had when it was last synced."""
+    rows = [
+        (snapshot_id, since, spotify_id)
+        for spotify_id, snapshot_id in snapshots.items()
+        if spotify_id and snapshot_id
+    ]
+    if not rows:
+        return
+
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        with conn.cursor() as cur:
+            cur.executemany(
+                "UPDATE playlist SET snapshot_id = %s, snapshot_since = %s WHERE spotify_id = %s",
+                rows,
+            )
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"Error saving playlist snapshots: {e}")
+    finally:
+        conn.close()
+
+
 def _try_backfill_playlist_names(sp=None) -> int:
     """Backfill playlist names when Spotify auth is available."""
     if sp is None:
@@ -1275,7 +2000,7 @@ def load_playlists() -> List[Dict[str, Any]]:
     """Load all playlists with artwork URLs."""
     conn = get_connection()
     try:
-        _ensure_playlist_table(conn)
+        _ensure_schema(conn)
         with conn.cursor() as cur:
             cur.execute(
                 "SELECT id, spotify_id, name, artwork_url FROM playlist ORDER BY name ASC"
@@ -1293,6 +2018,30 @@ def load_playlists() -> List[Dict[str, Any]]:
         conn.close()
 
 
+def load_playlist_names(spotify_ids: List[str]) -> Dict[str, str]:
+    """Return stored playlist names keyed by Spotify playlist ID."""
+    unique_ids = [spotify_id for spotify_id in dict.fromkeys(spotify_ids) if spotify_id]
+    if not unique_ids:
+        return {}
+
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        with conn.cursor() as cur:
+            placeholders = ", ".join(["%s"] * len(unique_ids))
+            cur.execute(
+                f"SELECT spotify_id, name FROM playlist WHERE spotify_id IN ({placeholders})",
+                unique_ids,
+            )
+            return {
+                row["spotify_id"]: row["name"]
+                for row in cur.fetchall()
+                if row.get("spotify_id") and row.get("name")
+            }
+    finally:
+        conn.close()
+
+
 def _ensure_genre_images_table(conn) -> None:
     with conn.cursor() as cur:
         cur.execute(
@@ -1320,14 +2069,193 @@ def _ensure_new_tracks_columns(conn) -> None:
     _backfill_playlist_artwork(conn)
 
 
-def _resolve_playlist_id_from_entry(cur, entry: Dict[str, Any]) -> Optional[int]:
+def _ensure_new_tracks_table(conn) -> None:
+    with conn.cursor() as cur:
+        cur.execute(
+            "CREATE TABLE IF NOT EXISTS new_tracks ("
+            "id INT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY, "
+            "track VARCHAR(512) NOT NULL, "
+            "reference_url TEXT NULL, "
+            "playlist_id INT UNSIGNED NULL, "
+            "release_year SMALLINT UNSIGNED NULL, "
+            "energy DECIMAL(4,3) NULL, "
+            "copy_title_count INT UNSIGNED NOT NULL DEFAULT 0, "
+            "image_url TEXT NULL, "
+            "UNIQUE KEY uq_new_tracks_track (track(191)), "
+            "KEY idx_new_tracks_playlist (playlist_id), "
+            "CONSTRAINT fk_new_tracks_playlist FOREIGN KEY (playlist_id) "
+            "REFERENCES playlist(id) ON DELETE SET NULL"
+            ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci"
+        )
+    conn.commit()
+    _ensure_new_tracks_columns(conn)
+
+
+def _index_exists(conn, table_name: str, index_name: str) -> bool:
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT COUNT(*) AS cnt FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s",
+            (table_name, index_name),
+        )
+        return int(cur.fetchone()["cnt"]) > 0
+
+
+def _ensure_new_tracks_keyset_indexes(conn) -> None:
+    """Indexes that serve query_new_tracks' (track, id) ordering with and without a playlist filter."""
+    with conn.cursor() as cur:
+        if not _index_exists(conn, "new_tracks", "idx_new_tracks_track_id"):
+            cur.execute("ALTER TABLE new_tracks ADD KEY idx_new_tracks_track_id (track, id)")
+        if not _index_exists(conn, "new_tracks", "idx_new_tracks_playlist_track"):
+            cur.execute(
+                "ALTER TABLE new_tracks ADD KEY idx_new_tracks_playlist_track (playlist_id, track, id)"
+            )
+    conn.commit()
+
+
+def _ensure_historical_track_id_index(conn) -> None:
+    """Index on historical_track.track_id so iter_historical_track_ids streams in index order."""
+    with conn.cursor() as cur:
+        if not _index_exists(conn, "historical_track", "idx_historical_track_id"):
+            cur.execute("ALTER TABLE historical_track ADD KEY idx_historical_track_id (track_id)")
+    conn.commit()
+
+
+def _ensure_app_config_version_column(conn) -> None:
+    """Counter bumped by every settings save so cached copies in other processes reload."""
+    with conn.cursor() as cur:
+        if not _column_exists(conn, "app_config", "config_version"):
+            cur.execute(
+                "ALTER TABLE app_config ADD COLUMN config_version INT UNSIGNED NOT NULL DEFAULT 0 "
+                "AFTER artist_discovery_enabled"
+            )
+    conn.commit()
+
+
+def _ensure_new_tracks_fulltext_index(conn) -> None:
+    """ngram FULLTEXT index on new_tracks.track for search_new_tracks.
+
+    Stopwords are switched off while the index is built: with the ngram parser
+    any token containing one (e.g. "a") would otherwise be left out.
+    """
+    if _index_exists(conn, "new_tracks", "ft_new_tracks_track"):
+        return
+    with conn.cursor() as cur:
+        cur.execute("SET SESSION innodb_ft_enable_stopword = OFF")
+        try:
+            try:
+                cur.execute(
+                    "ALTER TABLE new_tracks ADD FULLTEXT KEY ft_new_tracks_track (track) "
+                    "WITH PARSER ngram"
+                )
+            except pymysql.err.MySQLError:
+                # Servers without the ngram plugin (MariaDB) get a word-based index.
+                cur.execute("ALTER TABLE new_tracks ADD FULLTEXT KEY ft_new_tracks_track (track)")
+        finally:
+            cur.execute("SET SESSION innodb_ft_enable_stopword = DEFAULT")
+    conn.commit()
+
+
+def _ensure_job_table(conn) -> None:
+    """Web-triggered sync, import and download jobs (see spotify_playlist.job_queue)."""
+    with conn.cursor() as cur:
+        cur.execute(
+            "CREATE TABLE IF NOT EXISTS job ("
+            "job_id CHAR(36) CHARACTER SET ascii NOT NULL PRIMARY KEY, "
+            "kind VARCHAR(16) CHARACTER SET ascii NOT NULL, "
+            "status VARCHAR(16) CHARACTER SET ascii NOT NULL, "
+            "worker_pid INT UNSIGNED NULL, "
+            "state MEDIUMTEXT NOT NULL, "
+            "created_at DATETIME(6) NOT NULL, "
+            "updated_at DATETIME(6) NOT NULL, "
+            "KEY idx_job_kind_status (kind, status, updated_at), "
+            "KEY idx_job_status_updated (status, updated_at)"
+            ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci"
+        )
+    conn.commit()
+
+
+# Ordered schema migrations. Each step is idempotent so it can adopt databases
+# that were upgraded by the older per-call checks. Append new steps; never renumber.
+_MIGRATIONS: tuple[tuple[int, str, Callable[[Any], None]], ...] = (
+    (1, "playlist, app_config, source and tracking tables", _ensure_playlist_config_schema),
+    (2, "new_tracks table and columns", _ensure_new_tracks_table),
+    (3, "compact historical track tables", _ensure_historical_tables),
+    (4, "artist release catalog", _ensure_artist_release_tables),
+    (5, "destination membership index", _ensure_playlist_membership_tables),
+    (6, "new_tracks keyset pagination indexes", _ensure_new_tracks_keyset_indexes),
+    (7, "app_config settings version", _ensure_app_config_version_column),
+    (8, "new_tracks full-text search index", _ensure_new_tracks_fulltext_index),
+    (9, "job table", _ensure_job_table),
+    (10, "playlist_membership keyed by URI hash", _ensure_playlist_membership_uri_hash),
+    (11, "historical_track track_id index", _ensure_historical_track_id_index),
+)
+_SCHEMA_LOCK_NAME = "spotify_playground_schema"
+_schema_lock = threading.Lock()
+_schema_version: Optional[int] = None
+
+
+def _run_migrations(conn) -> int:
+    with conn.cursor() as cur:
+        cur.execute(
+            "CREATE TABLE IF NOT EXISTS schema_version ("
+            "version INT UNSIGNED NOT NULL PRIMARY KEY, "
+            "description VARCHAR(255) NOT NULL, "
+            "applied_at DATETIME NOT NULL"
+            ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci"
+        )
+        conn.commit()
+        # Serialise migrations across the CLI, web server and job processes.
+        cur.execute("SELECT GET_LOCK(%s, 60) AS acquired", (_SCHEMA_LOCK_NAME,))
+        if not (cur.fetchone() or {}).get("acquired"):
+            raise RuntimeError("Timed out waiting for another process to migrate the schema")
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT version FROM schema_version")
+            applied = {int(row["version"]) for row in cur.fetchall()}
+        for version, description, migrate in _MIGRATIONS:
+            if version in applied:
+                continue
+            migrate(conn)
+            with conn.cursor() as cur:
+                cur.execute(
+                    "INSERT INTO schema_version (version, description, applied_at) "
+                    "VALUES (%s, %s, %s)",
+                    (version, description, datetime.now()),
+                )
+            conn.commit()
+            applied.add(version)
+        return max(applied, default=0)
+    finally:
+        with conn.cursor() as cur:
+            cur.execute("SELECT RELEASE_LOCK(%s)", (_SCHEMA_LOCK_NAME,))
+            cur.fetchall()
+
+
+def _ensure_schema(conn) -> None:
+    """Bring the schema up to date once per process; later calls return immediately."""
+    global _schema_version
+    if _schema_version is not None:
+        return
+    with _schema_lock:
+        if _schema_version is None:
+            _schema_version = _run_migrations(conn)
+
+
+def _resolve_playlist_id_from_entry(
+    cur, entry: Dict[str, Any], cache: Optional[Dict[str, Optional[int]]] = None
+) -> Optional[int]:
     playlist_id = entry.get("playlist_id")
     if playlist_id is not None:
         return int(playlist_id)
     genre_value = (entry.get("genre") or "").strip() or None
-    if genre_value:
+    if not genre_value:
+        return None
+    if cache is None:
         return _upsert_playlist_cur(cur, name=genre_value)
-    return None
+    if genre_value not in cache:
+        cache[genre_value] = _upsert_playlist_cur(cur, name=genre_value)
+    return cache[genre_value]
 
 
 _NEW_TRACKS_SELECT = (
@@ -1354,13 +2282,146 @@ def _row_to_track(row: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def iter_new_tracks(has_url: Optional[bool] = None) -> Iterator[NewTrack]:
+    """Stream new_tracks rows ordered by track name as compact NewTrack tuples.
+
+    Rows are read through an unbuffered server-side cursor, so memory stays flat
+    however large the backlog is. The connection is held until the iterator is
+    exhausted or closed; inside a store_session() finish it before running
+    other queries.
+    """
+    sql = _NEW_TRACKS_SELECT
+    if has_url is True:
+        sql += "WHERE nt.reference_url IS NOT NULL AND nt.reference_url != '' "
+    elif has_url is False:
+        sql += "WHERE nt.reference_url IS NULL OR nt.reference_url = '' "
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        with conn.cursor(SSCursor) as cur:
+            cur.execute(sql + "ORDER BY nt.track ASC")
+            for row in cur:
+                yield new_track_from_row(row)
+    finally:
+        conn.close()
+
+
 def load_new_tracks() -> List[Dict[str, Any]]:
     """Load all new_tracks rows ordered by track name."""
+    return [track._asdict() for track in iter_new_tracks()]
+
+
+def _new_tracks_filters(
+    genre: Optional[str], playlist_id: Optional[int], has_url: Optional[bool]
+) -> tuple[List[str], List[Any]]:
+    where: List[str] = []
+    params: List[Any] = []
+    if playlist_id is not None:
+        where.append("nt.playlist_id = %s")
+        params.append(int(playlist_id))
+    if genre:
+        if genre == UNCATEGORIZED_GENRE:
+            where.append("(p.id IS NULL OR TRIM(p.name) = '')")
+        else:
+            where.append("p.name = %s")
+            params.append(genre)
+    if has_url is True:
+        where.append("nt.reference_url IS NOT NULL AND nt.reference_url != ''")
+    elif has_url is False:
+        where.append("(nt.reference_url IS NULL OR nt.reference_url = '')")
+    return where, params
+
+
+def query_new_tracks(
+    genre: Optional[str] = None,
+    playlist_id: Optional[int] = None,
+    has_url: Optional[bool] = None,
+    search: Optional[str] = None,
+    limit: Optional[int] = None,
+    after: Optional[tuple[str, int]] = None,
+) -> List[Dict[str, Any]]:
+    """Load new_tracks filtered in SQL, ordered by (track, id).
+
+    ``genre`` matches the playlist name ("Uncategorized" selects tracks without
+    one). Pass ``limit`` and the (track, id) of the last row seen as ``after``
+    to page through results with a keyset cursor.
+    """
+    where, params = _new_tracks_filters(genre, playlist_id, has_url)
+    term = (search or "").strip()
+    if term:
+        escaped = escape_like(term)
+        where.append("nt.track LIKE %s")
+        params.append(f"%{escaped}%")
+    if after is not None:
+        after_track, after_id = after
+        where.append("(nt.track > %s OR (nt.track = %s AND nt.id > %s))")
+        params.extend([after_track, after_track, int(after_id)])
+
+    sql = _NEW_TRACKS_SELECT
+    if where:
+        sql += "WHERE " + " AND ".join(where) + " "
+    sql += "ORDER BY nt.track ASC, nt.id ASC"
+    if limit is not None:
+        sql += " LIMIT %s"
+        params.append(max(1, int(limit)))
+
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        with conn.cursor() as cur:
+            cur.execute(sql, params)
+            return [_row_to_track(row) for row in cur.fetchall()]
+    finally:
+        conn.close()
+
+
+# ngram_token_size: shorter words cannot use the full-text index and fall back to LIKE.
+_FULLTEXT_MIN_TERM = 2
+
+
+def search_new_tracks(
+    query: str,
+    genre: Optional[str] = None,
+    has_url: Optional[bool] = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    """Full-text search over new_tracks.track, best matches first.
+
+    Every word of ``query`` must occur in the track name (substring match via
+    the ngram index). ``genre`` and ``has_url`` filter as in query_new_tracks;
+    page with ``limit`` and ``offset``.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    where, params = _new_tracks_filters(genre, None, has_url)
+    indexed = [term for term in terms if len(term) >= _FULLTEXT_MIN_TERM]
+    for term in terms:
+        if len(term) < _FULLTEXT_MIN_TERM:
+            where.append("nt.track LIKE %s")
+            params.append(f"%{escape_like(term)}%")
+
+    order_by = "nt.track ASC, nt.id ASC"
+    if indexed:
+        against = " ".join(f'+"{term}"' for term in indexed)
+        match = "MATCH (nt.track) AGAINST (%s IN BOOLEAN MODE)"
+        where.insert(0, match)
+        params.insert(0, against)
+        order_by = f"{match} DESC, {order_by}"
+        params.append(against)
+    sql = (
+        _NEW_TRACKS_SELECT
+        + "WHERE " + " AND ".join(where)
+        + f" ORDER BY {order_by} LIMIT %s OFFSET %s"
+    )
+    params.extend([max(1, int(limit)), max(0, int(offset))])
+
     conn = get_connection()
     try:
-        _ensure_new_tracks_columns(conn)
+        _ensure_schema(conn)
         with conn.cursor() as cur:
-            cur.execute(_NEW_TRACKS_SELECT + "ORDER BY nt.track ASC")
+            cur.execute(sql, params)
             return [_row_to_track(row) for row in cur.fetchall()]
     finally:
         conn.close()
@@ -1391,7 +2452,7 @@ def increment_new_track_copy_title_count(track_id: int) -> Optional[int]:
     """Increment copy_title_count for a track. Returns new count or None if not found."""
     conn = get_connection()
     try:
-        _ensure_new_tracks_columns(conn)
+        _ensure_schema(conn)
         with conn.cursor() as cur:
             cur.execute(
                 "UPDATE new_tracks SET copy_title_count = copy_title_count + 1 WHERE id = %s",
@@ -1432,46 +2493,115 @@ def delete_new_track(track_id: int) -> bool:
         conn.close()
 
 
+_RADIO_STRIP_TABLE = "tmp_radio_strip"
+_RADIO_KEEPER_TABLE = "tmp_radio_strip_keeper"
+
+
+def _drop_radio_strip_tables(cur) -> None:
+    # Temporary tables live as long as the session, and pooled sessions are reused.
+    cur.execute(f"DROP TEMPORARY TABLE IF EXISTS {_RADIO_STRIP_TABLE}, {_RADIO_KEEPER_TABLE}")
+
+
 def strip_radio_suffixes_from_db() -> tuple[int, int]:
-    """Remove radio edit/mix suffixes from new_tracks."""
+    """Remove radio edit/mix suffixes from new_tracks.
+
+    Names are normalized in Python once and staged in a temporary table, then
+    merges and renames run as a handful of joined statements. Rows resolve in
+    id order: a row whose clean name already exists is merged into that row
+    (handing over its reference URL if the survivor has none); otherwise the
+    lowest id per clean name is renamed and its siblings merge into it.
+    """
     conn = get_connection()
-    new_tracks_updated = 0
-    new_tracks_deleted = 0
     try:
         with conn.cursor() as cur:
             cur.execute(
                 "SELECT id, track, reference_url FROM new_tracks "
-                "WHERE LOWER(track) LIKE '%radio edit%' OR LOWER(track) LIKE '%radio mix%'"
+                "WHERE LOWER(track) LIKE '%radio edit%' OR LOWER(track) LIKE '%radio mix%' "
+                "ORDER BY id"
             )
+            rows = []
             for row in cur.fetchall():
                 normalized = normalize_track_name(row["track"])
-                if normalized == row["track"]:
-                    continue
+                if normalized != row["track"]:
+                    rows.append((row["id"], normalized, row["reference_url"]))
+            if not rows:
+                return 0, 0
 
-                cur.execute(
-                    "SELECT id, reference_url FROM new_tracks WHERE track = %s AND id != %s LIMIT 1",
-                    (normalized, row["id"]),
+            _drop_radio_strip_tables(cur)
+            cur.execute(
+                f"CREATE TEMPORARY TABLE {_RADIO_STRIP_TABLE} ("
+                "id INT UNSIGNED NOT NULL PRIMARY KEY, "
+                "track VARCHAR(512) NOT NULL, "
+                "reference_url TEXT NULL, "
+                "keeper_id INT UNSIGNED NULL, "
+                "KEY idx_track (track(191)), "
+                "KEY idx_keeper (keeper_id)"
+                ") DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci"
+            )
+            cur.execute(
+                f"CREATE TEMPORARY TABLE {_RADIO_KEEPER_TABLE} ("
+                "track VARCHAR(512) NOT NULL, "
+                "keeper_id INT UNSIGNED NOT NULL, "
+                "KEY idx_track (track(191))"
+                ") DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci"
+            )
+            for start in range(0, len(rows), 1000):
+                cur.executemany(
+                    f"INSERT INTO {_RADIO_STRIP_TABLE} (id, track, reference_url) VALUES (%s, %s, %s)",
+                    rows[start : start + 1000],
                 )
-                existing = cur.fetchone()
-                if existing:
-                    if row["reference_url"] and not existing["reference_url"]:
-                        cur.execute(
-                            "UPDATE new_tracks SET reference_url = %s WHERE id = %s",
-                            (row["reference_url"], existing["id"]),
-                        )
-                    cur.execute("DELETE FROM new_tracks WHERE id = %s", (row["id"],))
-                    new_tracks_deleted += 1
-                else:
-                    cur.execute(
-                        "UPDATE new_tracks SET track = %s WHERE id = %s",
-                        (normalized, row["id"]),
-                    )
-                    new_tracks_updated += 1
+
+            # Clean name already taken by another row: merge into that row.
+            cur.execute(
+                f"UPDATE {_RADIO_STRIP_TABLE} t "
+                "JOIN new_tracks nt ON nt.track = t.track AND nt.id != t.id "
+                "SET t.keeper_id = nt.id"
+            )
+            # Otherwise the lowest id per clean name keeps it; its siblings merge into it.
+            cur.execute(
+                f"INSERT INTO {_RADIO_KEEPER_TABLE} (track, keeper_id) "
+                f"SELECT track, MIN(id) FROM {_RADIO_STRIP_TABLE} "
+                "WHERE keeper_id IS NULL GROUP BY track"
+            )
+            cur.execute(
+                f"UPDATE {_RADIO_STRIP_TABLE} t "
+                f"JOIN {_RADIO_KEEPER_TABLE} k ON k.track = t.track "
+                "SET t.keeper_id = k.keeper_id "
+                "WHERE t.keeper_id IS NULL AND t.id != k.keeper_id"
+            )
+            # A survivor without a URL takes it from its first merged row that has one.
+            cur.execute(
+                "UPDATE new_tracks keeper "
+                "JOIN ("
+                f"SELECT keeper_id, MIN(id) AS donor_id FROM {_RADIO_STRIP_TABLE} "
+                "WHERE keeper_id IS NOT NULL AND reference_url IS NOT NULL AND reference_url != '' "
+                "GROUP BY keeper_id"
+                ") d ON d.keeper_id = keeper.id "
+                "JOIN new_tracks donor ON donor.id = d.donor_id "
+                "SET keeper.reference_url = donor.reference_url "
+                "WHERE keeper.reference_url IS NULL OR keeper.reference_url = ''"
+            )
+            cur.execute(
+                f"DELETE nt FROM new_tracks nt JOIN {_RADIO_STRIP_TABLE} t ON t.id = nt.id "
+                "WHERE t.keeper_id IS NOT NULL"
+            )
+            new_tracks_deleted = cur.rowcount
+            cur.execute(
+                f"UPDATE new_tracks nt JOIN {_RADIO_STRIP_TABLE} t ON t.id = nt.id "
+                "SET nt.track = t.track WHERE t.keeper_id IS NULL"
+            )
+            new_tracks_updated = len(rows) - new_tracks_deleted
+            _drop_radio_strip_tables(cur)
 
         conn.commit()
         return new_tracks_updated, new_tracks_deleted
     except Exception as e:
         conn.rollback()
+        try:
+            with conn.cursor() as cur:
+                _drop_radio_strip_tables(cur)
+        except Exception:
+            pass
         print(f"Error cleaning radio edit/mix suffixes: {e}")
         raise
     finally:
@@ -1494,7 +2624,7 @@ def create_new_track(
     energy_value = normalize_energy(energy)
     conn = get_connection()
     try:
-        _ensure_new_tracks_columns(conn)
+        _ensure_schema(conn)
         with conn.cursor() as cur:
             playlist_id = None
             if genre_value:
@@ -1534,9 +2664,10 @@ def save_new_tracks(tracks: List[Dict[str, Any]], replace: bool = False) -> tupl
 
     conn = get_connection()
     try:
-        _ensure_new_tracks_columns(conn)
+        _ensure_schema(conn)
         rows = []
         seen_in_batch: set[str] = set()
+        playlist_ids: Dict[str, Optional[int]] = {}
         total_valid = 0
         with conn.cursor() as cur:
             for entry in tracks:
@@ -1553,7 +2684,7 @@ def save_new_tracks(tracks: List[Dict[str, Any]], replace: bool = False) -> tupl
                 release_year = normalize_release_year(entry.get("release_year"))
                 energy = normalize_energy(entry.get("energy"))
                 image_url = (entry.get("image_url") or "").strip() or None
-                playlist_id = _resolve_playlist_id_from_entry(cur, entry)
+                playlist_id = _resolve_playlist_id_from_entry(cur, entry, playlist_ids)
                 rows.append(
                     (
                         track_display,
@@ -1574,16 +2705,21 @@ def save_new_tracks(tracks: List[Dict[str, Any]], replace: bool = False) -> tupl
             )
             if replace:
                 cur.execute("DELETE FROM new_tracks")
-                cur.executemany(insert_sql, rows)
+                for start in range(0, len(rows), 1000):
+                    cur.executemany(insert_sql, rows[start : start + 1000])
                 inserted = len(rows)
             else:
-                cur.execute("SELECT track FROM new_tracks")
-                existing = {row["track"] for row in cur.fetchall()}
-                new_rows = [row for row in rows if row[0] not in existing]
-                if new_rows:
-                    cur.executemany(insert_sql, new_rows)
-                inserted = len(new_rows)
+                # Let the unique track key reject known names; duplicates affect no rows.
+                inserted = 0
+                for start in range(0, len(rows), 1000):
+                    cur.executemany(
+                        insert_sql + " ON DUPLICATE KEY UPDATE id = id",
+                        rows[start : start + 1000],
+                    )
+                    inserted += max(cur.rowcount, 0)
         conn.commit()
+        if any(row[5] for row in rows):
+            _backfill_playlist_artwork(conn)
         skipped = 0 if replace else total_valid - inserted
         return inserted, skipped
     except Exception as e:
@@ -1598,7 +2734,7 @@ def load_genre_images() -> Dict[str, str]:
     """Load playlist cover art URLs keyed by playlist name."""
     conn = get_connection()
     try:
-        _ensure_playlist_table(conn)
+        _ensure_schema(conn)
         with conn.cursor() as cur:
             cur.execute(
                 "SELECT name, artwork_url FROM playlist WHERE artwork_url IS NOT NULL"
@@ -1612,6 +2748,66 @@ def load_genre_images() -> Dict[str, str]:
         conn.close()
 
 
+_GENRE_COUNTS_SQL = (
+    "SELECT g.playlist_id, p.name AS genre, g.track_count, "
+    "COALESCE(NULLIF(TRIM(p.artwork_url), ''), gi.image_url, fi.image_url) AS image_url "
+    "FROM (SELECT playlist_id, COUNT(*) AS track_count FROM new_tracks GROUP BY playlist_id) g "
+    "LEFT JOIN playlist p ON p.id = g.playlist_id "
+    "LEFT JOIN genre_images gi ON gi.genre = p.name "
+)
+_FIRST_IMAGE_WINDOW_SQL = (
+    "LEFT JOIN ("
+    "  SELECT playlist_id, image_url FROM ("
+    "    SELECT playlist_id, image_url, "
+    "    ROW_NUMBER() OVER (PARTITION BY playlist_id ORDER BY track, id) AS rn "
+    "    FROM new_tracks "
+    "    WHERE playlist_id IS NOT NULL AND image_url IS NOT NULL AND image_url != ''"
+    "  ) ranked WHERE rn = 1"
+    ") fi ON fi.playlist_id = g.playlist_id"
+)
+# MySQL 5.7 has no window functions; pick the first image per playlist with a join instead.
+_FIRST_IMAGE_FALLBACK_SQL = (
+    "LEFT JOIN ("
+    "  SELECT nt.playlist_id, nt.image_url FROM new_tracks nt "
+    "  JOIN ("
+    "    SELECT playlist_id, MIN(track) AS track FROM new_tracks "
+    "    WHERE playlist_id IS NOT NULL AND image_url IS NOT NULL AND image_url != '' "
+    "    GROUP BY playlist_id"
+    "  ) first_track ON first_track.playlist_id = nt.playlist_id "
+    "  AND first_track.track = nt.track"
+    ") fi ON fi.playlist_id = g.playlist_id"
+)
+
+
+def load_genre_counts() -> List[Dict[str, Any]]:
+    """Count tracks per playlist/genre and resolve each one's image in a single query.
+
+    The image is the playlist artwork, then the legacy genre_images entry, then
+    the first track image in that playlist. Tracks without a playlist come back
+    as one row with ``genre`` None.
+    """
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        with conn.cursor() as cur:
+            try:
+                cur.execute(_GENRE_COUNTS_SQL + _FIRST_IMAGE_WINDOW_SQL)
+            except pymysql.err.ProgrammingError:
+                cur.execute(_GENRE_COUNTS_SQL + _FIRST_IMAGE_FALLBACK_SQL)
+            counts: Dict[Optional[str], Dict[str, Any]] = {}
+            for row in cur.fetchall():
+                genre = (row.get("genre") or "").strip() or None
+                entry = counts.setdefault(
+                    genre, {"genre": genre, "track_count": 0, "image_url": None}
+                )
+                entry["track_count"] += int(row["track_count"])
+                if genre is not None and not entry["image_url"]:
+                    entry["image_url"] = row.get("image_url") or None
+            return list(counts.values())
+    finally:
+        conn.close()
+
+
 def save_genre_image(genre: str, image_url: Optional[str]) -> None:
     """Persist cover art for a playlist (by name)."""
     genre_name = (genre or "").strip()
@@ -1638,7 +2834,7 @@ def resolve_genre_image(
 
     conn = get_connection()
     try:
-        _ensure_playlist_table(conn)
+        _ensure_schema(conn)
         with conn.cursor() as cur:
             cur.execute(
                 "SELECT artwork_url FROM playlist WHERE name = %s LIMIT 1",
@@ -1659,3 +2855,127 @@ def resolve_genre_image(
         if artwork:
             return artwork
     return None
+
+
+# Job functions take connections straight from the pool, bypassing store_session():
+# progress written during a sync run must be visible before the run commits.
+
+
+def create_job(job_id: str, kind: str, fields: Dict[str, Any]) -> None:
+    """Insert a job row; ``fields`` holds status, worker_pid and the JSON state."""
+    columns, state = split_job_fields(fields)
+    now = utc_now()
+    conn = _pool.acquire()
+    try:
+        _ensure_schema(conn)
+        with conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO job (job_id, kind, status, worker_pid, state, created_at, updated_at) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                (
+                    job_id,
+                    kind,
+                    columns.get("status") or "running",
+                    columns.get("worker_pid"),
+                    json.dumps(state, ensure_ascii=False),
+                    now,
+                    now,
+                ),
+            )
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"Error creating job: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def update_job(job_id: str, fields: Dict[str, Any], *, expected_status: Optional[str] = None) -> bool:
+    """Merge ``fields`` into a job.
+
+    Returns False when the job does not exist or, with ``expected_status``, is
+    no longer in that status.
+    """
+    columns, state_updates = split_job_fields(fields)
+    conn = _pool.acquire()
+    try:
+        _ensure_schema(conn)
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT status, worker_pid, state FROM job WHERE job_id = %s FOR UPDATE",
+                (job_id,),
+            )
+            row = cur.fetchone()
+            if row is None or (expected_status is not None and row["status"] != expected_status):
+                return False
+            state = json.loads(row["state"] or "{}")
+            state.update(state_updates)
+            cur.execute(
+                "UPDATE job SET status = %s, worker_pid = %s, state = %s, updated_at = %s "
+                "WHERE job_id = %s",
+                (
+                    columns.get("status", row["status"]),
+                    columns.get("worker_pid", row["worker_pid"]),
+                    json.dumps(state, ensure_ascii=False),
+                    utc_now(),
+                    job_id,
+                ),
+            )
+        conn.commit()
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"Error updating job: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def load_job(job_id: str) -> Optional[Dict[str, Any]]:
+    conn = _pool.acquire()
+    try:
+        _ensure_schema(conn)
+        with conn.cursor() as cur:
+            cur.execute("SELECT * FROM job WHERE job_id = %s", (job_id,))
+            row = cur.fetchone()
+        return job_from_row(row) if row else None
+    finally:
+        conn.close()
+
+
+def load_running_jobs(kind: str) -> List[Dict[str, Any]]:
+    """Running jobs of one kind, most recently updated first."""
+    conn = _pool.acquire()
+    try:
+        _ensure_schema(conn)
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT * FROM job WHERE kind = %s AND status = 'running' "
+                "ORDER BY updated_at DESC",
+                (kind,),
+            )
+            return [job_from_row(row) for row in cur.fetchall()]
+    finally:
+        conn.close()
+
+
+def delete_finished_jobs(retention_days: int) -> int:
+    """Delete jobs that finished more than ``retention_days`` ago."""
+    conn = _pool.acquire()
+    try:
+        _ensure_schema(conn)
+        with conn.cursor() as cur:
+            cur.execute(
+                "DELETE FROM job WHERE status != 'running' AND updated_at < %s",
+                (utc_now() - timedelta(days=retention_days),),
+            )
+            deleted = cur.rowcount
+        conn.commit()
+        return deleted
+    except Exception as e:
+        conn.rollback()
+        print(f"Error deleting finished jobs: {e}")
+        raise
+    finally:
+        conn.close()
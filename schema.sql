@@ -7,12 +7,24 @@
 --   mysql -u spotify -p spotify_playground < schema.sql
 
 SET NAMES utf8mb4;
+-- Keep ngrams that contain stopwords ("a", "i", …) in the new_tracks full-text index.
+SET SESSION innodb_ft_enable_stopword = OFF;
+
+-- Migrations recorded here are skipped by mysql_store; a fresh database
+-- created from this file still gets them marked as applied on first use.
+CREATE TABLE IF NOT EXISTS schema_version (
+  version INT UNSIGNED NOT NULL PRIMARY KEY,
+  description VARCHAR(255) NOT NULL,
+  applied_at DATETIME NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 CREATE TABLE IF NOT EXISTS playlist (
   id INT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
   spotify_id VARCHAR(64) NULL,
   name VARCHAR(512) NOT NULL,
   artwork_url TEXT NULL,
+  snapshot_id VARCHAR(128) NULL,
+  snapshot_since DATETIME NULL,
   UNIQUE KEY uq_playlist_spotify_id (spotify_id),
   UNIQUE KEY uq_playlist_name (name(191))
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -27,6 +39,8 @@ CREATE TABLE IF NOT EXISTS app_config (
   sync_start_updated DATETIME NULL,
   locale VARCHAR(16) NOT NULL DEFAULT 'en',
   artist_discovery_enabled TINYINT(1) NOT NULL DEFAULT 1,
+  -- Bumped by every settings save; processes caching settings reload when it changes
+  config_version INT UNSIGNED NOT NULL DEFAULT 0,
   CONSTRAINT fk_app_config_destination FOREIGN KEY (destination_playlist_ref_id) REFERENCES playlist(id) ON DELETE SET NULL
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
@@ -48,6 +62,22 @@ CREATE TABLE IF NOT EXISTS playlist_tracking (
   CONSTRAINT fk_playlist_tracking FOREIGN KEY (playlist_ref_id) REFERENCES playlist(id) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+CREATE TABLE IF NOT EXISTS historical_key (
+  id INT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
+  playlist_key VARCHAR(64) NOT NULL,
+  UNIQUE KEY uq_historical_key (playlist_key)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Track ids without the "spotify:track:" prefix, per historical_key.
+CREATE TABLE IF NOT EXISTS historical_track (
+  key_id INT UNSIGNED NOT NULL,
+  track_id CHAR(22) CHARACTER SET ascii COLLATE ascii_bin NOT NULL,
+  PRIMARY KEY (key_id, track_id),
+  KEY idx_historical_track_id (track_id),
+  CONSTRAINT fk_historical_track_key FOREIGN KEY (key_id) REFERENCES historical_key(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- URIs that are not plain track URIs (local files, episodes).
 CREATE TABLE IF NOT EXISTS historical_tracks (
   playlist_key VARCHAR(64) NOT NULL,
   track_uri VARCHAR(255) NOT NULL,
@@ -55,6 +85,39 @@ CREATE TABLE IF NOT EXISTS historical_tracks (
   KEY idx_hist_playlist (playlist_key)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+CREATE TABLE IF NOT EXISTS artist_release_check (
+  artist_id VARCHAR(64) NOT NULL PRIMARY KEY,
+  album_total INT UNSIGNED NULL,
+  scanned_since DATETIME NULL,
+  last_checked DATETIME NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS artist_release (
+  artist_id VARCHAR(64) NOT NULL,
+  album_id VARCHAR(64) NOT NULL,
+  album_name VARCHAR(512) NULL,
+  album_type VARCHAR(32) NULL,
+  release_date VARCHAR(10) NULL,
+  tracks_json MEDIUMTEXT NULL,
+  last_checked DATETIME NOT NULL,
+  PRIMARY KEY (artist_id, album_id),
+  KEY idx_artist_release_album (album_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS playlist_membership_state (
+  spotify_id VARCHAR(64) NOT NULL PRIMARY KEY,
+  snapshot_id VARCHAR(128) NOT NULL,
+  updated_at DATETIME NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- uri_hash is MD5(track_uri); local-file URIs are too long to key on directly.
+CREATE TABLE IF NOT EXISTS playlist_membership (
+  spotify_id VARCHAR(64) NOT NULL,
+  uri_hash BINARY(16) NOT NULL,
+  track_uri TEXT NOT NULL,
+  PRIMARY KEY (spotify_id, uri_hash)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 CREATE TABLE IF NOT EXISTS new_tracks (
   id INT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
   track VARCHAR(512) NOT NULL,
@@ -66,16 +129,39 @@ CREATE TABLE IF NOT EXISTS new_tracks (
   image_url TEXT NULL,
   UNIQUE KEY uq_new_tracks_track (track(191)),
   KEY idx_new_tracks_playlist (playlist_id),
+  KEY idx_new_tracks_track_id (track, id),
+  KEY idx_new_tracks_playlist_track (playlist_id, track, id),
+  FULLTEXT KEY ft_new_tracks_track (track) WITH PARSER ngram,
   CONSTRAINT fk_new_tracks_playlist FOREIGN KEY (playlist_id) REFERENCES playlist(id) ON DELETE SET NULL
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Web-triggered sync/import/download jobs; progress fields live in the JSON state column.
+CREATE TABLE IF NOT EXISTS job (
+  job_id CHAR(36) CHARACTER SET ascii NOT NULL PRIMARY KEY,
+  kind VARCHAR(16) CHARACTER SET ascii NOT NULL,
+  status VARCHAR(16) CHARACTER SET ascii NOT NULL,
+  worker_pid INT UNSIGNED NULL,
+  state MEDIUMTEXT NOT NULL,
+  created_at DATETIME(6) NOT NULL,
+  updated_at DATETIME(6) NOT NULL,
+  KEY idx_job_kind_status (kind, status, updated_at),
+  KEY idx_job_status_updated (status, updated_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 CREATE TABLE IF NOT EXISTS genre_images (
   genre VARCHAR(512) NOT NULL PRIMARY KEY,
   image_url TEXT NOT NULL
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
--- Existing database? Run migrations via the app, or manually:
+-- Existing database? The app applies pending migrations (see mysql_store._MIGRATIONS)
+-- once per process on first database access. Manual equivalent:
 -- 1. Add spotify_id to playlist; create playlist_source / playlist_tracking
 -- 2. Migrate rows from source_playlists and tracking_playlists
 -- 3. Migrate destination_config and tracking_start into app_config
 -- 4. Drop legacy source_playlists, tracking_playlists, destination_config, tracking_start
+-- 5. Move spotify:track: rows from historical_tracks into historical_key / historical_track
+-- 6. Add app_config.config_version (INT UNSIGNED NOT NULL DEFAULT 0)
+-- 7. Add FULLTEXT KEY ft_new_tracks_track (track) WITH PARSER ngram to new_tracks (stopwords off)
+-- 8. Create job table (sync/import/download jobs)
+-- 9. Recreate playlist_membership keyed by uri_hash BINARY(16) (MD5 of track_uri); clear playlist_membership_state
+-- 10. Add KEY idx_historical_track_id (track_id) to historical_track
@@ -0,0 +1,101 @@
+"""In-process cache of the app_config settings, shared by the storage backends."""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from store_common import parse_datetime
+
+# A cached copy is served this long before the database is asked for its config_version.
+RECHECK_SECONDS = 1.0
+
+# One round trip: the app_config row, then source and tracking playlists as extra rows.
+SETTINGS_SQL = (
+    "SELECT 'config' AS kind, 0 AS sort_order, p.spotify_id, ac.config_version, "
+    "ac.ui_skin, ac.locale, ac.tracking_start_date, ac.sync_start_date, "
+    "ac.artist_discovery_enabled "
+    "FROM app_config ac "
+    "LEFT JOIN playlist p ON p.id = ac.destination_playlist_ref_id "
+    "WHERE ac.singleton = 1 "
+    "UNION ALL "
+    "SELECT 'source', ps.sort_order, p.spotify_id, NULL, NULL, NULL, NULL, NULL, NULL "
+    "FROM playlist_source ps INNER JOIN playlist p ON p.id = ps.playlist_ref_id "
+    "UNION ALL "
+    "SELECT 'tracking', pt.sort_order, p.spotify_id, NULL, NULL, NULL, NULL, NULL, NULL "
+    "FROM playlist_tracking pt INNER JOIN playlist p ON p.id = pt.playlist_ref_id"
+)
+
+
+def settings_from_rows(rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build the settings dict from the rows of ``SETTINGS_SQL``."""
+    settings: Dict[str, Any] = {
+        "config_version": 0,
+        "ui_skin": None,
+        "locale": None,
+        "tracking_start_date": None,
+        "sync_start_date": None,
+        "artist_discovery_enabled": None,
+        "destination_playlist": "",
+    }
+    playlists: Dict[str, List[Tuple[int, str]]] = {"source": [], "tracking": []}
+    for row in rows:
+        if row["kind"] == "config":
+            settings.update(
+                config_version=int(row.get("config_version") or 0),
+                ui_skin=row.get("ui_skin"),
+                locale=row.get("locale"),
+                tracking_start_date=parse_datetime(row.get("tracking_start_date")),
+                sync_start_date=parse_datetime(row.get("sync_start_date")),
+                artist_discovery_enabled=row.get("artist_discovery_enabled"),
+                destination_playlist=row.get("spotify_id") or "",
+            )
+        elif row.get("spotify_id"):
+            playlists[row["kind"]].append((int(row["sort_order"]), row["spotify_id"]))
+    settings["source_playlists"] = tuple(spotify_id for _, spotify_id in sorted(playlists["source"]))
+    settings["tracking_playlists"] = tuple(
+        spotify_id for _, spotify_id in sorted(playlists["tracking"])
+    )
+    return settings
+
+
+class SettingsCache:
+    """Last loaded settings plus the app_config version they were read at.
+
+    ``get`` serves the cached copy for ``recheck_seconds``; after that it calls
+    ``refresh(cached_version)``, which returns None while the stored version is
+    unchanged (one tiny query) or freshly loaded settings otherwise. Saves bump
+    the version for other processes and call ``invalidate`` for this one.
+    """
+
+    def __init__(self, recheck_seconds: float = RECHECK_SECONDS) -> None:
+        self._recheck = recheck_seconds
+        self._lock = threading.Lock()
+        self._settings: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._generation = 0
+
+    def get(self, refresh: Callable[[Optional[int]], Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+        with self._lock:
+            cached = self._settings
+            generation = self._generation
+            if cached is not None and time.monotonic() - self._checked_at < self._recheck:
+                return cached
+        loaded = refresh(cached["config_version"] if cached is not None else None)
+        settings = cached if loaded is None else loaded
+        with self._lock:
+            # A save in this process while we were reading wins over what we read.
+            if self._generation == generation:
+                self._settings = settings
+                self._checked_at = time.monotonic()
+        return settings
+
+    @property
+    def generation(self) -> int:
+        """Bumped by every ``invalidate``, so holders of a settings copy can notice saves."""
+        return self._generation
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._settings = None
+            self._generation += 1
@@ -1,11 +1,56 @@
 import traceback
 
+from db_store import load_playlist_membership, save_playlist_membership
+
 from spotify_playlist.colors import Colors
 from spotify_playlist.deps import SpotifyException
 from spotify_playlist.get_all_playlist_tracks import get_all_playlist_tracks
 from spotify_playlist.loading_progress import loading_bar, tqdm
 
 
+def _existing_destination_uris(sp, doel_playlist_id, uris, quiet: bool):
+    """Return (uris already in the destination, destination info, index source).
+
+    The local membership index answers directly while its snapshot_id matches the
+    playlist; otherwise the destination is read in full and the index rebuilt.
+    Index source is "index", "rebuilt", or None when the index could not be stored.
+    """
+    doel_playlist_info = sp.playlist(doel_playlist_id, fields="name,snapshot_id,tracks.total")
+    snapshot_id = doel_playlist_info.get("snapshot_id")
+    indexed_snapshot, present = load_playlist_membership(doel_playlist_id, uris)
+    if snapshot_id and indexed_snapshot == snapshot_id:
+        return present, doel_playlist_info, "index"
+
+    if quiet:
+        doel_playlist_tracks = get_all_playlist_tracks(sp, doel_playlist_id)
+    else:
+        with loading_bar("Fetching destination playlist..."):
+            doel_playlist_tracks = get_all_playlist_tracks(sp, doel_playlist_id)
+    stored = save_playlist_membership(doel_playlist_id, snapshot_id, doel_playlist_tracks, replace=True)
+    doel_playlist_info["track_count"] = len(doel_playlist_tracks)
+    existing = {uri for uri in uris if uri in doel_playlist_tracks}
+    return existing, doel_playlist_info, "rebuilt" if stored else None
+
+
+def _record_own_additions(sp, doel_playlist_id, doel_playlist_info, added_uris) -> None:
+    """Move the membership index to the post-add snapshot, if only our additions changed it.
+
+    The track total must equal the indexed snapshot's total plus what we added;
+    otherwise an outside edit slipped in and nothing is recorded, so the stale
+    stored snapshot makes the next sync re-read the destination.
+    """
+    indexed_total = (doel_playlist_info.get("tracks") or {}).get("total")
+    if indexed_total is None:
+        return
+    try:
+        current = sp.playlist(doel_playlist_id, fields="snapshot_id,tracks.total")
+    except Exception:
+        return
+    if (current.get("tracks") or {}).get("total") != indexed_total + len(added_uris):
+        return
+    save_playlist_membership(doel_playlist_id, current.get("snapshot_id"), added_uris)
+
+
 def add_tracks_to_playlist(sp, nieuwe_nummers_uris, doel_playlist_id, quiet: bool = False) -> int:
     """Adds tracks to the destination playlist after duplicate checking.
 
@@ -31,18 +76,21 @@ def add_tracks_to_playlist(sp, nieuwe_nummers_uris, doel_playlist_id, quiet: boo
         log(f"{Colors.BRIGHT_YELLOW}⚠️  {internal_duplicates} duplicates removed from new tracks list.{Colors.RESET}")
 
     log(f"{Colors.DIM}⏳ Checking {len(nieuwe_nummers_uris)} unique new tracks against destination playlist...{Colors.RESET}")
+    doel_playlist_info = None
+    index_source = None
     try:
-        if quiet:
-            doel_playlist_tracks = get_all_playlist_tracks(sp, doel_playlist_id)
-        else:
-            with loading_bar("Fetching destination playlist..."):
-                doel_playlist_tracks = get_all_playlist_tracks(sp, doel_playlist_id)
-        log(
-            f"{Colors.BRIGHT_CYAN}   Destination playlist currently contains "
-            f"{Colors.BOLD}{len(doel_playlist_tracks)}{Colors.RESET}{Colors.BRIGHT_CYAN} tracks{Colors.RESET}"
+        bestaande_uris, doel_playlist_info, index_source = _existing_destination_uris(
+            sp, doel_playlist_id, nieuwe_nummers_uris, quiet
         )
+        if index_source == "index":
+            log(f"{Colors.DIM}   Destination unchanged since last sync — using local track index{Colors.RESET}")
+        else:
+            log(
+                f"{Colors.BRIGHT_CYAN}   Destination playlist currently contains "
+                f"{Colors.BOLD}{doel_playlist_info['track_count']}{Colors.RESET}{Colors.BRIGHT_CYAN} tracks{Colors.RESET}"
+            )
 
-        unieke_nieuwe_uris = [uri for uri in nieuwe_nummers_uris if uri not in doel_playlist_tracks]
+        unieke_nieuwe_uris = [uri for uri in nieuwe_nummers_uris if uri not in bestaande_uris]
 
         if len(unieke_nieuwe_uris) < len(nieuwe_nummers_uris):
             duplicates = len(nieuwe_nummers_uris) - len(unieke_nieuwe_uris)
@@ -68,7 +116,8 @@ def add_tracks_to_playlist(sp, nieuwe_nummers_uris, doel_playlist_id, quiet: boo
         log(f"{Colors.BOLD}{Colors.BRIGHT_GREEN}➕  Adding Tracks  ➕{Colors.RESET}")
         log(f"{Colors.BOLD}{Colors.BRIGHT_GREEN}{'═'*70}{Colors.RESET}\n")
         try:
-            doel_playlist_info = sp.playlist(doel_playlist_id, fields='name')
+            if doel_playlist_info is None:
+                doel_playlist_info = sp.playlist(doel_playlist_id, fields='name')
             playlist_name = doel_playlist_info['name']
             log(
                 f"{Colors.BRIGHT_CYAN}📝 Adding {Colors.BOLD}{Colors.BRIGHT_WHITE}"
@@ -83,8 +132,8 @@ def add_tracks_to_playlist(sp, nieuwe_nummers_uris, doel_playlist_id, quiet: boo
             )
 
         # The API can add at most 100 tracks at a time
+        total_added = 0
         try:
-            total_added = 0
             batch_starts = list(range(0, len(nieuwe_nummers_uris), 100))
             batch_iter = batch_starts if quiet else tqdm(batch_starts, desc="Adding to playlist", unit="batch")
             for i in batch_iter:
@@ -120,6 +169,13 @@ def add_tracks_to_playlist(sp, nieuwe_nummers_uris, doel_playlist_id, quiet: boo
             if quiet:
                 raise
             return 0
+        finally:
+            # Our own additions move the snapshot; record them so the next sync
+            # does not mistake the new snapshot for an outside edit.
+            if total_added and index_source:
+                _record_own_additions(
+                    sp, doel_playlist_id, doel_playlist_info, nieuwe_nummers_uris[:total_added]
+                )
 
     log(f"\n{Colors.BOLD}{Colors.BRIGHT_CYAN}{'═'*70}{Colors.RESET}")
     log(f"{Colors.BOLD}{Colors.BRIGHT_CYAN}✅  No New Tracks  ✅{Colors.RESET}")
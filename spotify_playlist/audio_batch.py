@@ -7,7 +7,7 @@ import time
 import urllib.error
 from datetime import datetime, timezone
 
-from spotify_playlist.deps import SpotifyException
+from spotify_playlist.spotify_rate_limiter import is_rate_limited_error, retry_after_from_exception
 
 AUDIO_EXTENSIONS = ('.wav', '.aiff', '.aif')
 DEFAULT_MUSIC_DIR = '/Volumes/ShortJack/music'
@@ -30,27 +30,20 @@ def utc_timestamp() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def spotify_call_with_retry(callable_fn, *, max_attempts: int = 5):
+def http_call_with_retry(callable_fn, *, max_attempts: int = 5):
+    """Retry a plain urllib call on HTTP 429, honouring Retry-After, else backing off.
+
+    Spotify client calls must not go through this: the client's rate limiter
+    already waits out Retry-After and retries 429s (see call_rate_limited).
+    """
     delay = 1.0
-    last_exc: Exception | None = None
-    for _attempt in range(max_attempts):
+    for attempt in range(max_attempts):
         try:
             return callable_fn()
-        except SpotifyException as exc:
-            last_exc = exc
-            message = str(exc).lower()
-            if '429' in message or 'rate limit' in message:
-                time.sleep(delay)
-                delay = min(delay * 2, 30.0)
-                continue
-            raise
         except urllib.error.HTTPError as exc:
-            last_exc = exc
-            if exc.code == 429:
-                time.sleep(delay)
-                delay = min(delay * 2, 30.0)
-                continue
-            raise
-    if last_exc is not None:
-        raise last_exc
-    raise RuntimeError('Spotify call failed without exception')
+            if not is_rate_limited_error(exc) or attempt == max_attempts - 1:
+                raise
+            retry_after = retry_after_from_exception(exc)
+            time.sleep(retry_after if retry_after is not None else delay)
+            delay = min(delay * 2, 30.0)
+    raise RuntimeError('HTTP call failed without exception')
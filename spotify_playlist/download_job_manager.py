@@ -1,103 +1,15 @@
-"""File-backed download job tracking for web-triggered AIFF downloads."""
+"""Download jobs for web-triggered AIFF downloads, stored in the job table."""
 
 from __future__ import annotations
 
-import json
 import os
 import threading
-import uuid
-from datetime import datetime, timezone
-from pathlib import Path
 from typing import Any
 
+from db_store import NewTrack, load_job
 from spotify_playlist.config import YOUTUBE_DOWNLOAD_DIR
 from spotify_playlist.download_youtube_wav import download_youtube_tracks, load_tracks_from_app
-
-PROJECT_ROOT = Path(__file__).resolve().parent.parent
-JOBS_DIR = PROJECT_ROOT / ".download_jobs"
-_jobs_lock = threading.Lock()
-
-
-def _utc_now() -> str:
-    return datetime.now(timezone.utc).isoformat()
-
-
-def _job_path(job_id: str) -> Path:
-    safe_id = "".join(ch for ch in job_id if ch.isalnum() or ch in "-")
-    return JOBS_DIR / f"{safe_id}.json"
-
-
-def _read_job_file(job_id: str) -> dict[str, Any] | None:
-    path = _job_path(job_id)
-    if not path.is_file():
-        return None
-    try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except (OSError, json.JSONDecodeError):
-        return None
-
-
-def _write_job_file(job: dict[str, Any]) -> None:
-    JOBS_DIR.mkdir(parents=True, exist_ok=True)
-    path = _job_path(job["job_id"])
-    tmp_path = path.with_suffix(".json.tmp")
-    tmp_path.write_text(json.dumps(job, ensure_ascii=False), encoding="utf-8")
-    tmp_path.replace(path)
-
-
-def _snapshot_job(job: dict[str, Any]) -> dict[str, Any]:
-    return {
-        "job_id": job["job_id"],
-        "status": job["status"],
-        "phase": job["phase"],
-        "message": job["message"],
-        "track_index": job.get("track_index"),
-        "track_total": job.get("track_total"),
-        "track_name": job.get("track_name"),
-        "success_count": job.get("success_count"),
-        "error_count": job.get("error_count"),
-        "last_error": job.get("last_error"),
-        "output_dir": job.get("output_dir"),
-        "result": job.get("result"),
-        "error": job.get("error"),
-        "created_at": job.get("created_at"),
-        "updated_at": job.get("updated_at"),
-    }
-
-
-def _update_job(job_id: str, **fields: Any) -> None:
-    with _jobs_lock:
-        job = _read_job_file(job_id)
-        if not job:
-            return
-        job.update(fields)
-        job["updated_at"] = _utc_now()
-        _write_job_file(job)
-
-
-def _on_progress(job_id: str, event: dict[str, Any]) -> None:
-    phase = event.get("phase", "running")
-    status = "error" if phase == "error" else "running"
-    if phase == "done":
-        status = "done"
-
-    updates: dict[str, Any] = {
-        "status": status,
-        "phase": phase,
-        "message": event.get("message", ""),
-    }
-    for key in (
-        "track_index",
-        "track_total",
-        "track_name",
-        "success_count",
-        "error_count",
-        "last_error",
-    ):
-        if key in event:
-            updates[key] = event[key]
-
-    _update_job(job_id, **updates)
+from spotify_playlist.job_queue import DOWNLOAD_JOB, create_job, get_job, report_progress, update_job
 
 
 def _resolve_output_dir() -> tuple[str | None, str | None]:
@@ -119,11 +31,11 @@ def resolve_output_dir() -> tuple[str | None, str | None]:
     return _resolve_output_dir()
 
 
-def run_download_job(job_id: str, tracks: list[dict], output_dir: str) -> None:
-    """Execute the download and persist progress to the job file."""
+def run_download_job(job_id: str, tracks: list[NewTrack], output_dir: str) -> None:
+    """Execute the download and persist progress to the job table."""
     try:
         def progress(event: dict[str, Any]) -> None:
-            _on_progress(job_id, event)
+            report_progress(DOWNLOAD_JOB, job_id, event)
 
         success_count, error_count = download_youtube_tracks(
             tracks,
@@ -132,11 +44,12 @@ def run_download_job(job_id: str, tracks: list[dict], output_dir: str) -> None:
             tag_metadata=True,
             on_progress=progress,
         )
-        final_job = _read_job_file(job_id) or {}
+        update_job(job_id)  # flush coalesced progress before reading last_error
+        final_job = load_job(job_id) or {}
         last_error = final_job.get("last_error")
         if success_count == 0 and error_count > 0:
             message = last_error or "No tracks were downloaded."
-            _update_job(
+            update_job(
                 job_id,
                 status="error",
                 phase="error",
@@ -152,7 +65,7 @@ def run_download_job(job_id: str, tracks: list[dict], output_dir: str) -> None:
             )
             return
 
-        _update_job(
+        update_job(
             job_id,
             status="done",
             phase="done",
@@ -166,7 +79,7 @@ def run_download_job(job_id: str, tracks: list[dict], output_dir: str) -> None:
             },
         )
     except Exception as exc:
-        _update_job(
+        update_job(
             job_id,
             status="error",
             phase="error",
@@ -176,7 +89,7 @@ def run_download_job(job_id: str, tracks: list[dict], output_dir: str) -> None:
 
 
 def create_download_job() -> tuple[str | None, str | None]:
-    """Validate config, create a job file, and start a background download thread."""
+    """Validate config, create a job, and start a background download thread."""
     output_dir, error = _resolve_output_dir()
     if error:
         return None, error
@@ -188,20 +101,12 @@ def create_download_job() -> tuple[str | None, str | None]:
     except Exception as exc:
         return None, f"Could not load tracks from database: {exc}"
 
-    job_id = str(uuid.uuid4())
-    job = {
-        "job_id": job_id,
-        "status": "running",
-        "phase": "queued",
-        "message": "Preparing download…",
-        "track_total": len(tracks),
-        "output_dir": output_dir,
-        "created_at": _utc_now(),
-        "updated_at": _utc_now(),
-        "result": None,
-        "error": None,
-    }
-    _write_job_file(job)
+    job_id = create_job(
+        DOWNLOAD_JOB,
+        "Preparing download…",
+        track_total=len(tracks),
+        output_dir=output_dir,
+    )
 
     thread = threading.Thread(
         target=run_download_job,
@@ -213,7 +118,4 @@ def create_download_job() -> tuple[str | None, str | None]:
 
 
 def get_download_job(job_id: str) -> dict[str, Any] | None:
-    job = _read_job_file(job_id)
-    if not job:
-        return None
-    return _snapshot_job(job)
+    return get_job(DOWNLOAD_JOB, job_id)
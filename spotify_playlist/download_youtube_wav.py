@@ -6,7 +6,7 @@ import shutil
 import subprocess
 from typing import Callable, Optional
 
-from db_store import delete_new_track, load_new_tracks
+from db_store import NewTrack, delete_new_track, iter_new_tracks
 from spotify_playlist.action_sound import play_action_done
 from spotify_playlist.colors import Colors
 from spotify_playlist.spotify_track_energy import format_energy_label
@@ -258,14 +258,11 @@ def download_youtube_urls(
     return success_count, error_count
 
 
-def load_tracks_from_app() -> list[dict]:
+def load_tracks_from_app() -> list[NewTrack]:
     """Load new_tracks rows that have a YouTube reference URL."""
-    tracks = load_new_tracks()
-    with_url = [
-        track
-        for track in tracks
-        if track.get('reference_url')
-    ]
+    # Streamed and filtered in SQL; the list is kept because each download takes
+    # far longer than a server-side cursor may stay idle.
+    with_url = list(iter_new_tracks(has_url=True))
     if not with_url:
         raise ValueError(
             "No tracks with YouTube URL found in the app. "
@@ -275,7 +272,7 @@ def load_tracks_from_app() -> list[dict]:
 
 
 def download_youtube_tracks(
-    tracks: list[dict],
+    tracks: list[NewTrack],
     output_dir: str,
     *,
     overwrite: bool = False,
@@ -297,8 +294,8 @@ def download_youtube_tracks(
         )
 
     for index, track in enumerate(tracks, start=1):
-        track_name = track.get('track', 'unknown')
-        url = track.get('reference_url')
+        track_name = track.track or 'unknown'
+        url = track.reference_url
         print(
             f"\n{Colors.BRIGHT_WHITE}[{index}/{len(tracks)}]{Colors.RESET} "
             f"{Colors.BRIGHT_CYAN}{track_name}{Colors.RESET}"
@@ -323,13 +320,13 @@ def download_youtube_tracks(
                 output_name=track_name,
                 overwrite=overwrite,
                 tag_metadata=tag_metadata,
-                genre=track.get('genre'),
-                year=track.get('release_year'),
-                energy=track.get('energy'),
+                genre=track.genre,
+                year=track.release_year,
+                energy=track.energy,
             )
             if audio_path:
                 print(f"    {Colors.BRIGHT_GREEN}✅ Saved: {audio_path}{Colors.RESET}")
-                track_id = track.get('id')
+                track_id = track.id
                 if track_id is not None:
                     try:
                         if delete_new_track(track_id):
@@ -460,7 +457,7 @@ def run_download_youtube_wav(
         f"\n{Colors.BRIGHT_CYAN}URL source: [Enter] app database  [1] paste  [2] file: {Colors.RESET}"
     ).strip().lower()
 
-    tracks_from_app: list[dict] = []
+    tracks_from_app: list[NewTrack] = []
     urls: list[str] = []
 
     if source in ('', 'app', 'database', 'db'):
@@ -475,8 +472,8 @@ def run_download_youtube_wav(
                 f"database.{Colors.RESET}\n"
             )
             for track in tracks_from_app:
-                print(f"  • {track['track']}")
-                print(f"    {Colors.DIM}{track['reference_url']}{Colors.RESET}")
+                print(f"  • {track.track}")
+                print(f"    {Colors.DIM}{track.reference_url}{Colors.RESET}")
         except ValueError as exc:
             print(f"{Colors.BRIGHT_RED}❌ {exc}{Colors.RESET}")
             return
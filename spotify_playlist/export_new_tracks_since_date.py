@@ -6,6 +6,7 @@ from db_store import (
     load_tracking_start_date,
     save_new_tracks,
     save_tracking_start_date,
+    store_session,
     upsert_playlist,
 )
 from normalize_track_name import normalize_track_name
@@ -25,6 +26,7 @@ def _report(on_progress: ProgressCallback | None, **payload: Any) -> None:
         on_progress(payload)
 
 
+@store_session()
 def export_new_tracks_since_date(
     sp,
     playlist_ids,
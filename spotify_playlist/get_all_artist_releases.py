@@ -1,10 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Callable
 
-from spotify_playlist.get_artist_new_releases import get_artist_new_releases
+from db_store import load_artist_release_catalog, save_artist_release_catalog
+
+from spotify_playlist.get_artist_new_releases import get_artist_new_releases, new_catalog_entry
 from spotify_playlist.get_followed_artists import get_followed_artists
 from spotify_playlist.loading_progress import loading_bar, tqdm
 
 ProgressCallback = Callable[[dict[str, Any]], None]
+# Scans wait on the network; the shared rate limiter caps the actual request rate.
+DEFAULT_MAX_WORKERS = 8
 
 
 def _load_artist_names(
@@ -36,8 +41,12 @@ def get_all_artist_releases(
     days_back=30,
     on_progress: ProgressCallback | None = None,
     quiet: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
 ):
-    """Fetches new releases from all followed artists."""
+    """Fetches new releases from all followed artists.
+
+    Artists are scanned concurrently; results are merged in followed-artist order.
+    """
 
     def log(message: str = "") -> None:
         if not quiet:
@@ -74,33 +83,50 @@ def get_all_artist_releases(
         artist_total=artist_total,
     )
 
-    all_new_releases = {}
-    iterator = artist_ids
-    if not quiet:
-        iterator = tqdm(artist_ids, desc="Checking releases", unit="artist")
+    catalog = load_artist_release_catalog(artist_ids)
+    for artist_id in artist_ids:
+        catalog.setdefault(artist_id, new_catalog_entry())
+
+    releases_by_index: dict[int, dict] = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            executor.submit(
+                get_artist_new_releases, sp, artist_id, days_back, catalog[artist_id]
+            ): (index, artist_id)
+            for index, artist_id in enumerate(artist_ids)
+        }
+        completed = as_completed(futures)
+        if not quiet:
+            completed = tqdm(completed, total=len(futures), desc="Checking releases", unit="artist")
+        writer = getattr(completed, "write", print)
 
-    for index, artist_id in enumerate(iterator, start=1):
-        artist_name = artist_names.get(artist_id, artist_id[:8])
-        try:
+        for done_count, future in enumerate(completed, start=1):
+            index, artist_id = futures[future]
+            artist_name = artist_names.get(artist_id, artist_id[:8])
             report(
                 phase="artists_scanning",
-                message=f"Checking {artist_name} ({index}/{artist_total})",
-                artist_index=index,
+                message=f"Checking {artist_name} ({done_count}/{artist_total})",
+                artist_index=done_count,
                 artist_total=artist_total,
                 artist_name=artist_name,
                 playlist_name=artist_name,
             )
-            releases = get_artist_new_releases(sp, artist_id, days_back)
+            try:
+                releases = future.result()
+            except Exception as e:
+                if not quiet:
+                    writer(f"   ⚠️  Error checking artist {artist_id}: {e}")
+                continue
             if releases:
                 if not quiet:
-                    writer = getattr(iterator, "write", print)
                     writer(f"   ✅ {artist_name}: {len(releases)} new releases found")
-                all_new_releases.update(releases)
-        except Exception as e:
-            if not quiet:
-                writer = getattr(iterator, "write", print)
-                writer(f"   ⚠️  Error checking artist {artist_id}: {e}")
-            continue
+                releases_by_index[index] = releases
+
+    save_artist_release_catalog(catalog)
+
+    all_new_releases = {}
+    for index in sorted(releases_by_index):
+        all_new_releases.update(releases_by_index[index])
 
     log(f"\n   Total {len(all_new_releases)} new releases found from {artist_total} artists")
     report(
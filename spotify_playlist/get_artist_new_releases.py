@@ -17,56 +17,167 @@ def _parse_release_date(release_date: str) -> datetime | None:
         return None
 
 
-def get_artist_new_releases(sp, artist_id, days_back=30):
-    """Fetches new releases from an artist within the specified number of days."""
+_ALBUMS_BATCH_SIZE = 20
+# A catalog entry younger than this may skip the full artist_albums scan.
+CATALOG_FRESH_DAYS = 7
+
+
+def _load_album_tracks(sp, album_ids: list[str]) -> dict[str, list[dict]]:
+    """Resolve track lists for many albums via the multi-album endpoint.
+
+    ``sp.albums`` embeds the first 50 tracks of each album; only longer albums
+    need extra pages.
+    """
+    tracks_by_album: dict[str, list[dict]] = {}
+    for batch_start in range(0, len(album_ids), _ALBUMS_BATCH_SIZE):
+        batch = album_ids[batch_start : batch_start + _ALBUMS_BATCH_SIZE]
+        response = sp.albums(batch)
+        for album in response.get("albums") or []:
+            if not album or not album.get("id"):
+                continue
+            page = album.get("tracks") or {}
+            items = list(page.get("items") or [])
+            while page.get("next"):
+                page = sp.next(page) or {}
+                items.extend(page.get("items") or [])
+            tracks_by_album[album["id"]] = items
+    return tracks_by_album
+
+
+def new_catalog_entry() -> dict:
+    """Empty per-artist entry in the shape used by load_artist_release_catalog."""
+    return {"album_total": None, "scanned_since": None, "last_checked": None, "albums": {}}
+
+
+def _remember_album(entry: dict, album: dict) -> None:
+    known = entry["albums"].get(album["id"])
+    name = album.get("name", "Unknown")
+    album_type = album.get("album_type")
+    release_date = album.get("release_date", "")
+    if known is None:
+        entry["albums"][album["id"]] = {
+            "name": name,
+            "album_type": album_type,
+            "release_date": release_date,
+            "tracks": None,
+            "dirty": True,
+        }
+    elif (known.get("name"), known.get("album_type"), known.get("release_date")) != (
+        name,
+        album_type,
+        release_date,
+    ):
+        known.update(name=name, album_type=album_type, release_date=release_date, dirty=True)
+
+
+def _catalog_is_current(entry: dict, first_page: dict, cutoff_date: datetime, now: datetime) -> bool:
+    """True when page one shows nothing the last full scan did not already record."""
+    last_checked = entry.get("last_checked")
+    scanned_since = entry.get("scanned_since")
+    if last_checked is None or scanned_since is None:
+        return False
+    if now - last_checked > timedelta(days=CATALOG_FRESH_DAYS) or scanned_since > cutoff_date:
+        return False
+    if first_page.get("total") != entry.get("album_total"):
+        return False
+    return all(
+        album.get("id") in entry["albums"]
+        for album in first_page.get("items") or []
+        if album and album.get("id")
+    )
+
+
+def get_artist_new_releases(sp, artist_id, days_back=30, catalog=None):
+    """Fetches new releases from an artist within the specified number of days.
+
+    ``catalog`` is this artist's entry from load_artist_release_catalog (or
+    new_catalog_entry()); it is updated in place. When it was refreshed recently
+    and page one of artist_albums holds no unknown album, the stored albums and
+    tracks are reused and the scan costs a single request.
+    """
     new_tracks = {}
+    entry = catalog if catalog is not None else new_catalog_entry()
     try:
-        cutoff_date = datetime.now() - timedelta(days=days_back)
-        offset = 0
-
-        while True:
-            page = sp.artist_albums(
-                artist_id,
-                album_type="album,single",
-                limit=50,
-                offset=offset,
-            )
-            items = page.get("items") or []
-            if not items:
-                break
-
-            parsed_any = False
-            page_all_too_old = True
-
-            for album in items:
-                release_dt = _parse_release_date(album.get("release_date", ""))
-                if release_dt is None:
-                    continue
+        now = datetime.now()
+        cutoff_date = now - timedelta(days=days_back)
+        first_page = sp.artist_albums(
+            artist_id,
+            album_type="album,single",
+            limit=50,
+            offset=0,
+        )
 
-                parsed_any = True
-                if release_dt < cutoff_date:
-                    continue
+        if not _catalog_is_current(entry, first_page, cutoff_date, now):
+            page = first_page
+            offset = 0
+            while True:
+                items = page.get("items") or []
+                if not items:
+                    break
+
+                parsed_any = False
+                page_all_too_old = True
+
+                for album in items:
+                    if album and album.get("id"):
+                        _remember_album(entry, album)
+                    release_dt = _parse_release_date((album or {}).get("release_date", ""))
+                    if release_dt is None:
+                        continue
 
-                page_all_too_old = False
-                album_tracks = sp.album_tracks(album["id"])
-                for track_item in album_tracks.get("items") or []:
-                    if track_item and track_item.get("uri"):
-                        uri = track_item["uri"]
-                        artists = ", ".join(
+                    parsed_any = True
+                    if release_dt >= cutoff_date:
+                        page_all_too_old = False
+
+                if parsed_any and page_all_too_old:
+                    break
+                if not page.get("next"):
+                    break
+                offset += len(items)
+                page = sp.artist_albums(
+                    artist_id,
+                    album_type="album,single",
+                    limit=50,
+                    offset=offset,
+                )
+            entry["album_total"] = first_page.get("total")
+            entry["scanned_since"] = cutoff_date
+            # Only a full scan resets the CATALOG_FRESH_DAYS clock.
+            entry["last_checked"] = now
+
+        recent_albums = []
+        for album_id, album in entry["albums"].items():
+            release_dt = _parse_release_date(album.get("release_date", ""))
+            if release_dt is not None and release_dt >= cutoff_date:
+                recent_albums.append((album_id, album))
+
+        missing_ids = [album_id for album_id, album in recent_albums if album.get("tracks") is None]
+        if missing_ids:
+            for album_id, track_items in _load_album_tracks(sp, missing_ids).items():
+                album = entry["albums"].get(album_id)
+                if album is None:
+                    continue
+                album["tracks"] = [
+                    {
+                        "uri": track_item["uri"],
+                        "name": track_item.get("name", "Unknown"),
+                        "artists": ", ".join(
                             artist["name"] for artist in track_item.get("artists", [])
-                        )
-                        new_tracks[uri] = {
-                            "name": track_item.get("name", "Unknown"),
-                            "artists": artists,
-                            "album": album.get("name", "Unknown"),
-                            "release_date": album.get("release_date", ""),
-                        }
-
-            if parsed_any and page_all_too_old:
-                break
-            if not page.get("next"):
-                break
-            offset += len(items)
+                        ),
+                    }
+                    for track_item in track_items
+                    if track_item and track_item.get("uri")
+                ]
+                album["dirty"] = True
+
+        for _album_id, album in recent_albums:
+            for track in album.get("tracks") or []:
+                new_tracks[track["uri"]] = {
+                    "name": track.get("name", "Unknown"),
+                    "artists": track.get("artists", ""),
+                    "album": album.get("name", "Unknown"),
+                    "release_date": album.get("release_date", ""),
+                }
 
         return new_tracks
     except SpotifyException as e:
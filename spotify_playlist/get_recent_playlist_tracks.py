@@ -3,6 +3,81 @@ from datetime import datetime, timedelta
 from spotify_playlist.deps import SpotifyException
 
 
+_PAGE_SIZE = 100
+_ITEM_FIELDS = 'items.added_at,items.track.uri,items.track.name,items.track.artists'
+
+
+def _parse_added_at(added_at_str):
+    """Return added_at as a naive local datetime, or None when it cannot be parsed."""
+    try:
+        added_at = datetime.fromisoformat(added_at_str.replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        return None
+    if added_at.tzinfo:
+        added_at = added_at.astimezone().replace(tzinfo=None)
+    return added_at
+
+
+def _read_tail(sp, playlist_id, cutoff_date):
+    """Walk pages backwards from the end until items predate the cutoff.
+
+    Spotify returns playlist items in insertion order, so recent additions sit at
+    the tail. Returns (items, reordered); ``reordered`` is True when added_at is
+    not ascending, meaning the playlist was sorted by hand and a full scan is needed.
+    """
+    total = (sp.playlist_items(playlist_id, fields='total', limit=1) or {}).get('total') or 0
+    collected = []
+    later_added_at = None
+    reached_cutoff = False
+    end = total
+    while end > 0 and not reached_cutoff:
+        offset = max(0, end - _PAGE_SIZE)
+        page = sp.playlist_items(
+            playlist_id,
+            fields=_ITEM_FIELDS,
+            limit=end - offset,
+            offset=offset,
+        )
+        # Keep checking the order on the rest of a page already fetched: a
+        # hand-sorted playlist often shows up as a newer item before an older one.
+        for item in reversed(page.get('items') or []):
+            added_at_str = item.get('added_at')
+            if added_at_str:
+                added_at = _parse_added_at(added_at_str)
+                if added_at is None:
+                    continue
+                if later_added_at is not None and added_at > later_added_at:
+                    return [], True
+                later_added_at = added_at
+                if added_at < cutoff_date:
+                    reached_cutoff = True
+            if not reached_cutoff:
+                collected.append(item)
+        end = offset
+    collected.reverse()
+    return collected, False
+
+
+def _read_all(sp, playlist_id, cutoff_date):
+    """Read every page and keep items added on or after the cutoff."""
+    collected = []
+    results = sp.playlist_items(
+        playlist_id,
+        fields=_ITEM_FIELDS + ',next',
+        limit=_PAGE_SIZE,
+    )
+    while results:
+        for item in results['items']:
+            added_at_str = item.get('added_at')
+            if added_at_str:
+                added_at = _parse_added_at(added_at_str)
+                if added_at is None or added_at < cutoff_date:
+                    continue
+            collected.append(item)
+        results = sp.next(results) if results.get('next') else None
+    return collected
+
+
 def get_recent_playlist_tracks(
     sp,
     playlist_id,
@@ -12,6 +87,9 @@ def get_recent_playlist_tracks(
 ):
     """Fetches tracks added to the playlist since a cutoff date.
 
+    Reads from the tail of the playlist backwards and stops at the cutoff; falls
+    back to a full scan when the playlist has been manually reordered.
+
     Args:
         sp: Spotify client
         playlist_id: Playlist ID
@@ -34,52 +112,25 @@ def get_recent_playlist_tracks(
         cutoff_date = datetime.now() - timedelta(days=days_back)
 
     try:
-        # Fetch playlist items with added_at date
-        results = sp.playlist_items(
-            playlist_id,
-            fields='items.added_at,items.track.uri,items.track.name,items.track.artists,next',
-            limit=100,
-        )
+        items, reordered = _read_tail(sp, playlist_id, cutoff_date)
+        if reordered:
+            items = _read_all(sp, playlist_id, cutoff_date)
 
-        while results:
-            for item in results['items']:
-                # Check that track exists
-                track = item.get('track')
-                if not track or not track.get('uri'):
-                    continue
+        for item in items:
+            # Check that track exists
+            track = item.get('track')
+            if not track or not track.get('uri'):
+                continue
 
-                # Check when the track was added
-                added_at_str = item.get('added_at')
-                if added_at_str:
-                    try:
-                        # Parse ISO 8601 date
-                        added_at = datetime.fromisoformat(added_at_str.replace('Z', '+00:00'))
-                        # Convert to local timezone for comparison
-                        if added_at.tzinfo:
-                            added_at = added_at.astimezone().replace(tzinfo=None)
-
-                        # Only tracks added in the last X days
-                        if added_at < cutoff_date:
-                            # Stop iterating once we pass the cutoff date
-                            # (tracks are sorted newest to oldest)
-                            results = None
-                            break
-                    except (ValueError, AttributeError):
-                        # If parsing fails, skip this track
-                        continue
-
-                uri = track['uri']
-                if return_track_info:
-                    artists = ', '.join([artist['name'] for artist in track.get('artists', [])])
-                    track_data[uri] = {
-                        'name': track.get('name', 'Unknown'),
-                        'artists': artists
-                    }
-                else:
-                    track_data.add(uri)
-
-            if results:
-                results = sp.next(results) if results.get('next') else None
+            uri = track['uri']
+            if return_track_info:
+                artists = ', '.join([artist['name'] for artist in track.get('artists', [])])
+                track_data[uri] = {
+                    'name': track.get('name', 'Unknown'),
+                    'artists': artists
+                }
+            else:
+                track_data.add(uri)
 
         return track_data
     except SpotifyException as e:
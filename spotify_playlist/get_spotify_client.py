@@ -6,6 +6,7 @@ from spotify_playlist.config import CACHE_FILE, CLIENT_ID, CLIENT_SECRET, REDIRE
 from spotify_playlist.deps import SpotifyException, SpotifyOAuth, require_spotipy, spotipy
 from spotify_playlist.is_port_available import is_port_available
 from spotify_playlist.loading_progress import loading_bar
+from spotify_playlist.spotify_api_client import STATUS_FORCELIST, prepare_spotify_client
 
 
 def _clear_spotify_cache() -> None:
@@ -108,7 +109,9 @@ def get_spotify_client():
                     raise
 
         # Create Spotify client with the auth manager
-        sp = spotipy.Spotify(auth_manager=auth_manager)
+        sp = prepare_spotify_client(
+            spotipy.Spotify(auth_manager=auth_manager, status_forcelist=STATUS_FORCELIST)
+        )
 
         # Test authentication by fetching user info
         try:
@@ -134,7 +137,9 @@ def get_spotify_client():
                             message=".*get_access_token.*",
                         )
                         auth_manager.get_access_token()
-                sp = spotipy.Spotify(auth_manager=auth_manager)
+                sp = prepare_spotify_client(
+                    spotipy.Spotify(auth_manager=auth_manager, status_forcelist=STATUS_FORCELIST)
+                )
                 with loading_bar("Connecting to Spotify..."):
                     user = sp.current_user()
             else:
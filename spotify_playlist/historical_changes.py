@@ -0,0 +1,47 @@
+"""Record per-key changes to the historical track sets during a sync."""
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Iterable
+
+
+class HistoricalChanges:
+    """Apply additions/replacements to the in-memory history and remember the delta.
+
+    ``save_historical_changes`` then writes only these URIs instead of the
+    whole history.
+    """
+
+    def __init__(self, historical: dict[str, set[str]]) -> None:
+        self.historical = historical
+        self.added: dict[str, set[str]] = defaultdict(set)
+        self.removed: dict[str, set[str]] = defaultdict(set)
+
+    def add(self, key: str, uris: Iterable[str]) -> set[str]:
+        """Union ``uris`` into ``key``; returns the URIs that were not known yet."""
+        known = self.historical.get(key, set())
+        new = set(uris) - known
+        if new:
+            self.historical[key] = known | new
+            self._record_added(key, new)
+        elif key not in self.historical:
+            self.historical[key] = set()
+        return new
+
+    def replace(self, key: str, uris: Iterable[str]) -> set[str]:
+        """Make ``key`` hold exactly ``uris``; returns the URIs that were not known yet."""
+        known = self.historical.get(key, set())
+        current = set(uris)
+        new = current - known
+        dropped = known - current
+        self.historical[key] = current
+        if new:
+            self._record_added(key, new)
+        if dropped:
+            self.added[key] -= dropped
+            self.removed[key] |= dropped
+        return new
+
+    def _record_added(self, key: str, uris: set[str]) -> None:
+        self.removed[key] -= uris
+        self.added[key] |= uris
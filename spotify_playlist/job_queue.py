@@ -0,0 +1,266 @@
+"""Durable job records shared by the sync, import and download job managers.
+
+Jobs live in the ``job`` table of the configured store (see db_store), so the
+Flask server, the PHP UI and the ``run_web_*`` worker processes all see the
+same state. Progress events are coalesced: a job is written at most once per
+PROGRESS_WRITE_INTERVAL seconds, phase changes and final states are written
+at once, and a background thread flushes the last pending event. Finished
+jobs are deleted after JOB_RETENTION_DAYS.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from typing import Any, NamedTuple
+
+from db_store import create_job as insert_job_row
+from db_store import delete_finished_jobs, load_job, load_running_jobs
+from db_store import update_job as update_job_row
+
+JOB_RETENTION_DAYS = 7
+PROGRESS_WRITE_INTERVAL = 0.5
+
+_LEADING_FIELDS = ("job_id", "status", "phase", "message")
+_TRAILING_FIELDS = ("result", "error", "created_at", "updated_at")
+
+
+class JobKind(NamedTuple):
+    """A job type: its name in the job table and the fields it reports."""
+
+    name: str
+    progress_fields: tuple[str, ...]
+    extra_fields: tuple[str, ...] = ()
+
+
+SYNC_JOB = JobKind(
+    "sync",
+    (
+        "playlist_index",
+        "playlist_total",
+        "playlist_name",
+        "playlist_image_url",
+        "tracks_found",
+        "tracks_new",
+        "tracks_added",
+        "playlists_checked",
+        "artist_index",
+        "artist_total",
+        "artist_name",
+        "artist_releases_found",
+        "artist_releases_new",
+        "discovery_releases_found",
+        "discovery_releases_new",
+        "discovery_artists",
+        "since_date",
+    ),
+    ("worker_pid",),
+)
+IMPORT_JOB = JobKind(
+    "import",
+    (
+        "playlist_index",
+        "playlist_total",
+        "playlist_name",
+        "playlist_image_url",
+        "tracks_found",
+        "total_tracks_found",
+        "total_processed",
+        "inserted",
+        "skipped",
+        "since_date",
+        "until_date",
+    ),
+)
+DOWNLOAD_JOB = JobKind(
+    "download",
+    (
+        "track_index",
+        "track_total",
+        "track_name",
+        "success_count",
+        "error_count",
+        "last_error",
+    ),
+    ("output_dir",),
+)
+
+
+class _ProgressWriter:
+    """Per-job coalescing of progress writes (see module docstring).
+
+    ``_lock`` only guards the bookkeeping dicts; database writes run outside it
+    under a per-job lock, so a slow write for one job never delays another.
+    Deferred events are written by one long-lived daemon thread.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._written: dict[str, tuple[float, Any]] = {}
+        self._due: dict[str, float] = {}
+        self._job_locks: dict[str, threading.Lock] = {}
+        self._flusher: threading.Thread | None = None
+
+    def report(self, job_id: str, fields: dict[str, Any]) -> None:
+        with self._lock:
+            pending = self._pending.setdefault(job_id, {})
+            pending.update(fields)
+            written_at, written_phase = self._written.get(job_id, (0.0, None))
+            due = written_at + self._interval
+            if (
+                time.monotonic() < due
+                and pending.get("status") == "running"
+                and pending.get("phase") == written_phase
+            ):
+                if job_id not in self._due:
+                    self._due[job_id] = due
+                    self._start_flusher()
+                    self._wakeup.notify()
+                return
+        self.write(job_id, {}, None)
+
+    def write(self, job_id: str, fields: dict[str, Any], expected_status: str | None) -> bool:
+        with self._lock:
+            job_lock = self._job_locks.setdefault(job_id, threading.Lock())
+        with job_lock:
+            with self._lock:
+                merged = {**self._pending.pop(job_id, {}), **fields}
+                self._due.pop(job_id, None)
+            if not merged:
+                return True
+            try:
+                written = update_job_row(job_id, merged, expected_status=expected_status)
+            except Exception:
+                with self._lock:
+                    # Keep the unwritten fields (newer events win) for the next write.
+                    self._pending[job_id] = {**merged, **self._pending.get(job_id, {})}
+                raise
+            with self._lock:
+                if merged.get("status", "running") == "running":
+                    previous_phase = self._written.get(job_id, (0.0, None))[1]
+                    self._written[job_id] = (time.monotonic(), merged.get("phase", previous_phase))
+                else:
+                    self._written.pop(job_id, None)
+                    self._job_locks.pop(job_id, None)
+            return written
+
+    def _start_flusher(self) -> None:
+        if self._flusher is None:
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="job-progress", daemon=True
+            )
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._lock:
+                while not self._due:
+                    self._wakeup.wait()
+                job_id, due = min(self._due.items(), key=lambda item: item[1])
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._wakeup.wait(wait)
+                    continue
+            try:
+                self.write(job_id, {}, None)
+            except Exception:
+                pass  # update_job_row already reported it; the fields stay pending.
+
+
+_progress = _ProgressWriter(PROGRESS_WRITE_INTERVAL)
+
+
+def create_job(kind: JobKind, message: str, **fields: Any) -> str:
+    """Record a new running job and return its id; old finished jobs are pruned first."""
+    try:
+        delete_finished_jobs(JOB_RETENTION_DAYS)
+    except Exception:
+        pass  # Cleanup is best effort; it runs again with the next job.
+    job_id = str(uuid.uuid4())
+    insert_job_row(
+        job_id,
+        kind.name,
+        {
+            "status": "running",
+            "phase": "queued",
+            "message": message,
+            "result": None,
+            "error": None,
+            **fields,
+        },
+    )
+    return job_id
+
+
+def update_job(job_id: str, *, expected_status: str | None = None, **fields: Any) -> bool:
+    """Write ``fields`` (and any pending progress) now; False if the job is gone."""
+    return _progress.write(job_id, fields, expected_status)
+
+
+def report_progress(kind: JobKind, job_id: str, event: dict[str, Any]) -> None:
+    """Record a progress event from a sync/import/download callback (coalesced)."""
+    phase = event.get("phase", "running")
+    status = "error" if phase == "error" else "running"
+    if phase == "done":
+        status = "done"
+
+    updates: dict[str, Any] = {
+        "status": status,
+        "phase": phase,
+        "message": event.get("message", ""),
+    }
+    for key in kind.progress_fields:
+        if key in event:
+            updates[key] = event[key]
+    _progress.report(job_id, updates)
+
+
+def snapshot_job(kind: JobKind, job: dict[str, Any]) -> dict[str, Any]:
+    """The fields of ``job`` the web UIs poll for."""
+    fields = _LEADING_FIELDS + kind.progress_fields + kind.extra_fields + _TRAILING_FIELDS
+    return {field: job.get(field) for field in fields}
+
+
+def get_job(kind: JobKind, job_id: str) -> dict[str, Any] | None:
+    job = load_job(job_id)
+    if not job or job.get("kind") != kind.name:
+        return None
+    return snapshot_job(kind, job)
+
+
+def _job_process_alive(job: dict[str, Any]) -> bool:
+    pid = job.get("worker_pid")
+    if not isinstance(pid, int) or pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+def find_active_job(kind: JobKind) -> dict[str, Any] | None:
+    """Return the most recently updated running job of ``kind`` whose worker is alive.
+
+    Running jobs whose worker process is gone are marked as interrupted.
+    """
+    active: dict[str, Any] | None = None
+    for job in load_running_jobs(kind.name):
+        if not _job_process_alive(job):
+            message = f"{kind.name.capitalize()} interrupted"
+            update_job(
+                job["job_id"],
+                expected_status="running",
+                status="error",
+                phase="error",
+                message=message,
+                error=message,
+            )
+        elif active is None:
+            active = job
+    return active
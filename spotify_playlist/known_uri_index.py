@@ -0,0 +1,122 @@
+"""Compact membership index over every track URI in the sync history."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from itertools import chain
+from typing import Iterable
+
+from db_store import iter_historical_track_ids, load_historical_other_uris
+from store_common import TRACK_URI_PREFIX, track_id_from_uri
+
+_BASE62 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+_BASE62_VALUES = {char: value for value, char in enumerate(_BASE62)}
+_KEY_BYTES = 16
+
+
+def track_id_key(track_id: str) -> int | None:
+    """Decode a 22-character base62 track id into its 128-bit integer value."""
+    value = 0
+    try:
+        for char in track_id:
+            value = value * 62 + _BASE62_VALUES[char]
+    except KeyError:
+        return None
+    return value if value.bit_length() <= _KEY_BYTES * 8 else None
+
+
+def track_uri_key(uri: str) -> int | None:
+    """128-bit key of a ``spotify:track:`` URI, or None for any other URI."""
+    track_id = track_id_from_uri(uri)
+    return track_id_key(track_id) if track_id is not None else None
+
+
+class KnownUriIndex:
+    """Sorted 16-byte track keys packed into one ``bytes`` buffer.
+
+    Track ids take 16 bytes each instead of a Python string per URI; lookups
+    bisect the buffer. URIs that are not regular track URIs (local files,
+    episodes) are kept as-is in a small side set.
+    """
+
+    def __init__(self, keys: Iterable[int], other: Iterable[str] = ()) -> None:
+        # ``keys`` is consumed before ``other``; from_store relies on that order.
+        self._keys, self._count = _pack_keys(keys)
+        self._other = frozenset(other)
+
+    @classmethod
+    def from_store(cls) -> "KnownUriIndex":
+        """Index every history key straight from the store's track id rows.
+
+        The ids arrive sorted and distinct, so they are packed as they stream in
+        without ever holding them as strings.
+        """
+        other = load_historical_other_uris()
+        odd_ids: list[str] = []
+
+        def keys() -> Iterable[int]:
+            for track_id in iter_historical_track_ids():
+                key = track_id_key(track_id)
+                if key is None:
+                    odd_ids.append(track_id)
+                else:
+                    yield key
+
+        return cls(keys(), chain(other, (TRACK_URI_PREFIX + track_id for track_id in odd_ids)))
+
+    def __len__(self) -> int:
+        return self._count + len(self._other)
+
+    def __contains__(self, uri: object) -> bool:
+        if not isinstance(uri, str):
+            return False
+        key = track_uri_key(uri)
+        if key is not None and self._bisect(key):
+            return True
+        return uri in self._other
+
+    def difference(self, uris: Iterable[str]) -> set[str]:
+        """Return the URIs from ``uris`` that are not in the index."""
+        return {uri for uri in uris if uri not in self}
+
+    def _bisect(self, key: int) -> bool:
+        lo = bisect_left(_KeyView(self._keys, self._count), key)
+        if lo >= self._count:
+            return False
+        start = lo * _KEY_BYTES
+        return int.from_bytes(self._keys[start : start + _KEY_BYTES], "big") == key
+
+
+def _pack_keys(keys: Iterable[int]) -> tuple[bytearray, int]:
+    """Pack keys into a sorted, duplicate-free buffer; sorted input streams straight in."""
+    buffer = bytearray()
+    previous = -1
+    in_order = True
+    for key in keys:
+        if key == previous:
+            continue
+        if key < previous:
+            in_order = False
+        buffer += key.to_bytes(_KEY_BYTES, "big")
+        previous = key
+    if not in_order:
+        view = _KeyView(buffer, len(buffer) // _KEY_BYTES)
+        ordered = sorted({view[index] for index in range(len(view))})
+        buffer = bytearray(b"".join(key.to_bytes(_KEY_BYTES, "big") for key in ordered))
+    return buffer, len(buffer) // _KEY_BYTES
+
+
+class _KeyView:
+    """Sequence view of the packed key buffer so ``bisect`` can search it."""
+
+    __slots__ = ("_buffer", "_count")
+
+    def __init__(self, buffer: bytearray, count: int) -> None:
+        self._buffer = buffer
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> int:
+        start = index * _KEY_BYTES
+        return int.from_bytes(self._buffer[start : start + _KEY_BYTES], "big")
@@ -1,6 +1,8 @@
 """Browser UI for managing new_tracks reference URLs."""
 from __future__ import annotations
 
+import base64
+import binascii
 import json
 import os
 import sys
@@ -11,17 +13,18 @@ from flask import Flask, jsonify, render_template, request
 from db_store import (
     create_new_track,
     delete_new_track,
-    get_connection,
     increment_new_track_copy_title_count,
+    iter_new_tracks,
     load_artist_discovery_enabled,
-    load_genre_images,
+    load_genre_counts,
     load_locale,
-    load_new_tracks,
+    load_playlist_names,
     load_playlists_config,
     load_sync_start_date,
     load_tracking_start_date,
     load_ui_skin,
     normalize_reference_url,
+    query_new_tracks,
     resolve_genre_image,
     save_artist_discovery_enabled,
     save_locale,
@@ -29,6 +32,7 @@ from db_store import (
     save_sync_start_date,
     save_tracking_start_date,
     save_ui_skin,
+    search_new_tracks,
     update_new_track_reference_url,
 )
 from spotify_playlist.i18n import gettext as translate, locale_html_lang, load_catalog
@@ -44,28 +48,8 @@ STATIC_DIR = Path(__file__).resolve().parent / "static"
 DEFAULT_PORT = int(os.environ.get("NEW_TRACKS_TODO_PORT", "5050"))
 _VALID_UI_SKINS = frozenset({"light", "dark", "retroui", "winxp"})
 _VALID_LOCALES = frozenset({"en", "nl", "brab"})
-
-
-def _playlist_names_by_spotify_id(spotify_ids: list[str]) -> dict[str, str]:
-    unique_ids = [spotify_id for spotify_id in dict.fromkeys(spotify_ids) if spotify_id]
-    if not unique_ids:
-        return {}
-
-    conn = get_connection()
-    try:
-        with conn.cursor() as cur:
-            placeholders = ", ".join(["%s"] * len(unique_ids))
-            cur.execute(
-                f"SELECT spotify_id, name FROM playlist WHERE spotify_id IN ({placeholders})",
-                unique_ids,
-            )
-            return {
-                row["spotify_id"]: row["name"]
-                for row in cur.fetchall()
-                if row.get("spotify_id") and row.get("name")
-            }
-    finally:
-        conn.close()
+TRACKS_PAGE_DEFAULT = 100
+TRACKS_PAGE_MAX = 500
 
 
 def _format_playlist_entry(spotify_id: str, names: dict[str, str]) -> dict[str, str | None]:
@@ -88,7 +72,7 @@ def _build_settings_payload() -> dict:
         all_ids.append(destination)
     all_ids.extend(source_playlists)
     all_ids.extend(tracking_playlists)
-    names = _playlist_names_by_spotify_id(all_ids)
+    names = load_playlist_names(all_ids)
 
     return {
         "ui_skin": load_ui_skin(),
@@ -151,6 +135,34 @@ def _parse_playlist_list(values: list, field_name: str) -> list[str] | tuple[Non
     return parsed, ""
 
 
+def _encode_tracks_cursor(track: dict) -> str:
+    raw = json.dumps([track["track"], track["id"]], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_tracks_cursor(cursor: str) -> tuple[str, int]:
+    """Decode an opaque /api/tracks cursor into the (track, id) keyset position."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        track, track_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(track, str):
+            raise ValueError
+        return track, int(track_id)
+    except (binascii.Error, UnicodeError, TypeError, ValueError):
+        raise ValueError("Invalid cursor") from None
+
+
+def _parse_optional_bool(value: str | None) -> bool | None:
+    if value is None or value == "":
+        return None
+    lowered = value.strip().lower()
+    if lowered in {"1", "true", "yes"}:
+        return True
+    if lowered in {"0", "false", "no"}:
+        return False
+    raise ValueError("has_url must be true or false")
+
+
 def create_app() -> Flask:
     app = Flask(
         __name__,
@@ -176,56 +188,68 @@ def create_app() -> Flask:
     @app.get("/api/genres")
     def list_genres():
         try:
-            tracks = load_new_tracks()
-            genre_images = load_genre_images()
+            genre_counts = load_genre_counts()
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
-        counts: dict[str, int] = {}
-        for track in tracks:
-            name = (track.get("genre") or "").strip()
-            key = name or "__uncategorized__"
-            counts[key] = counts.get(key, 0) + 1
-
-        genres = []
-        for key in sorted(counts, key=lambda k: (k == "__uncategorized__", k.lower())):
-            slug = "Uncategorized" if key == "__uncategorized__" else key
-            label = "Uncategorized" if key == "__uncategorized__" else key
-            image_url = None if key == "__uncategorized__" else resolve_genre_image(
-                slug,
-                genre_images=genre_images,
-                tracks=tracks,
-            )
-            genres.append(
-                {
-                    "slug": slug,
-                    "label": label,
-                    "track_count": counts[key],
-                    "image_url": image_url,
-                }
-            )
-
-        return jsonify({"genres": genres, "total": len(tracks)})
+        genre_counts.sort(key=lambda entry: (entry["genre"] is None, (entry["genre"] or "").lower()))
+        genres = [
+            {
+                "slug": entry["genre"] or "Uncategorized",
+                "label": entry["genre"] or "Uncategorized",
+                "track_count": entry["track_count"],
+                "image_url": entry["image_url"],
+            }
+            for entry in genre_counts
+        ]
+        total = sum(entry["track_count"] for entry in genre_counts)
+        return jsonify({"genres": genres, "total": total})
 
     @app.get("/api/tracks")
     def list_tracks():
-        genre = request.args.get("genre")
+        genre = request.args.get("genre") or None
+        search = request.args.get("q")
+        cursor = request.args.get("cursor")
+        limit_arg = request.args.get("limit")
+        try:
+            has_url = _parse_optional_bool(request.args.get("has_url"))
+            after = _decode_tracks_cursor(cursor) if cursor else None
+            limit = int(limit_arg) if limit_arg else None
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        paginated = limit is not None or after is not None
+        if paginated:
+            limit = max(1, min(limit or TRACKS_PAGE_DEFAULT, TRACKS_PAGE_MAX))
         try:
-            tracks = load_new_tracks()
+            tracks = query_new_tracks(
+                genre=genre,
+                has_url=has_url,
+                search=search,
+                # One extra row tells us whether another page follows.
+                limit=limit + 1 if paginated else None,
+                after=after,
+            )
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
-        if genre:
-            if genre == "Uncategorized":
-                tracks = [t for t in tracks if not (t.get("genre") or "").strip()]
-            else:
-                tracks = [
-                    t for t in tracks if (t.get("genre") or "").strip() == genre
-                ]
+        has_more = paginated and len(tracks) > limit
+        if has_more:
+            tracks = tracks[:limit]
+        genre_image_url = resolve_genre_image(genre, tracks=tracks) if genre else None
+        if paginated:
+            next_cursor = _encode_tracks_cursor(tracks[-1]) if has_more else None
+            return jsonify(
+                {
+                    "tracks": tracks,
+                    "next_cursor": next_cursor,
+                    "genre": genre,
+                    "genre_image_url": genre_image_url,
+                }
+            )
 
         with_url = [t for t in tracks if t.get("reference_url")]
         without_url = [t for t in tracks if not t.get("reference_url")]
-        genre_image_url = resolve_genre_image(genre, tracks=tracks) if genre else None
         return jsonify(
             {
                 "with_url": with_url,
@@ -236,6 +260,39 @@ def create_app() -> Flask:
             }
         )
 
+    @app.get("/api/tracks/search")
+    def search_tracks():
+        query = (request.args.get("q") or "").strip()
+        if not query:
+            return jsonify({"error": "q is required"}), 400
+        genre = request.args.get("genre") or None
+        try:
+            has_url = _parse_optional_bool(request.args.get("has_url"))
+            limit = int(request.args.get("limit") or TRACKS_PAGE_DEFAULT)
+            offset = int(request.args.get("offset") or 0)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        limit = max(1, min(limit, TRACKS_PAGE_MAX))
+        offset = max(0, offset)
+        try:
+            # One extra row tells us whether another page follows.
+            tracks = search_new_tracks(
+                query, genre=genre, has_url=has_url, limit=limit + 1, offset=offset
+            )
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+        has_more = len(tracks) > limit
+        return jsonify(
+            {
+                "tracks": tracks[:limit],
+                "query": query,
+                "genre": genre,
+                "next_offset": offset + limit if has_more else None,
+            }
+        )
+
     @app.post("/api/tracks")
     def create_track():
         data = request.get_json(silent=True) or {}
@@ -311,7 +368,7 @@ def create_app() -> Flask:
         if not spotify_id:
             return jsonify({"error": "Invalid playlist ID"}), 400
 
-        names = _playlist_names_by_spotify_id([spotify_id])
+        names = load_playlist_names([spotify_id])
         if spotify_id in names and names[spotify_id] != spotify_id:
             return jsonify({"spotify_id": spotify_id, "name": names[spotify_id]})
 
@@ -527,7 +584,10 @@ def run_server(port: int = DEFAULT_PORT) -> None:
     from spotify_playlist.is_port_available import is_port_available
 
     try:
-        tracks = load_new_tracks()
+        track_count = with_url = 0
+        for track in iter_new_tracks():
+            track_count += 1
+            with_url += bool(track.reference_url)
     except ImportError as e:
         print(f"❌ {e}")
         print("   Install dependencies: pip install -r requirements.txt")
@@ -543,9 +603,8 @@ def run_server(port: int = DEFAULT_PORT) -> None:
         print(f"❌ Port {port} is already in use.")
         sys.exit(1)
 
-    with_url = sum(1 for t in tracks if t.get("reference_url"))
-    without_url = len(tracks) - with_url
-    print(f"📀 {len(tracks)} tracks loaded ({with_url} with URL, {without_url} without)")
+    without_url = track_count - with_url
+    print(f"📀 {track_count} tracks loaded ({with_url} with URL, {without_url} without)")
 
     app = create_app()
     print(f"🌐 New tracks to-do: http://127.0.0.1:{port}/")
@@ -4,12 +4,13 @@ from __future__ import annotations
 
 import sys
 
-from spotify_playlist.download_job_manager import get_download_job, run_download_job, _update_job
+from spotify_playlist.download_job_manager import get_download_job, run_download_job
 from spotify_playlist.download_youtube_wav import load_tracks_from_app
+from spotify_playlist.job_queue import update_job
 
 
 def _fail_job(job_id: str, message: str) -> int:
-    _update_job(
+    update_job(
         job_id,
         status="error",
         phase="error",
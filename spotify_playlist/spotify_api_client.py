@@ -1,38 +1,72 @@
 """Quiet Spotify client for web/API use (uses cached OAuth token)."""
 from __future__ import annotations
 
-import threading
-import time
 from typing import Any
 
 from spotify_playlist.config import CACHE_FILE, CLIENT_ID, CLIENT_SECRET, REDIRECT_URI, SCOPE
 from spotify_playlist.deps import SPOTIPY_AVAILABLE, SpotifyOAuth, spotipy
+from spotify_playlist.spotify_rate_limiter import (
+    AdaptiveRateLimiter,
+    call_rate_limited,
+    get_shared_rate_limiter,
+)
+from spotify_playlist.spotify_response_cache import apply_response_cache
+from spotify_playlist.spotify_single_flight import apply_single_flight
 
-# Stay under Spotify's rate limit (~180 req/min for dev apps).
-_DEFAULT_MIN_INTERVAL = 0.35
+# 429 is left out so the rate limiter sees it (spotipy would otherwise retry blindly).
+# Leaving it out is not enough on its own: urllib3 still retries any 429 carrying
+# Retry-After unless the session's Retry ignores that header (see _mount_retry).
+STATUS_FORCELIST = (500, 502, 503, 504)
 
 
-def apply_rate_limit(sp: Any, min_interval: float = _DEFAULT_MIN_INTERVAL) -> Any:
-    """Throttle all Spotify API calls to reduce 429 rate-limit stalls."""
-    lock = threading.Lock()
-    last_call = 0.0
+def _mount_retry(sp: Any) -> None:
+    """Replace spotipy's session Retry with one that leaves every 429 to the limiter."""
+    session = getattr(sp, "_session", None)
+    if session is None:
+        return
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=sp.retries,
+        connect=None,
+        read=False,
+        allowed_methods=frozenset(["GET", "POST", "PUT", "DELETE"]),
+        status=sp.status_retries,
+        backoff_factor=sp.backoff_factor,
+        status_forcelist=sp.status_forcelist,
+        respect_retry_after_header=False,
+    )
+    adapter = HTTPAdapter(max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+
+def apply_rate_limit(sp: Any, limiter: AdaptiveRateLimiter | None = None) -> Any:
+    """Route all Spotify API calls through an adaptive, Retry-After-aware limiter."""
+    if limiter is None:
+        limiter = get_shared_rate_limiter()
+    _mount_retry(sp)
     original = sp._internal_call
 
     def throttled_internal_call(method, url, payload, params):
-        nonlocal last_call
-        with lock:
-            now = time.monotonic()
-            wait = min_interval - (now - last_call)
-            if wait > 0:
-                time.sleep(wait)
-            last_call = time.monotonic()
-        return original(method, url, payload, params)
+        return call_rate_limited(limiter, original, method, url, payload, params)
 
     sp._internal_call = throttled_internal_call
+    sp.rate_limiter = limiter
     return sp
 
 
-def get_quiet_spotify_client(*, rate_limit: bool = True):
+def prepare_spotify_client(sp: Any, *, rate_limit: bool = True, cache: bool = True) -> Any:
+    """Install the rate limiter, response cache, and single-flight GET sharing."""
+    if rate_limit:
+        apply_rate_limit(sp)
+    if cache:
+        apply_response_cache(sp)
+    return apply_single_flight(sp)
+
+
+def get_quiet_spotify_client(*, rate_limit: bool = True, cache: bool = True):
     """Return an authenticated Spotify client or raise RuntimeError."""
     if not SPOTIPY_AVAILABLE:
         raise RuntimeError(
@@ -68,7 +102,6 @@ def get_quiet_spotify_client(*, rate_limit: bool = True):
         retries=2,
         status_retries=2,
         backoff_factor=0.3,
+        status_forcelist=STATUS_FORCELIST,
     )
-    if rate_limit:
-        apply_rate_limit(sp)
-    return sp
+    return prepare_spotify_client(sp, rate_limit=rate_limit, cache=cache)
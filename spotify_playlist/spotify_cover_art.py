@@ -16,7 +16,7 @@ from spotify_playlist.audio_batch import (
     DEFAULT_MUSIC_DIR,
     LOG_DIR,
     discover_audio_files,
-    spotify_call_with_retry,
+    http_call_with_retry,
     utc_timestamp,
 )
 from spotify_playlist.colors import Colors
@@ -139,7 +139,7 @@ def process_file(sp, path: str) -> tuple[dict[str, Any] | None, str | None]:
 
     remove_cover_art(path)
 
-    track = spotify_call_with_retry(lambda: find_spotify_track(sp, artists, stem))
+    track = find_spotify_track(sp, artists, stem)
     if track is None:
         return None, 'No matching Spotify track found'
 
@@ -147,7 +147,7 @@ def process_file(sp, path: str) -> tuple[dict[str, Any] | None, str | None]:
     if not art_url:
         return track, 'Spotify track has no album artwork'
 
-    image_bytes = spotify_call_with_retry(lambda: fetch_image_bytes(art_url))
+    image_bytes = http_call_with_retry(lambda: fetch_image_bytes(art_url))
     if not image_bytes:
         return track, 'Album artwork download returned empty data'
 
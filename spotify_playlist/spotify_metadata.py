@@ -15,7 +15,6 @@ from spotify_playlist.audio_batch import (
     DEFAULT_MUSIC_DIR,
     LOG_DIR,
     discover_audio_files,
-    spotify_call_with_retry,
     utc_timestamp,
 )
 from spotify_playlist.spotify_track_energy import fetch_track_energies, format_energy_label
@@ -197,9 +196,7 @@ def process_metadata_file(sp, path: str) -> dict[str, Any]:
     spotify_data = {'album': None, 'release_date': None, 'year': None}
 
     try:
-        spotify_track = spotify_call_with_retry(
-            lambda: find_spotify_track(sp, artists, stem)
-        )
+        spotify_track = find_spotify_track(sp, artists, stem)
     except Exception:
         skipped_fields.extend(['year', 'release_date', 'album', 'spotify_track'])
     else:
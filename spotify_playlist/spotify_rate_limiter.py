@@ -0,0 +1,268 @@
+"""Adaptive token-bucket rate limiter for Spotify Web API calls."""
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Iterator
+
+# Spotify allows roughly 180 req/min for dev apps over a rolling 30 s window.
+# AIMD stays just under that: probing above it only ends in a 429.
+DEFAULT_RATE = 2.8
+DEFAULT_MIN_RATE = 0.5
+DEFAULT_MAX_RATE = 2.8
+DEFAULT_BURST = 3.0
+# AIMD: add a little throughput per success, halve it on every 429.
+DEFAULT_INCREASE_STEP = 0.02
+DEFAULT_DECREASE_FACTOR = 0.5
+_FALLBACK_RETRY_AFTER = 1.0
+_MAX_RETRY_AFTER = 120.0
+_MAX_THROTTLE_RETRIES = 5
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+# Bucket state shared by the CLI, web server threads, and batch scripts on this host.
+SHARED_BUDGET_PATH = PROJECT_ROOT / ".sync_jobs" / ".spotify_budget"
+
+
+def parse_retry_after(value: Any) -> float | None:
+    """Parse a Retry-After header (delta seconds or HTTP date) into seconds."""
+    if value is None:
+        return None
+    text = str(value).strip()
+    if not text:
+        return None
+    try:
+        seconds = float(text)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(text)
+        except (TypeError, ValueError):
+            return None
+        seconds = retry_at.timestamp() - time.time()
+    return min(max(seconds, 0.0), _MAX_RETRY_AFTER)
+
+
+def retry_after_from_exception(exc: BaseException) -> float | None:
+    """Return the Retry-After delay carried by a SpotifyException or HTTPError."""
+    headers = getattr(exc, "headers", None) or getattr(exc, "hdrs", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("Retry-After")
+    except AttributeError:
+        return None
+    return parse_retry_after(value)
+
+
+def is_rate_limited_error(exc: BaseException) -> bool:
+    """True for a real 429 response, not for spotipy's exhausted-retry error.
+
+    spotipy reports urllib3 giving up on 5xx responses as
+    ``SpotifyException(429, -1, "... Max Retries")``; that is an outage, and
+    backing off the shared rate or retrying it again would only make it worse.
+    """
+    status = getattr(exc, "http_status", None)
+    if status is None:
+        status = getattr(exc, "code", None)
+    if status != 429:
+        return False
+    return "Max Retries" not in str(getattr(exc, "msg", "") or "")
+
+
+class AdaptiveRateLimiter:
+    """Token bucket whose refill rate follows AIMD on observed 429 responses.
+
+    Every success nudges the rate up by ``increase_step`` (up to ``max_rate``);
+    every 429 multiplies it by ``decrease_factor`` and blocks all callers until
+    the server's ``Retry-After`` window has passed.
+
+    With ``state_path`` set, the bucket (tokens, rate, Retry-After window) lives
+    in a small JSON file guarded by ``flock``, so every process on the host draws
+    from one budget. Request and throttle counters stay per process.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        *,
+        min_rate: float = DEFAULT_MIN_RATE,
+        max_rate: float = DEFAULT_MAX_RATE,
+        burst: float = DEFAULT_BURST,
+        increase_step: float = DEFAULT_INCREASE_STEP,
+        decrease_factor: float = DEFAULT_DECREASE_FACTOR,
+        state_path: Path | str | None = None,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._min_rate = min_rate
+        self._max_rate = max_rate
+        self._burst = max(1.0, burst)
+        self._increase_step = increase_step
+        self._decrease_factor = decrease_factor
+        self._state_path = Path(state_path) if state_path is not None else None
+        self._local_state: dict[str, float] = self._initial_state(rate)
+        self._throttle_count = 0
+        self._throttled_seconds = 0.0
+        self._waited_seconds = 0.0
+        self._request_count = 0
+
+    def _initial_state(self, rate: float) -> dict[str, float]:
+        return {
+            "rate": min(max(rate, self._min_rate), self._max_rate),
+            "tokens": self._burst,
+            "last_refill": time.time(),
+            "blocked_until": 0.0,
+            "consecutive_throttles": 0,
+        }
+
+    @contextmanager
+    def _state(self) -> Iterator[dict[str, float]]:
+        """Yield the bucket state under the thread lock (and file lock when shared)."""
+        with self._lock:
+            if self._state_path is None:
+                yield self._local_state
+                return
+
+            self._state_path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self._state_path, os.O_CREAT | os.O_RDWR, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                state = self._read_shared_state(fd)
+                yield state
+                encoded = json.dumps(state).encode()
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.ftruncate(fd, 0)
+                os.write(fd, encoded)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+    def _read_shared_state(self, fd: int) -> dict[str, float]:
+        raw = b""
+        while True:
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                break
+            raw += chunk
+        try:
+            state = json.loads(raw) if raw.strip() else None
+        except ValueError:
+            state = None
+        if not isinstance(state, dict) or "rate" not in state:
+            return self._initial_state(self._local_state["rate"])
+        state["rate"] = min(max(float(state["rate"]), self._min_rate), self._max_rate)
+        return state
+
+    @property
+    def current_rate(self) -> float:
+        """Current refill rate in requests per second."""
+        with self._state() as state:
+            return state["rate"]
+
+    @property
+    def throttled_seconds(self) -> float:
+        """Total length of the Retry-After windows opened by 429s this process received."""
+        with self._lock:
+            return self._throttled_seconds
+
+    def _refill(self, state: dict[str, float], now: float) -> None:
+        elapsed = now - state["last_refill"]
+        if elapsed > 0:
+            state["tokens"] = min(self._burst, state["tokens"] + elapsed * state["rate"])
+        state["last_refill"] = now
+
+    def acquire(self) -> float:
+        """Block until a request may be sent. Returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._state() as state:
+                now = time.time()
+                self._refill(state, now)
+                if now < state["blocked_until"]:
+                    wait = state["blocked_until"] - now
+                elif state["tokens"] >= 1.0:
+                    state["tokens"] -= 1.0
+                    self._request_count += 1
+                    self._waited_seconds += waited
+                    return waited
+                else:
+                    wait = (1.0 - state["tokens"]) / state["rate"]
+            time.sleep(wait)
+            waited += wait
+
+    def on_success(self) -> None:
+        """Additive increase after a request that was not rate limited."""
+        with self._state() as state:
+            state["consecutive_throttles"] = 0
+            state["rate"] = min(self._max_rate, state["rate"] + self._increase_step)
+
+    def on_throttled(self, retry_after: float | None = None) -> float:
+        """Multiplicative decrease after a 429. Returns the enforced pause in seconds."""
+        with self._state() as state:
+            state["consecutive_throttles"] += 1
+            self._throttle_count += 1
+            state["rate"] = max(self._min_rate, state["rate"] * self._decrease_factor)
+            if retry_after is None:
+                retry_after = min(
+                    _FALLBACK_RETRY_AFTER * 2 ** (state["consecutive_throttles"] - 1),
+                    30.0,
+                )
+            now = time.time()
+            blocked_until = max(state["blocked_until"], now + retry_after)
+            # Only the part not already covered by an open window counts.
+            self._throttled_seconds += blocked_until - max(state["blocked_until"], now)
+            state["blocked_until"] = blocked_until
+            state["tokens"] = 0.0
+            state["last_refill"] = now
+            return retry_after
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of limiter state for logs and status endpoints."""
+        rate = self.current_rate
+        with self._lock:
+            return {
+                "rate_per_second": round(rate, 3),
+                "min_rate": self._min_rate,
+                "max_rate": self._max_rate,
+                "shared": self._state_path is not None,
+                "requests": self._request_count,
+                "throttle_count": self._throttle_count,
+                "throttled_seconds": round(self._throttled_seconds, 3),
+                "waited_seconds": round(self._waited_seconds, 3),
+            }
+
+
+def call_rate_limited(limiter: AdaptiveRateLimiter, send, *args: Any) -> Any:
+    """Run ``send(*args)`` under the limiter, retrying 429s after their Retry-After."""
+    attempt = 0
+    while True:
+        limiter.acquire()
+        try:
+            result = send(*args)
+        except Exception as exc:
+            if not is_rate_limited_error(exc):
+                raise
+            limiter.on_throttled(retry_after_from_exception(exc))
+            if attempt >= _MAX_THROTTLE_RETRIES:
+                raise
+            attempt += 1
+            continue
+        limiter.on_success()
+        return result
+
+
+_shared_limiter: AdaptiveRateLimiter | None = None
+_shared_limiter_lock = threading.Lock()
+
+
+def get_shared_rate_limiter() -> AdaptiveRateLimiter:
+    """Return the limiter shared by every Spotify client on this host."""
+    global _shared_limiter
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            _shared_limiter = AdaptiveRateLimiter(state_path=SHARED_BUDGET_PATH)
+        return _shared_limiter
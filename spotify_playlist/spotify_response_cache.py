@@ -0,0 +1,290 @@
+"""Persistent SQLite cache for idempotent Spotify Web API GET responses."""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlencode
+
+from spotify_playlist.deps import SpotifyException
+from spotify_playlist.spotify_rate_limiter import call_rate_limited
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CACHE_DB_PATH = PROJECT_ROOT / ".spotify_http_cache.sqlite3"
+# Entries past expiry are kept this long so their ETag can still revalidate them.
+_STALE_RETENTION_SECONDS = 30 * 86400
+
+_HOUR = 3600
+_DAY = 86400
+
+# (path pattern, TTL in seconds). TTL 0 means "always revalidate with the ETag".
+ENDPOINT_TTLS: tuple[tuple[re.Pattern[str], int], ...] = (
+    # snapshot_id decides whether a sync rescans a playlist, so never serve it unrevalidated.
+    (re.compile(r"^playlists/[^/]+$"), 0),
+    (re.compile(r"^playlists/[^/]+/(?:tracks|items)$"), 0),
+    (re.compile(r"^artists$"), 7 * _DAY),
+    (re.compile(r"^artists/[^/]+$"), 7 * _DAY),
+    (re.compile(r"^artists/[^/]+/albums$"), _HOUR),
+    (re.compile(r"^albums$"), 30 * _DAY),
+    (re.compile(r"^albums/[^/]+$"), 30 * _DAY),
+    (re.compile(r"^albums/[^/]+/tracks$"), 30 * _DAY),
+    (re.compile(r"^tracks$"), 30 * _DAY),
+    (re.compile(r"^tracks/[^/]+$"), 30 * _DAY),
+    (re.compile(r"^audio-features$"), 90 * _DAY),
+    (re.compile(r"^audio-features/[^/]+$"), 90 * _DAY),
+    (re.compile(r"^search$"), _DAY),
+)
+
+_PLAYLIST_PATH_RE = re.compile(r"^playlists/([^/]+)")
+
+
+def _endpoint_path(url: str, prefix: str) -> str:
+    path = url[len(prefix):] if url.startswith(prefix) else url
+    return path.split("?", 1)[0].strip("/")
+
+
+def endpoint_ttl(path: str) -> int | None:
+    """Return the cache TTL for an API path, or None when it must not be cached."""
+    for pattern, ttl in ENDPOINT_TTLS:
+        if pattern.match(path):
+            return ttl
+    return None
+
+
+def client_identity(sp: Any) -> str:
+    """Short stable id of the app and user a client calls Spotify as.
+
+    Keys on the auth manager's client id and token cache file, so it survives
+    token refreshes; a client without a cache file gets a per-process id.
+    """
+    auth = getattr(sp, "auth_manager", None)
+    if auth is None:
+        parts: tuple[Any, ...] = ("token", getattr(sp, "_auth", None))
+    else:
+        handler = getattr(auth, "cache_handler", None)
+        cache_path = getattr(handler, "cache_path", None) or getattr(auth, "cache_path", None)
+        parts = (type(auth).__name__, getattr(auth, "client_id", None), cache_path or id(auth))
+    return hashlib.sha256(repr(parts).encode()).hexdigest()[:16]
+
+
+def _cache_key(url: str, params: dict[str, Any] | None, identity: str) -> str:
+    clean = sorted(
+        (key, str(value)) for key, value in (params or {}).items() if value is not None
+    )
+    base = f"{url}?{urlencode(clean)}" if clean else url
+    # Identity goes last so invalidate_prefix(url) still drops every user's copy.
+    return f"{base}#{identity}"
+
+
+class ResponseCache:
+    """SQLite-backed store of JSON bodies with expiry and ETag per request."""
+
+    def __init__(self, path: Path | str = CACHE_DB_PATH) -> None:
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(str(self._path), timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS http_cache ("
+                "cache_key TEXT PRIMARY KEY, "
+                "etag TEXT NULL, "
+                "body TEXT NOT NULL, "
+                "fetched_at REAL NOT NULL, "
+                "expires_at REAL NOT NULL"
+                ")"
+            )
+            conn.execute(
+                "DELETE FROM http_cache WHERE expires_at < ?",
+                (time.time() - _STALE_RETENTION_SECONDS,),
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> tuple[Any, str | None, bool] | None:
+        """Return (body, etag, fresh) for a cached entry, or None on a miss."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT body, etag, expires_at FROM http_cache WHERE cache_key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        body, etag, expires_at = row
+        return json.loads(body), etag, expires_at > time.time()
+
+    def put(self, key: str, body: Any, etag: str | None, ttl: int) -> None:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO http_cache (cache_key, etag, body, fetched_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, etag, json.dumps(body, ensure_ascii=False), now, now + ttl),
+            )
+            conn.commit()
+
+    def touch(self, key: str, ttl: int) -> None:
+        """Extend an entry after a 304 Not Modified."""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "UPDATE http_cache SET fetched_at = ?, expires_at = ? WHERE cache_key = ?",
+                (now, now + ttl, key),
+            )
+            conn.commit()
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "DELETE FROM http_cache WHERE cache_key LIKE ? ESCAPE '\\'",
+                (escaped + "%",),
+            )
+            conn.commit()
+
+    def record(self, outcome: str) -> None:
+        """Count a lookup outcome: "hits", "misses" or "revalidated"."""
+        with self._stats_lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def stats(self) -> dict[str, int]:
+        with self._stats_lock:
+            return {"hits": self.hits, "misses": self.misses, "revalidated": self.revalidated}
+
+
+def _conditional_get(sp: Any, url: str, params: dict[str, Any] | None, etag: str | None):
+    """Issue a GET like spotipy's _internal_call, but with If-None-Match and ETag capture.
+
+    Returns (body, etag, not_modified). Transport errors are raised as
+    SpotifyException, as spotipy does, so callers only need one except clause.
+    """
+    from requests.exceptions import RequestException, RetryError
+
+    headers = sp._auth_headers()
+    headers["Content-Type"] = "application/json"
+    if getattr(sp, "language", None) is not None:
+        headers["Accept-Language"] = sp.language
+    if etag:
+        headers["If-None-Match"] = etag
+
+    try:
+        response = sp._session.request(
+            "GET",
+            url,
+            headers=headers,
+            proxies=sp.proxies,
+            timeout=sp.requests_timeout,
+            params=params,
+        )
+    except RetryError as exc:
+        # Same translation as spotipy's _internal_call once urllib3 gives up retrying.
+        try:
+            reason = exc.args[0].reason
+        except (IndexError, AttributeError):
+            reason = None
+        raise SpotifyException(429, -1, f"{url}:\n Max Retries", reason=reason) from exc
+    except RequestException as exc:
+        raise SpotifyException(-1, -1, f"{url}:\n {exc}") from exc
+    if response.status_code == 304:
+        return None, etag, True
+    if response.status_code >= 400:
+        try:
+            error = response.json().get("error") or {}
+        except ValueError:
+            error = {}
+        message = error.get("message", "error") if isinstance(error, dict) else "error"
+        reason = error.get("reason") if isinstance(error, dict) else None
+        raise SpotifyException(
+            response.status_code,
+            -1,
+            f"{response.url}:\n {message}",
+            reason=reason,
+            headers=response.headers,
+        )
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+    return body, response.headers.get("ETag"), False
+
+
+def apply_response_cache(sp: Any, cache: ResponseCache | None = None) -> Any:
+    """Serve cacheable GETs from disk; revalidate stale entries with their ETag.
+
+    Install after ``apply_rate_limit`` so cache hits do not spend request budget.
+    """
+    if cache is None:
+        cache = get_shared_response_cache()
+    original = sp._internal_call
+    limiter = getattr(sp, "rate_limiter", None)
+    identity = client_identity(sp)
+
+    def fetch(url, params, etag):
+        if limiter is None:
+            return _conditional_get(sp, url, params, etag)
+        return call_rate_limited(limiter, _conditional_get, sp, url, params, etag)
+
+    def cached_internal_call(method, url, payload, params):
+        path = _endpoint_path(url, sp.prefix)
+        if method != "GET":
+            playlist_match = _PLAYLIST_PATH_RE.match(path)
+            if playlist_match:
+                cache.invalidate_prefix(f"{sp.prefix}playlists/{playlist_match.group(1)}")
+            return original(method, url, payload, params)
+
+        ttl = endpoint_ttl(path)
+        if ttl is None or (params and "content_type" in params):
+            return original(method, url, payload, params)
+
+        full_url = url if url.startswith("http") else sp.prefix + url
+        key = _cache_key(full_url, params, identity)
+        entry = cache.get(key)
+        if entry is not None and entry[2]:
+            cache.record("hits")
+            return entry[0]
+
+        cached_etag = entry[1] if entry is not None else None
+        body, etag, not_modified = fetch(full_url, params, cached_etag)
+        if not_modified and entry is not None:
+            cache.record("revalidated")
+            cache.touch(key, ttl)
+            return entry[0]
+
+        cache.record("misses")
+        if body is not None and (ttl > 0 or etag):
+            cache.put(key, body, etag, ttl)
+        return body
+
+    sp._internal_call = cached_internal_call
+    sp.response_cache = cache
+    return sp
+
+
+_shared_cache: ResponseCache | None = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_response_cache() -> ResponseCache:
+    """Return the process-wide response cache backed by CACHE_DB_PATH."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache()
+        return _shared_cache
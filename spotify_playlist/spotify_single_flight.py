@@ -0,0 +1,102 @@
+"""Collapse concurrent identical Spotify GETs into one request."""
+from __future__ import annotations
+
+import copy
+import json
+import threading
+from typing import Any, Callable
+
+from spotify_playlist.spotify_response_cache import client_identity
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "followers")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """Run one call per key at a time; concurrent callers wait for and share its result."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        self.shared = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                call.followers += 1
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            # call.result is a private snapshot; each follower gets its own copy of it.
+            return copy.deepcopy(call.result)
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            call.error = exc
+            self._finish(key, call)
+            raise
+        self._finish(key, call, result)
+        return result
+
+    def _finish(self, key: str, call: _Call, result: Any = None) -> None:
+        """Close the call to new followers and wake the waiting ones.
+
+        The snapshot is taken before the leader's caller gets ``result`` back,
+        so nothing it does to that object can reach the followers.
+        """
+        try:
+            with self._lock:
+                self._calls.pop(key, None)
+                followers = call.followers
+            if followers and call.error is None:
+                call.result = copy.deepcopy(result)
+        finally:
+            call.done.set()
+
+
+def _flight_key(url: str, params: dict[str, Any] | None, identity: str) -> str:
+    clean = {key: value for key, value in (params or {}).items() if value is not None}
+    return identity + "|" + url + "|" + json.dumps(clean, sort_keys=True, default=str)
+
+
+def apply_single_flight(sp: Any, group: SingleFlight | None = None) -> Any:
+    """Share in-flight GETs across every client in this process that calls as the same user.
+
+    Install outermost so duplicates skip the cache lookup and the rate limiter.
+    """
+    if group is None:
+        group = _shared_group
+    original = sp._internal_call
+    identity = client_identity(sp)
+
+    def single_flight_internal_call(method, url, payload, params):
+        if method != "GET":
+            return original(method, url, payload, params)
+        full_url = url if url.startswith("http") else sp.prefix + url
+        return group.do(
+            _flight_key(full_url, params, identity),
+            lambda: original(method, url, payload, params),
+        )
+
+    sp._internal_call = single_flight_internal_call
+    sp.single_flight = group
+    return sp
+
+
+_shared_group = SingleFlight()
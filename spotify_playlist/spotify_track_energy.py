@@ -4,8 +4,6 @@ from __future__ import annotations
 
 from typing import Any
 
-from spotify_playlist.audio_batch import spotify_call_with_retry
-
 
 def normalize_energy(value: Any) -> float | None:
     """Normalize Spotify energy (0.0–1.0) for database storage."""
@@ -35,7 +33,7 @@ def fetch_track_energies(sp, track_uris: list[str]) -> dict[str, float | None]:
     batch_size = 100
     for offset in range(0, len(unique_uris), batch_size):
         batch = unique_uris[offset : offset + batch_size]
-        features_list = spotify_call_with_retry(lambda b=batch: sp.audio_features(b))
+        features_list = sp.audio_features(batch)
         if not features_list:
             continue
         for uri, features in zip(batch, features_list):
@@ -3,7 +3,8 @@ from db_store import (
     load_historical_data,
     load_playlists_config,
     resolve_sync_days_back,
-    save_historical_data,
+    save_historical_changes,
+    store_session,
 )
 
 from spotify_playlist.action_sound import play_action_done
@@ -11,8 +12,10 @@ from spotify_playlist.add_tracks_to_playlist import add_tracks_to_playlist
 from spotify_playlist.colors import Colors
 from spotify_playlist.deps import SpotifyException
 from spotify_playlist.get_all_artist_releases import get_all_artist_releases
+from spotify_playlist.historical_changes import HistoricalChanges
 
 
+@store_session()
 def sync_artist_releases(sp):
     """Checks followed artists for new releases and adds them to the destination playlist."""
     # Reload configuration (may have been changed)
@@ -26,7 +29,9 @@ def sync_artist_releases(sp):
         print(f"{Colors.DIM}   Set a destination playlist via the settings page or populate app_config.{Colors.RESET}")
         return
 
-    historische_nummers = load_historical_data(config.BRON_PLAYLISTS)
+    historie = HistoricalChanges(
+        load_historical_data(config.BRON_PLAYLISTS, keys=["__artist_releases__"])
+    )
     nieuwe_nummers_uris = []
 
     print(f"\n{Colors.BOLD}{Colors.BRIGHT_MAGENTA}{'═'*70}{Colors.RESET}")
@@ -41,7 +46,7 @@ def sync_artist_releases(sp):
         if artist_releases:
             # Check which releases are new (not already in historical data)
             artist_releases_key = '__artist_releases__'
-            laatst_bekende_artist_releases = historische_nummers.get(artist_releases_key, set())
+            laatst_bekende_artist_releases = historie.historical.get(artist_releases_key, set())
             nieuwe_artist_uris = set(artist_releases.keys()) - laatst_bekende_artist_releases
 
             if nieuwe_artist_uris:
@@ -65,7 +70,7 @@ def sync_artist_releases(sp):
                 nieuwe_nummers_uris.extend(list(nieuwe_artist_uris))
 
                 # Update historical data
-                historische_nummers[artist_releases_key] = set(artist_releases.keys())
+                historie.replace(artist_releases_key, artist_releases.keys())
             else:
                 print(f"{Colors.DIM}🤷 No new releases from followed artists found.{Colors.RESET}\n")
         else:
@@ -83,6 +88,6 @@ def sync_artist_releases(sp):
     add_tracks_to_playlist(sp, nieuwe_nummers_uris, config.MIJN_DOEL_PLAYLIST_ID)
 
     # Save state for next time
-    save_historical_data(historische_nummers)
+    save_historical_changes(historie.added, historie.removed)
     print(f"\n{Colors.BOLD}{Colors.BRIGHT_GREEN}✅ Artist releases sync completed!{Colors.RESET}\n")
     play_action_done()
@@ -5,11 +5,14 @@ from db_store import (
     backfill_playlist_names,
     load_artist_discovery_enabled,
     load_historical_data,
+    load_playlist_snapshots,
     load_playlists_config,
     load_sync_start_date,
     resolve_sync_days_back,
     resolve_sync_since_date,
-    save_historical_data,
+    save_historical_changes,
+    save_playlist_snapshots,
+    store_session,
 )
 
 from spotify_playlist.action_sound import play_action_done
@@ -20,6 +23,8 @@ from spotify_playlist.get_all_artist_releases import get_all_artist_releases
 from spotify_playlist.get_discovery_artist_releases import get_discovery_artist_releases
 from spotify_playlist.get_recent_playlist_tracks import get_recent_playlist_tracks
 from spotify_playlist.get_track_info import get_track_info
+from spotify_playlist.historical_changes import HistoricalChanges
+from spotify_playlist.known_uri_index import KnownUriIndex
 from spotify_playlist.loading_progress import loading_bar
 
 ProgressCallback = Callable[[dict[str, Any]], None]
@@ -27,13 +32,19 @@ ARTIST_RELEASES_KEY = "__artist_releases__"
 ARTIST_DISCOVERY_KEY = "__artist_discovery__"
 
 
-def _all_historical_uris(historical: dict[str, set[str]]) -> set[str]:
-    known: set[str] = set()
-    for uris in historical.values():
-        known |= uris
-    return known
+def _snapshot_unchanged(
+    known: dict[str, Any] | None,
+    snapshot_id: str | None,
+    since_date,
+) -> bool:
+    """True when the playlist is at the snapshot we already scanned, over a window at least as wide."""
+    if not known or not snapshot_id or known.get("snapshot_id") != snapshot_id:
+        return False
+    scanned_since = known.get("since")
+    return scanned_since is not None and scanned_since <= since_date
 
 
+@store_session()
 def sync_playlists(
     sp,
     on_progress: ProgressCallback | None = None,
@@ -106,7 +117,13 @@ def sync_playlists(
         except Exception:
             pass
 
-    historische_nummers = load_historical_data(config.BRON_PLAYLISTS)
+    # Only the keys this run updates are loaded as URI sets; discovery checks the
+    # rest of the history through KnownUriIndex.
+    historische_nummers = load_historical_data(
+        config.BRON_PLAYLISTS,
+        keys=[*config.BRON_PLAYLISTS, ARTIST_RELEASES_KEY, ARTIST_DISCOVERY_KEY],
+    )
+    historie = HistoricalChanges(historische_nummers)
     nieuwe_nummers_uris: list[str] = []
     sync_since_date = resolve_sync_since_date()
     sync_start_saved = load_sync_start_date()
@@ -145,15 +162,13 @@ def sync_playlists(
             result["artist_releases_found"] = len(artist_releases)
 
             if artist_releases:
-                laatst_bekende_artist_releases = historische_nummers.get(ARTIST_RELEASES_KEY, set())
-                nieuwe_artist_uris = set(artist_releases.keys()) - laatst_bekende_artist_releases
+                nieuwe_artist_uris = historie.replace(ARTIST_RELEASES_KEY, artist_releases.keys())
                 result["artist_releases_new"] = len(nieuwe_artist_uris)
                 if nieuwe_artist_uris:
                     log(
                         f"{Colors.BRIGHT_GREEN}🎉 {len(nieuwe_artist_uris)} new artist releases to add{Colors.RESET}\n"
                     )
                     nieuwe_nummers_uris.extend(sorted(nieuwe_artist_uris))
-                historische_nummers[ARTIST_RELEASES_KEY] = set(artist_releases.keys())
             else:
                 log(f"{Colors.DIM}🤷 No new releases found from followed artists.{Colors.RESET}\n")
 
@@ -203,11 +218,11 @@ def sync_playlists(
             result["discovery_releases_found"] = len(discovery_releases)
 
             if discovery_releases:
-                known_uris = _all_historical_uris(historische_nummers)
-                discovery_known = historische_nummers.get(ARTIST_DISCOVERY_KEY, set())
-                nieuwe_discovery_uris = (
-                    set(discovery_releases.keys()) - known_uris - discovery_known
-                )
+                known_uris = KnownUriIndex.from_store()
+                # Additions earlier in this run are not saved yet.
+                nieuwe_discovery_uris = known_uris.difference(discovery_releases.keys())
+                for added in historie.added.values():
+                    nieuwe_discovery_uris -= added
                 result["discovery_releases_new"] = len(nieuwe_discovery_uris)
                 if nieuwe_discovery_uris:
                     log(
@@ -215,9 +230,7 @@ def sync_playlists(
                         f"releases to add{Colors.RESET}\n"
                     )
                     nieuwe_nummers_uris.extend(sorted(nieuwe_discovery_uris))
-                historische_nummers[ARTIST_DISCOVERY_KEY] = discovery_known.union(
-                    discovery_releases.keys()
-                )
+                historie.add(ARTIST_DISCOVERY_KEY, discovery_releases.keys())
             else:
                 log(f"{Colors.DIM}🤷 No discovery releases found.{Colors.RESET}\n")
 
@@ -246,6 +259,9 @@ def sync_playlists(
             f"{Colors.RESET}\n"
         )
 
+    known_snapshots = load_playlist_snapshots(config.BRON_PLAYLISTS) if config.BRON_PLAYLISTS else {}
+    seen_snapshots: dict[str, str] = {}
+
     if config.BRON_PLAYLISTS:
         report(
             phase="sources_start",
@@ -266,9 +282,11 @@ def sync_playlists(
 
             playlist_name = "Unknown"
             playlist_image_url = None
+            snapshot_id = None
             try:
-                playlist_info = sp.playlist(pl_id, fields="name,images")
+                playlist_info = sp.playlist(pl_id, fields="name,images,snapshot_id")
                 playlist_name = playlist_info["name"]
+                snapshot_id = playlist_info.get("snapshot_id")
                 images = playlist_info.get("images") or []
                 playlist_image_url = images[0].get("url") if images else None
                 log(
@@ -281,6 +299,26 @@ def sync_playlists(
                     f"{Colors.BRIGHT_CYAN}{' '*(68-30)}║{Colors.RESET}"
                 )
 
+            if pl_id in historische_nummers and _snapshot_unchanged(
+                known_snapshots.get(pl_id), snapshot_id, sync_since_date
+            ):
+                result["playlists_checked"] += 1
+                log(
+                    f"{Colors.BRIGHT_CYAN}║{Colors.RESET}  {Colors.DIM}Unchanged since last sync — skipped"
+                    f"{Colors.RESET}  {Colors.BRIGHT_CYAN}{' '*(68-40)}║{Colors.RESET}"
+                )
+                report(
+                    phase="playlist_done",
+                    message=f"{playlist_name}: 0 new (unchanged)",
+                    playlist_index=idx,
+                    playlist_total=len(config.BRON_PLAYLISTS),
+                    playlist_name=playlist_name,
+                    playlist_image_url=playlist_image_url,
+                    tracks_found=result["tracks_found"],
+                    tracks_new=len(nieuwe_nummers_uris),
+                )
+                continue
+
             report(
                 phase="playlist_start",
                 message=f"Checking {playlist_name}",
@@ -323,16 +361,12 @@ def sync_playlists(
             result["tracks_found"] += len(recent_uris)
             result["playlists_checked"] += 1
 
-            laatst_bekende_uris = historische_nummers.get(pl_id, set())
-            nieuwe_uris = recent_uris - laatst_bekende_uris
-
-            if nieuwe_uris:
-                historische_nummers[pl_id] = laatst_bekende_uris.union(recent_uris)
-            elif pl_id not in historische_nummers:
-                historische_nummers[pl_id] = recent_uris
+            nieuwe_uris = historie.add(pl_id, recent_uris)
 
             if nieuwe_uris:
                 nieuwe_nummers_uris.extend(list(nieuwe_uris))
+            if snapshot_id:
+                seen_snapshots[pl_id] = snapshot_id
 
             report(
                 phase="playlist_done",
@@ -386,7 +420,8 @@ def sync_playlists(
     )
     result["tracks_added"] = tracks_added
 
-    save_historical_data(historische_nummers)
+    save_historical_changes(historie.added, historie.removed)
+    save_playlist_snapshots(seen_snapshots, sync_since_date)
     log(f"\n{Colors.BOLD}{Colors.BRIGHT_GREEN}✅ Playlist sync completed!{Colors.RESET}\n")
     if not quiet:
         play_action_done()
@@ -0,0 +1,1958 @@
+"""SQLite persistence for playlist_sync (single-user installs, tests and benchmarks).
+
+Implements the same functions as ``mysql_store`` against one local database
+file in WAL mode. ``db_store`` picks this backend when ``DB_BACKEND=sqlite``.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+from normalize_track_name import normalize_track_name
+from settings_cache import SETTINGS_SQL, SettingsCache, settings_from_rows
+from spotify_playlist.release_year import normalize_release_year
+from spotify_playlist.spotify_track_energy import normalize_energy
+from store_common import (
+    DEFAULT_SYNC_DAYS_BACK,
+    TRACK_URI_PREFIX,
+    UNCATEGORIZED_GENRE,
+    NewTrack,
+    escape_like,
+    job_from_row,
+    new_track_from_row,
+    normalize_locale,
+    normalize_reference_url,
+    normalize_ui_skin,
+    parse_datetime,
+    search_terms,
+    split_job_fields,
+    track_id_from_uri,
+    utc_now,
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+SQLITE_DB_PATH = Path(os.environ.get("SQLITE_PATH") or PROJECT_ROOT / "spotify_playground.sqlite3")
+
+
+def _dict_row(cursor: sqlite3.Cursor, row: tuple) -> Dict[str, Any]:
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(str(SQLITE_DB_PATH), timeout=30, isolation_level="IMMEDIATE")
+    conn.row_factory = _dict_row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+class _ThreadConnection:
+    """The calling thread's SQLite connection, kept open between store calls.
+
+    close() only rolls back a transaction left open by the outermost caller,
+    so store functions can call each other without ending the handle.
+    """
+
+    def __init__(self, raw: sqlite3.Connection) -> None:
+        self._raw = raw
+        self._depth = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._raw, name)
+
+    def close(self) -> None:
+        self._depth = max(0, self._depth - 1)
+        if self._depth == 0 and self._raw.in_transaction:
+            self._raw.rollback()
+
+
+_local = threading.local()
+_job_local = threading.local()
+
+
+def _thread_connection(local: threading.local) -> _ThreadConnection:
+    conn = getattr(local, "conn", None)
+    if conn is None:
+        conn = _ThreadConnection(_connect())
+        local.conn = conn
+    conn._depth += 1
+    return conn
+
+
+def get_connection():
+    """Return this thread's SQLite connection (caller must close or use try/finally)."""
+    return _thread_connection(_local)
+
+
+def _job_connection():
+    """This thread's connection for the job table, separate from get_connection().
+
+    Job writes commit on their own; on the shared thread connection they would
+    also end a transaction the caller still has open (e.g. a streaming read).
+    """
+    return _thread_connection(_job_local)
+
+
+class StoreSession:
+    """Settings snapshot shared by the store calls of a run on one thread.
+
+    The thread connection stays open for the whole session and each call still
+    commits on its own, as on MySQL: SQLite has a single write lock, and holding
+    it for a whole sync run would block the web UI.
+    """
+
+    def __init__(self, conn) -> None:
+        self.conn = conn
+        self._settings: Optional[Dict[str, Any]] = None
+        self._settings_generation = _settings.generation
+
+    def settings(self) -> Dict[str, Any]:
+        generation = _settings.generation
+        if self._settings is None or generation != self._settings_generation:
+            self._settings = settings_from_rows(self.conn.execute(SETTINGS_SQL).fetchall())
+            self._settings_generation = generation
+        return self._settings
+
+
+@contextmanager
+def store_session() -> Iterator[StoreSession]:
+    """Run a batch of store calls (e.g. one sync run) on this thread's connection.
+
+    Every call commits on its own, so work saved before a later failure is
+    kept. Nested sessions on the same thread join the open one; usable as a decorator.
+    """
+    session = getattr(_local, "session", None)
+    if session is not None:
+        yield session
+        return
+
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        _local.session = StoreSession(conn)
+        yield _local.session
+    finally:
+        _local.session = None
+        conn.close()
+
+
+def _db_datetime(value: Any) -> Optional[str]:
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ", timespec="seconds")
+    return value
+
+
+_settings = SettingsCache()
+
+
+def _refresh_settings(cached_version: Optional[int]) -> Optional[Dict[str, Any]]:
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        if cached_version is not None:
+            row = conn.execute(
+                "SELECT config_version FROM app_config WHERE singleton = 1"
+            ).fetchone()
+            if row and int(row["config_version"]) == cached_version:
+                return None
+        return settings_from_rows(conn.execute(SETTINGS_SQL).fetchall())
+    finally:
+        conn.close()
+
+
+def _load_settings() -> Dict[str, Any]:
+    """Return the app_config settings from the in-process cache (see SettingsCache)."""
+    session = getattr(_local, "session", None)
+    if session is not None:
+        return session.settings()
+    return _settings.get(_refresh_settings)
+
+
+def load_playlists_config() -> Dict[str, Any]:
+    """Load source, destination, and tracking playlist Spotify IDs."""
+    try:
+        settings = _load_settings()
+    except Exception as e:
+        print(f"❌ Error loading playlist configuration from database: {e}")
+        return {"source_playlists": [], "destination_playlist": "", "tracking_playlists": []}
+    return {
+        "source_playlists": list(settings["source_playlists"]),
+        "destination_playlist": settings["destination_playlist"],
+        "tracking_playlists": list(settings["tracking_playlists"]),
+    }
+
+
+def save_playlists_config(
+    config: Dict[str, Any],
+    *,
+    playlist_details: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> None:
+    """Replace playlist configuration in the database."""
+    conn = get_connection()
+    try:
+        dest = (config.get("destination_playlist") or "").strip()
+        sources = config.get("source_playlists") or []
+        tracking = config.get("tracking_playlists") or []
+        details = playlist_details or {}
+        if not details:
+            try:
+                from spotify_playlist.fetch_playlist_info import resolve_playlist_details
+                from spotify_playlist.spotify_api_client import get_quiet_spotify_client
+
+                spotify_ids: List[str] = []
+                if dest:
+                    spotify_ids.append(dest)
+                for spotify_id in sources + tracking:
+                    spotify_id = (spotify_id or "").strip()
+                    if spotify_id and spotify_id not in spotify_ids:
+                        spotify_ids.append(spotify_id)
+                if spotify_ids:
+                    details = resolve_playlist_details(
+                        get_quiet_spotify_client(), spotify_ids
+                    )
+            except RuntimeError:
+                pass
+
+        _ensure_schema(conn)
+        kept_ref_ids: Set[int] = set()
+        dest_ref_id = None
+        if dest:
+            entry = details.get(dest, {})
+            dest_ref_id = _upsert_playlist_cur(
+                conn,
+                spotify_id=dest,
+                name=entry.get("name"),
+                artwork_url=entry.get("artwork_url"),
+            )
+            kept_ref_ids.add(dest_ref_id)
+        conn.execute(
+            "INSERT INTO app_config (singleton, destination_playlist_ref_id) VALUES (1, ?) "
+            "ON CONFLICT(singleton) DO UPDATE SET "
+            "destination_playlist_ref_id = excluded.destination_playlist_ref_id, "
+            "config_version = app_config.config_version + 1",
+            (dest_ref_id,),
+        )
+
+        for table, spotify_ids in (("playlist_source", sources), ("playlist_tracking", tracking)):
+            conn.execute(f"DELETE FROM {table}")
+            for i, spotify_id in enumerate(spotify_ids):
+                spotify_id = (spotify_id or "").strip()
+                if not spotify_id:
+                    continue
+                entry = details.get(spotify_id, {})
+                ref_id = _upsert_playlist_cur(
+                    conn,
+                    spotify_id=spotify_id,
+                    name=entry.get("name"),
+                    artwork_url=entry.get("artwork_url"),
+                )
+                kept_ref_ids.add(ref_id)
+                conn.execute(
+                    f"INSERT OR IGNORE INTO {table} (sort_order, playlist_ref_id) VALUES (?, ?)",
+                    (i, ref_id),
+                )
+
+        _prune_unused_config_playlists(conn, kept_ref_ids)
+        conn.commit()
+        _settings.invalidate()
+        _try_backfill_playlist_names()
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ Error saving playlist configuration: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def _historical_key_ids(conn, keys: List[str]) -> Dict[str, int]:
+    """Return the integer reference for each playlist key, creating missing ones."""
+    unique_keys = [key for key in dict.fromkeys(keys) if key]
+    if not unique_keys:
+        return {}
+    conn.executemany(
+        "INSERT OR IGNORE INTO historical_key (playlist_key) VALUES (?)",
+        [(key,) for key in unique_keys],
+    )
+    ids: Dict[str, int] = {}
+    for start in range(0, len(unique_keys), 500):
+        batch = unique_keys[start : start + 500]
+        placeholders = ", ".join(["?"] * len(batch))
+        for row in conn.execute(
+            f"SELECT id, playlist_key FROM historical_key WHERE playlist_key IN ({placeholders})",
+            batch,
+        ):
+            ids[row["playlist_key"]] = row["id"]
+    return ids
+
+
+def _split_historical_rows(data: Dict[str, Set[str]], key_ids: Dict[str, int]):
+    """Split (key, uri) pairs into compact track rows and rows for other URIs."""
+    track_rows: List[tuple] = []
+    other_rows: List[tuple] = []
+    for pl_key, uris in data.items():
+        for uri in uris:
+            track_id = track_id_from_uri(uri)
+            if track_id is not None:
+                track_rows.append((key_ids[pl_key], track_id))
+            else:
+                other_rows.append((pl_key, uri))
+    return track_rows, other_rows
+
+
+def _insert_historical_rows(conn, track_rows: List[tuple], other_rows: List[tuple]) -> None:
+    conn.executemany(
+        "INSERT OR IGNORE INTO historical_track (key_id, track_id) VALUES (?, ?)",
+        track_rows,
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO historical_tracks (playlist_key, track_uri) VALUES (?, ?)",
+        other_rows,
+    )
+
+
+def load_historical_data(
+    bron_playlists: Optional[List[str]] = None,
+    keys: Optional[List[str]] = None,
+) -> Dict[str, Set[str]]:
+    """Load known track URIs per playlist key (including '__artist_releases__').
+
+    With ``keys`` only those history keys are read; a sync passes the keys it
+    updates and checks everything else through iter_historical_track_ids.
+    """
+    data: Dict[str, Set[str]] = defaultdict(set)
+    key_filter = ""
+    params: List[str] = []
+    if keys is not None:
+        params = list(dict.fromkeys(keys))
+        key_filter = f" WHERE {{}} IN ({', '.join(['?'] * len(params))})" if params else " WHERE 1 = 0"
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        for row in conn.execute(
+            "SELECT k.playlist_key, h.track_id "
+            "FROM historical_track h JOIN historical_key k ON k.id = h.key_id"
+            + key_filter.format("k.playlist_key"),
+            params,
+        ):
+            data[row["playlist_key"]].add(TRACK_URI_PREFIX + row["track_id"])
+        for row in conn.execute(
+            "SELECT playlist_key, track_uri FROM historical_tracks" + key_filter.format("playlist_key"),
+            params,
+        ):
+            data[row["playlist_key"]].add(row["track_uri"])
+    except Exception as e:
+        print(f"Error loading historical data: {e}")
+        if bron_playlists:
+            return {pl_id: set() for pl_id in bron_playlists}
+        return {}
+    finally:
+        conn.close()
+
+    out: Dict[str, Set[str]] = {k: set(v) for k, v in data.items()}
+    if bron_playlists:
+        for pl_id in bron_playlists:
+            out.setdefault(pl_id, set())
+    return out
+
+
+def iter_historical_track_ids() -> Iterator[str]:
+    """Stream the distinct track ids of every history key in ascending order.
+
+    BINARY collation orders the ids by their base62 value as well.
+    """
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        cur = conn.cursor()
+        cur.row_factory = None
+        try:
+            for (track_id,) in cur.execute(
+                "SELECT DISTINCT track_id FROM historical_track ORDER BY track_id"
+            ):
+                yield track_id
+        finally:
+            cur.close()
+    finally:
+        conn.close()
+
+
+def load_historical_other_uris() -> Set[str]:
+    """History URIs that are not plain track URIs (local files, episodes), across all keys."""
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        rows = conn.execute("SELECT DISTINCT track_uri FROM historical_tracks").fetchall()
+        return {row["track_uri"] for row in rows}
+    finally:
+        conn.close()
+
+
+def save_historical_data(data: Dict[str, Set[str]]) -> None:
+    """Persist full historical snapshot."""
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        conn.execute("DELETE FROM historical_track")
+        conn.execute("DELETE FROM historical_tracks")
+        key_ids = _historical_key_ids(conn, [key for key, uris in data.items() if uris])
+        track_rows, other_rows = _split_historical_rows(data, key_ids)
+        _insert_historical_rows(conn, track_rows, other_rows)
+        conn.commit()
+        print("\n✅ Historical data saved to the database")
+    except Exception as e:
+        conn.rollback()
+        print(f"Error saving historical data: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def save_historical_changes(
+    added: Dict[str, Set[str]],
+    removed: Optional[Dict[str, Set[str]]] = None,
+) -> None:
+    """Apply per-key additions and removals to the history tables."""
+    added = {pl_key: uris for pl_key, uris in added.items() if uris}
+    removed = {pl_key: uris for pl_key, uris in (removed or {}).items() if uris}
+    if not added and not removed:
+        return
+
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        key_ids = _historical_key_ids(conn, list(added) + list(removed))
+        removed_tracks, removed_other = _split_historical_rows(removed, key_ids)
+        conn.executemany(
+            "DELETE FROM historical_track WHERE key_id = ? AND track_id = ?",
+            removed_tracks,
+        )
+        conn.executemany(
+            "DELETE FROM historical_tracks WHERE playlist_key = ? AND track_uri = ?",
+            removed_other,
+        )
+        _insert_historical_rows(conn, *_split_historical_rows(added, key_ids))
+        conn.commit()
+        print("\n✅ Historical data saved to the database")
+    except Exception as e:
+        conn.rollback()
+        print(f"Error saving historical data: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def load_artist_release_catalog(artist_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Load known albums and last scan state per artist (see get_artist_new_releases)."""
+    catalog: Dict[str, Dict[str, Any]] = {}
+    unique_ids = [artist_id for artist_id in dict.fromkeys(artist_ids) if artist_id]
+    if not unique_ids:
+        return catalog
+
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        for start in range(0, len(unique_ids), 500):
+            batch = unique_ids[start : start + 500]
+            placeholders = ", ".join(["?"] * len(batch))
+            for row in conn.execute(
+                "SELECT artist_id, album_total, scanned_since, last_checked "
+                f"FROM artist_release_check WHERE artist_id IN ({placeholders})",
+                batch,
+            ):
+                catalog[row["artist_id"]] = {
+                    "album_total": row.get("album_total"),
+                    "scanned_since": parse_datetime(row.get("scanned_since")),
+                    "last_checked": parse_datetime(row.get("last_checked")),
+                    "albums": {},
+                }
+
+            for row in conn.execute(
+                "SELECT artist_id, album_id, album_name, album_type, release_date, tracks_json "
+                f"FROM artist_release WHERE artist_id IN ({placeholders}) "
+                "ORDER BY release_date DESC, album_id ASC",
+                batch,
+            ):
+                entry = catalog.get(row["artist_id"])
+                if entry is None:
+                    continue
+                tracks_json = row.get("tracks_json")
+                entry["albums"][row["album_id"]] = {
+                    "name": row.get("album_name") or "Unknown",
+                    "album_type": row.get("album_type"),
+                    "release_date": row.get("release_date") or "",
+                    "tracks": json.loads(tracks_json) if tracks_json else None,
+                }
+        return catalog
+    except Exception as e:
+        print(f"Error loading artist release catalog: {e}")
+        return {}
+    finally:
+        conn.close()
+
+
+def save_artist_release_catalog(catalog: Dict[str, Dict[str, Any]]) -> None:
+    """Persist scan state per artist and every album marked dirty during the scan."""
+    if not catalog:
+        return
+
+    now = _db_datetime(datetime.now())
+    check_rows: List[tuple] = []
+    album_rows: List[tuple] = []
+    for artist_id, entry in catalog.items():
+        if not entry.get("last_checked"):
+            continue
+        check_rows.append(
+            (
+                artist_id,
+                entry.get("album_total"),
+                _db_datetime(entry.get("scanned_since")),
+                _db_datetime(entry.get("last_checked")),
+            )
+        )
+        for album_id, album in (entry.get("albums") or {}).items():
+            if not album.get("dirty"):
+                continue
+            tracks = album.get("tracks")
+            album_rows.append(
+                (
+                    artist_id,
+                    album_id,
+                    (album.get("name") or "")[:512] or None,
+                    album.get("album_type"),
+                    (album.get("release_date") or "")[:10] or None,
+                    json.dumps(tracks, ensure_ascii=False) if tracks is not None else None,
+                    now,
+                )
+            )
+
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        conn.executemany(
+            "INSERT INTO artist_release_check "
+            "(artist_id, album_total, scanned_since, last_checked) "
+            "VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(artist_id) DO UPDATE SET album_total = excluded.album_total, "
+            "scanned_since = excluded.scanned_since, "
+            "last_checked = excluded.last_checked",
+            check_rows,
+        )
+        conn.executemany(
+            "INSERT INTO artist_release "
+            "(artist_id, album_id, album_name, album_type, release_date, "
+            "tracks_json, last_checked) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(artist_id, album_id) DO UPDATE SET album_name = excluded.album_name, "
+            "album_type = excluded.album_type, "
+            "release_date = excluded.release_date, "
+            "tracks_json = COALESCE(excluded.tracks_json, artist_release.tracks_json), "
+            "last_checked = excluded.last_checked",
+            album_rows,
+        )
+        conn.commit()
+        for entry in catalog.values():
+            for album in (entry.get("albums") or {}).values():
+                album.pop("dirty", None)
+    except Exception as e:
+        conn.rollback()
+        print(f"Error saving artist release catalog: {e}")
+    finally:
+        conn.close()
+
+
+def load_playlist_membership(spotify_id: str, uris: List[str]) -> tuple[Optional[str], Set[str]]:
+    """Return the snapshot_id the local index matches and which of ``uris`` it contains."""
+    if not spotify_id:
+        return None, set()
+
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        row = conn.execute(
+            "SELECT snapshot_id FROM playlist_membership_state WHERE spotify_id = ?",
+            (spotify_id,),
+        ).fetchone()
+        if not row:
+            return None, set()
+
+        present: Set[str] = set()
+        unique_uris = [uri for uri in dict.fromkeys(uris) if uri]
+        for start in range(0, len(unique_uris), 500):
+            batch = unique_uris[start : start + 500]
+            placeholders = ", ".join(["?"] * len(batch))
+            present.update(
+                r["track_uri"]
+                for r in conn.execute(
+                    "SELECT track_uri FROM playlist_membership "
+                    f"WHERE spotify_id = ? AND track_uri IN ({placeholders})",
+                    [spotify_id, *batch],
+                )
+            )
+        return row["snapshot_id"], present
+    except Exception as e:
+        print(f"Error loading playlist membership: {e}")
+        return None, set()
+    finally:
+        conn.close()
+
+
+def save_playlist_membership(
+    spotify_id: str,
+    snapshot_id: Optional[str],
+    uris: Set[str] | List[str],
+    replace: bool = False,
+) -> bool:
+    """Record playlist contents at ``snapshot_id``. Returns True when stored.
+
+    With ``replace`` the index is rebuilt from ``uris``; otherwise ``uris`` are
+    appended (tracks we added ourselves) and the snapshot moves forward.
+    """
+    if not spotify_id or not snapshot_id:
+        return False
+
+    rows = [(spotify_id, uri) for uri in dict.fromkeys(uris) if uri]
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        if replace:
+            conn.execute("DELETE FROM playlist_membership WHERE spotify_id = ?", (spotify_id,))
+        conn.executemany(
+            "INSERT OR IGNORE INTO playlist_membership (spotify_id, track_uri) VALUES (?, ?)",
+            rows,
+        )
+        conn.execute(
+            "INSERT INTO playlist_membership_state (spotify_id, snapshot_id, updated_at) "
+            "VALUES (?, ?, ?) "
+            "ON CONFLICT(spotify_id) DO UPDATE SET snapshot_id = excluded.snapshot_id, "
+            "updated_at = excluded.updated_at",
+            (spotify_id, snapshot_id, _db_datetime(datetime.now())),
+        )
+        conn.commit()
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"Error saving playlist membership: {e}")
+        return False
+    finally:
+        conn.close()
+
+
+def _save_app_config_values(values: Dict[str, Any]) -> None:
+    columns = list(values)
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        conn.execute(
+            f"INSERT INTO app_config (singleton, {', '.join(columns)}) "
+            f"VALUES (1, {', '.join(['?'] * len(columns))}) "
+            "ON CONFLICT(singleton) DO UPDATE SET "
+            + ", ".join(f"{column} = excluded.{column}" for column in columns)
+            + ", config_version = app_config.config_version + 1",
+            [values[column] for column in columns],
+        )
+        conn.commit()
+        _settings.invalidate()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def _start_date_for_db(start_date: Any) -> Optional[str]:
+    if start_date is None or start_date == "":
+        return None
+    dt = start_date
+    if not isinstance(dt, datetime):
+        dt = parse_datetime(start_date)
+    if isinstance(dt, datetime) and dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return _db_datetime(dt)
+
+
+def load_tracking_start_date() -> Optional[datetime]:
+    try:
+        return _load_settings()["tracking_start_date"]
+    except Exception as e:
+        print(f"Error loading tracking start date: {e}")
+        return None
+
+
+def load_sync_start_date() -> Optional[datetime]:
+    try:
+        return _load_settings()["sync_start_date"]
+    except Exception as e:
+        print(f"Error loading sync start date: {e}")
+        return None
+
+
+def save_sync_start_date(start_date: Any) -> None:
+    try:
+        _save_app_config_values(
+            {
+                "sync_start_date": _start_date_for_db(start_date),
+                "sync_start_updated": _db_datetime(datetime.now()),
+            }
+        )
+    except Exception as e:
+        print(f"Error saving sync start date: {e}")
+
+
+def resolve_sync_since_date() -> datetime:
+    saved = load_sync_start_date()
+    if saved is None:
+        return datetime.now() - timedelta(days=DEFAULT_SYNC_DAYS_BACK)
+    return saved.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def resolve_sync_days_back() -> int:
+    saved = load_sync_start_date()
+    if saved is None:
+        return DEFAULT_SYNC_DAYS_BACK
+    return max(1, (datetime.now().date() - saved.date()).days + 1)
+
+
+def save_tracking_start_date(start_date: Any) -> None:
+    try:
+        _save_app_config_values(
+            {
+                "tracking_start_date": _start_date_for_db(start_date),
+                "tracking_start_updated": _db_datetime(datetime.now()),
+            }
+        )
+    except Exception as e:
+        print(f"Error saving tracking start date: {e}")
+
+
+def _prune_unused_config_playlists(conn, kept_ref_ids: Set[int]) -> None:
+    protected = kept_ref_ids | {
+        int(row["playlist_id"])
+        for row in conn.execute(
+            "SELECT DISTINCT playlist_id FROM new_tracks WHERE playlist_id IS NOT NULL"
+        )
+    }
+    unused = [
+        (int(row["id"]),)
+        for row in conn.execute(
+            "SELECT id FROM playlist WHERE spotify_id IS NOT NULL AND TRIM(spotify_id) != ''"
+        ).fetchall()
+        if int(row["id"]) not in protected
+    ]
+    conn.executemany("DELETE FROM playlist WHERE id = ?", unused)
+
+
+def load_ui_skin() -> str:
+    try:
+        return normalize_ui_skin(_load_settings()["ui_skin"])
+    except Exception as e:
+        print(f"Error loading UI skin: {e}")
+        return "light"
+
+
+def save_ui_skin(skin: str) -> None:
+    try:
+        _save_app_config_values({"ui_skin": normalize_ui_skin(skin)})
+    except Exception as e:
+        print(f"Error saving UI skin: {e}")
+        raise
+
+
+def load_locale() -> str:
+    try:
+        return normalize_locale(_load_settings()["locale"])
+    except Exception as e:
+        print(f"Error loading locale: {e}")
+        return "en"
+
+
+def save_locale(locale: str) -> None:
+    try:
+        _save_app_config_values({"locale": normalize_locale(locale)})
+    except Exception as e:
+        print(f"Error saving locale: {e}")
+        raise
+
+
+def load_artist_discovery_enabled() -> bool:
+    try:
+        value = _load_settings()["artist_discovery_enabled"]
+    except Exception as e:
+        print(f"Error loading artist discovery setting: {e}")
+        return True
+    return True if value is None else bool(int(value))
+
+
+def save_artist_discovery_enabled(enabled: bool) -> None:
+    try:
+        _save_app_config_values({"artist_discovery_enabled": 1 if enabled else 0})
+    except Exception as e:
+        print(f"Error saving artist discovery setting: {e}")
+        raise
+
+
+def _backfill_playlist_artwork(conn) -> None:
+    conn.execute(
+        "UPDATE playlist SET artwork_url = ("
+        "  SELECT nt.image_url FROM new_tracks nt "
+        "  WHERE nt.playlist_id = playlist.id AND nt.image_url IS NOT NULL "
+        "  ORDER BY nt.id LIMIT 1"
+        ") "
+        "WHERE (artwork_url IS NULL OR TRIM(artwork_url) = '') "
+        "AND id IN (SELECT playlist_id FROM new_tracks WHERE image_url IS NOT NULL)"
+    )
+    conn.commit()
+
+
+def _merge_playlist_rows(conn, *, from_id: int, to_id: int) -> None:
+    """Move references from one playlist row to another and delete the duplicate."""
+    if from_id == to_id:
+        return
+
+    target = conn.execute(
+        "SELECT spotify_id, artwork_url FROM playlist WHERE id = ?", (to_id,)
+    ).fetchone()
+    source = conn.execute(
+        "SELECT spotify_id, artwork_url FROM playlist WHERE id = ?", (from_id,)
+    ).fetchone()
+    if not target or not source:
+        return
+
+    source_sid = (source.get("spotify_id") or "").strip() or None
+    target_sid = (target.get("spotify_id") or "").strip() or None
+    if source_sid and not target_sid:
+        conn.execute("UPDATE playlist SET spotify_id = NULL WHERE id = ?", (from_id,))
+        conn.execute("UPDATE playlist SET spotify_id = ? WHERE id = ?", (source_sid, to_id))
+    if not (target.get("artwork_url") or "").strip() and (source.get("artwork_url") or "").strip():
+        conn.execute(
+            "UPDATE playlist SET artwork_url = ? WHERE id = ?",
+            (source["artwork_url"].strip(), to_id),
+        )
+
+    conn.execute(
+        "UPDATE app_config SET destination_playlist_ref_id = ? "
+        "WHERE destination_playlist_ref_id = ?",
+        (to_id, from_id),
+    )
+    # Source and tracking lists may change too; let every process reload its settings.
+    conn.execute("UPDATE app_config SET config_version = config_version + 1 WHERE singleton = 1")
+
+    for table in ("playlist_source", "playlist_tracking"):
+        if conn.execute(
+            f"SELECT 1 FROM {table} WHERE playlist_ref_id = ? LIMIT 1", (to_id,)
+        ).fetchone():
+            conn.execute(f"DELETE FROM {table} WHERE playlist_ref_id = ?", (from_id,))
+        else:
+            conn.execute(
+                f"UPDATE {table} SET playlist_ref_id = ? WHERE playlist_ref_id = ?",
+                (to_id, from_id),
+            )
+
+    conn.execute(
+        "UPDATE new_tracks SET playlist_id = ? WHERE playlist_id = ?", (to_id, from_id)
+    )
+    conn.execute("DELETE FROM playlist WHERE id = ?", (from_id,))
+
+
+def _update_playlist(conn, playlist_id: int, changes: Dict[str, Any]) -> None:
+    if changes:
+        conn.execute(
+            f"UPDATE playlist SET {', '.join(f'{column} = ?' for column in changes)} WHERE id = ?",
+            [*changes.values(), playlist_id],
+        )
+
+
+def _upsert_playlist_cur(
+    conn,
+    *,
+    name: Optional[str] = None,
+    artwork_url: Optional[str] = None,
+    spotify_id: Optional[str] = None,
+) -> int:
+    playlist_name = (name or "").strip() or None
+    sid = (spotify_id or "").strip() or None
+    url = (artwork_url or "").strip() or None
+
+    if sid:
+        row = conn.execute(
+            "SELECT id, name, artwork_url FROM playlist WHERE spotify_id = ?", (sid,)
+        ).fetchone()
+        if row:
+            playlist_id = int(row["id"])
+            changes: Dict[str, Any] = {}
+            if playlist_name and playlist_name != row["name"] and playlist_name != sid:
+                existing = conn.execute(
+                    "SELECT id FROM playlist WHERE name = ? AND id != ? LIMIT 1",
+                    (playlist_name, playlist_id),
+                ).fetchone()
+                if existing:
+                    _merge_playlist_rows(conn, from_id=playlist_id, to_id=int(existing["id"]))
+                    return int(existing["id"])
+                changes["name"] = playlist_name
+            if url and url != (row.get("artwork_url") or ""):
+                changes["artwork_url"] = url
+            _update_playlist(conn, playlist_id, changes)
+            return playlist_id
+
+        if playlist_name:
+            row = conn.execute(
+                "SELECT id, artwork_url FROM playlist "
+                "WHERE name = ? AND (spotify_id IS NULL OR spotify_id = '')",
+                (playlist_name,),
+            ).fetchone()
+            if row:
+                playlist_id = int(row["id"])
+                changes = {"spotify_id": sid}
+                if url and url != (row.get("artwork_url") or ""):
+                    changes["artwork_url"] = url
+                _update_playlist(conn, playlist_id, changes)
+                return playlist_id
+
+    if playlist_name:
+        row = conn.execute(
+            "SELECT id, spotify_id, artwork_url FROM playlist WHERE name = ?", (playlist_name,)
+        ).fetchone()
+        if row:
+            playlist_id = int(row["id"])
+            changes = {}
+            if sid and sid != (row.get("spotify_id") or ""):
+                changes["spotify_id"] = sid
+            if url and url != (row.get("artwork_url") or ""):
+                changes["artwork_url"] = url
+            _update_playlist(conn, playlist_id, changes)
+            return playlist_id
+
+    if sid:
+        cur = conn.execute(
+            "INSERT INTO playlist (spotify_id, name, artwork_url) VALUES (?, ?, ?)",
+            (sid, playlist_name or sid, url),
+        )
+        return int(cur.lastrowid)
+
+    if playlist_name:
+        cur = conn.execute(
+            "INSERT INTO playlist (name, artwork_url) VALUES (?, ?)", (playlist_name, url)
+        )
+        return int(cur.lastrowid)
+
+    raise ValueError("Playlist name or spotify_id is required")
+
+
+def upsert_playlist(
+    name: str,
+    artwork_url: Optional[str] = None,
+    *,
+    spotify_id: Optional[str] = None,
+) -> int:
+    """Create or update a playlist row and return its id."""
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        playlist_id = _upsert_playlist_cur(
+            conn,
+            name=name,
+            artwork_url=artwork_url,
+            spotify_id=spotify_id,
+        )
+        conn.commit()
+        _settings.invalidate()
+        return playlist_id
+    except Exception as e:
+        conn.rollback()
+        print(f"Error upserting playlist: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def backfill_playlist_names(sp) -> int:
+    """Set playlist name and artwork from Spotify where name was stored as the Spotify ID."""
+    from spotify_playlist.fetch_playlist_info import fetch_playlist_info
+
+    conn = get_connection()
+    updated = 0
+    try:
+        _ensure_schema(conn)
+        rows = conn.execute(
+            "SELECT id, spotify_id, artwork_url FROM playlist "
+            "WHERE spotify_id IS NOT NULL AND TRIM(spotify_id) != '' "
+            "AND name = spotify_id"
+        ).fetchall()
+        for row in rows:
+            sid = (row.get("spotify_id") or "").strip()
+            if not sid:
+                continue
+            try:
+                info = fetch_playlist_info(sp, sid)
+            except ValueError:
+                continue
+            playlist_name = (info.get("name") or "").strip()
+            if not playlist_name or playlist_name == sid:
+                continue
+            artwork_url = (info.get("artwork_url") or "").strip() or None
+            row_id = int(row["id"])
+            existing = conn.execute(
+                "SELECT id FROM playlist WHERE name = ? AND id != ? LIMIT 1",
+                (playlist_name, row_id),
+            ).fetchone()
+            if existing:
+                _merge_playlist_rows(conn, from_id=row_id, to_id=int(existing["id"]))
+            else:
+                changes: Dict[str, Any] = {"name": playlist_name}
+                if artwork_url and not (row.get("artwork_url") or "").strip():
+                    changes["artwork_url"] = artwork_url
+                _update_playlist(conn, row_id, changes)
+            updated += 1
+        conn.commit()
+        if updated:
+            _settings.invalidate()
+        return updated
+    except Exception as e:
+        conn.rollback()
+        print(f"Error backfilling playlist names: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def load_playlist_snapshots(spotify_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Return the last synced snapshot_id and sync window start per Spotify playlist ID."""
+    unique_ids = [spotify_id for spotify_id in dict.fromkeys(spotify_ids) if spotify_id]
+    if not unique_ids:
+        return {}
+
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        placeholders = ", ".join(["?"] * len(unique_ids))
+        return {
+            row["spotify_id"]: {
+                "snapshot_id": row["snapshot_id"],
+                "since": parse_datetime(row.get("snapshot_since")),
+            }
+            for row in conn.execute(
+                "SELECT spotify_id, snapshot_id, snapshot_since FROM playlist "
+                f"WHERE spotify_id IN ({placeholders}) AND snapshot_id IS NOT NULL",
+                unique_ids,
+            )
+        }
+    except Exception as e:
+        print(f"Error loading playlist snapshots: {e}")
+        return {}
+    finally:
+        conn.close()
+
+
+def save_playlist_snapshots(snapshots: Dict[str, str], since: Optional[datetime]) -> None:
+    """Record the snapshot_id each source playlist had when it was last synced."""
+    rows = [
+        (snapshot_id, _db_datetime(since), spotify_id)
+        for spotify_id, snapshot_id in snapshots.items()
+        if spotify_id and snapshot_id
+    ]
+    if not rows:
+        return
+
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        conn.executemany(
+            "UPDATE playlist SET snapshot_id = ?, snapshot_since = ? WHERE spotify_id = ?",
+            rows,
+        )
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"Error saving playlist snapshots: {e}")
+    finally:
+        conn.close()
+
+
+def _try_backfill_playlist_names(sp=None) -> int:
+    """Backfill playlist names when Spotify auth is available."""
+    if sp is None:
+        try:
+            from spotify_playlist.spotify_api_client import get_quiet_spotify_client
+
+            sp = get_quiet_spotify_client()
+        except RuntimeError:
+            return 0
+    return backfill_playlist_names(sp)
+
+
+def load_playlists() -> List[Dict[str, Any]]:
+    """Load all playlists with artwork URLs."""
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        return [
+            {
+                "id": int(row["id"]),
+                "spotify_id": row.get("spotify_id") or None,
+                "name": row["name"],
+                "artwork_url": row.get("artwork_url") or None,
+            }
+            for row in conn.execute(
+                "SELECT id, spotify_id, name, artwork_url FROM playlist ORDER BY name ASC"
+            )
+        ]
+    finally:
+        conn.close()
+
+
+def load_playlist_names(spotify_ids: List[str]) -> Dict[str, str]:
+    """Return stored playlist names keyed by Spotify playlist ID."""
+    unique_ids = [spotify_id for spotify_id in dict.fromkeys(spotify_ids) if spotify_id]
+    if not unique_ids:
+        return {}
+
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        placeholders = ", ".join(["?"] * len(unique_ids))
+        return {
+            row["spotify_id"]: row["name"]
+            for row in conn.execute(
+                f"SELECT spotify_id, name FROM playlist WHERE spotify_id IN ({placeholders})",
+                unique_ids,
+            )
+            if row.get("spotify_id") and row.get("name")
+        }
+    finally:
+        conn.close()
+
+
+# Text columns compare with NOCASE where MySQL relies on utf8mb4_unicode_ci.
+_SCHEMA_V1 = (
+    "CREATE TABLE IF NOT EXISTS playlist ("
+    "id INTEGER PRIMARY KEY, "
+    "spotify_id TEXT NULL UNIQUE, "
+    "name TEXT NOT NULL COLLATE NOCASE UNIQUE, "
+    "artwork_url TEXT NULL, "
+    "snapshot_id TEXT NULL, "
+    "snapshot_since TEXT NULL"
+    ")",
+    "CREATE TABLE IF NOT EXISTS app_config ("
+    "singleton INTEGER NOT NULL PRIMARY KEY, "
+    "ui_skin TEXT NOT NULL DEFAULT 'light', "
+    "destination_playlist_ref_id INTEGER NULL REFERENCES playlist(id) ON DELETE SET NULL, "
+    "tracking_start_date TEXT NULL, "
+    "tracking_start_updated TEXT NULL, "
+    "sync_start_date TEXT NULL, "
+    "sync_start_updated TEXT NULL, "
+    "locale TEXT NOT NULL DEFAULT 'en', "
+    "artist_discovery_enabled INTEGER NOT NULL DEFAULT 1"
+    ")",
+    "INSERT OR IGNORE INTO app_config (singleton, ui_skin) VALUES (1, 'light')",
+    "CREATE TABLE IF NOT EXISTS playlist_source ("
+    "sort_order INTEGER NOT NULL, "
+    "playlist_ref_id INTEGER NOT NULL PRIMARY KEY REFERENCES playlist(id) ON DELETE CASCADE"
+    ")",
+    "CREATE INDEX IF NOT EXISTS idx_playlist_source_sort ON playlist_source (sort_order)",
+    "CREATE TABLE IF NOT EXISTS playlist_tracking ("
+    "sort_order INTEGER NOT NULL, "
+    "playlist_ref_id INTEGER NOT NULL PRIMARY KEY REFERENCES playlist(id) ON DELETE CASCADE"
+    ")",
+    "CREATE INDEX IF NOT EXISTS idx_playlist_tracking_sort ON playlist_tracking (sort_order)",
+    "CREATE TABLE IF NOT EXISTS new_tracks ("
+    "id INTEGER PRIMARY KEY, "
+    "track TEXT NOT NULL COLLATE NOCASE UNIQUE, "
+    "reference_url TEXT NULL, "
+    "playlist_id INTEGER NULL REFERENCES playlist(id) ON DELETE SET NULL, "
+    "release_year INTEGER NULL, "
+    "energy REAL NULL, "
+    "copy_title_count INTEGER NOT NULL DEFAULT 0, "
+    "image_url TEXT NULL"
+    ")",
+    "CREATE INDEX IF NOT EXISTS idx_new_tracks_playlist_track "
+    "ON new_tracks (playlist_id, track, id)",
+    "CREATE TABLE IF NOT EXISTS genre_images ("
+    "genre TEXT NOT NULL COLLATE NOCASE PRIMARY KEY, "
+    "image_url TEXT NOT NULL"
+    ")",
+    "CREATE TABLE IF NOT EXISTS historical_key ("
+    "id INTEGER PRIMARY KEY, "
+    "playlist_key TEXT NOT NULL UNIQUE"
+    ")",
+    "CREATE TABLE IF NOT EXISTS historical_track ("
+    "key_id INTEGER NOT NULL REFERENCES historical_key(id) ON DELETE CASCADE, "
+    "track_id TEXT NOT NULL, "
+    "PRIMARY KEY (key_id, track_id)"
+    ") WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS historical_tracks ("
+    "playlist_key TEXT NOT NULL, "
+    "track_uri TEXT NOT NULL, "
+    "PRIMARY KEY (playlist_key, track_uri)"
+    ") WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS artist_release_check ("
+    "artist_id TEXT NOT NULL PRIMARY KEY, "
+    "album_total INTEGER NULL, "
+    "scanned_since TEXT NULL, "
+    "last_checked TEXT NOT NULL"
+    ")",
+    "CREATE TABLE IF NOT EXISTS artist_release ("
+    "artist_id TEXT NOT NULL, "
+    "album_id TEXT NOT NULL, "
+    "album_name TEXT NULL, "
+    "album_type TEXT NULL, "
+    "release_date TEXT NULL, "
+    "tracks_json TEXT NULL, "
+    "last_checked TEXT NOT NULL, "
+    "PRIMARY KEY (artist_id, album_id)"
+    ")",
+    "CREATE INDEX IF NOT EXISTS idx_artist_release_album ON artist_release (album_id)",
+    "CREATE TABLE IF NOT EXISTS playlist_membership_state ("
+    "spotify_id TEXT NOT NULL PRIMARY KEY, "
+    "snapshot_id TEXT NOT NULL, "
+    "updated_at TEXT NOT NULL"
+    ")",
+    "CREATE TABLE IF NOT EXISTS playlist_membership ("
+    "spotify_id TEXT NOT NULL, "
+    "track_uri TEXT NOT NULL, "
+    "PRIMARY KEY (spotify_id, track_uri)"
+    ") WITHOUT ROWID",
+)
+
+
+def _create_schema(conn) -> None:
+    for statement in _SCHEMA_V1:
+        conn.execute(statement)
+
+
+def _add_app_config_version(conn) -> None:
+    """Counter bumped by every settings save so cached copies in other processes reload."""
+    conn.execute(
+        "ALTER TABLE app_config ADD COLUMN config_version INTEGER NOT NULL DEFAULT 0"
+    )
+
+
+def _create_new_tracks_fts(conn) -> None:
+    """Trigram FTS5 index over new_tracks.track for search_new_tracks, kept in sync by triggers."""
+    conn.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS new_tracks_fts USING fts5("
+        "track, content='new_tracks', content_rowid='id', tokenize='trigram')"
+    )
+    conn.execute(
+        "CREATE TRIGGER IF NOT EXISTS new_tracks_fts_insert AFTER INSERT ON new_tracks BEGIN "
+        "INSERT INTO new_tracks_fts (rowid, track) VALUES (new.id, new.track); END"
+    )
+    conn.execute(
+        "CREATE TRIGGER IF NOT EXISTS new_tracks_fts_delete AFTER DELETE ON new_tracks BEGIN "
+        "INSERT INTO new_tracks_fts (new_tracks_fts, rowid, track) "
+        "VALUES ('delete', old.id, old.track); END"
+    )
+    conn.execute(
+        "CREATE TRIGGER IF NOT EXISTS new_tracks_fts_update AFTER UPDATE OF track ON new_tracks BEGIN "
+        "INSERT INTO new_tracks_fts (new_tracks_fts, rowid, track) "
+        "VALUES ('delete', old.id, old.track); "
+        "INSERT INTO new_tracks_fts (rowid, track) VALUES (new.id, new.track); END"
+    )
+    conn.execute("INSERT INTO new_tracks_fts (new_tracks_fts) VALUES ('rebuild')")
+
+
+def _create_job_table(conn) -> None:
+    """Web-triggered sync, import and download jobs (see spotify_playlist.job_queue)."""
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS job ("
+        "job_id TEXT NOT NULL PRIMARY KEY, "
+        "kind TEXT NOT NULL, "
+        "status TEXT NOT NULL, "
+        "worker_pid INTEGER NULL, "
+        "state TEXT NOT NULL, "
+        "created_at TEXT NOT NULL, "
+        "updated_at TEXT NOT NULL"
+        ")"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_job_kind_status ON job (kind, status, updated_at)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_job_status_updated ON job (status, updated_at)")
+
+
+def _create_historical_track_id_index(conn) -> None:
+    """Index on historical_track.track_id so iter_historical_track_ids reads in index order."""
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_historical_track_id ON historical_track (track_id)"
+    )
+
+
+# Ordered schema migrations tracked in PRAGMA user_version. Append new steps; never renumber.
+_MIGRATIONS: tuple[tuple[int, str, Callable[[Any], None]], ...] = (
+    (1, "initial schema", _create_schema),
+    (2, "app_config settings version", _add_app_config_version),
+    (3, "new_tracks full-text search index", _create_new_tracks_fts),
+    (4, "job table", _create_job_table),
+    (5, "historical_track track_id index", _create_historical_track_id_index),
+)
+_schema_lock = threading.Lock()
+_schema_version: Optional[int] = None
+
+
+def _run_migrations(conn) -> int:
+    # BEGIN IMMEDIATE serialises migrations across the CLI, web server and job processes.
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        version = int(conn.execute("PRAGMA user_version").fetchone()["user_version"])
+        for step, _description, migrate in _MIGRATIONS:
+            if step <= version:
+                continue
+            migrate(conn)
+            conn.execute(f"PRAGMA user_version = {int(step)}")
+            version = step
+        conn.commit()
+        return version
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def _ensure_schema(conn) -> None:
+    """Bring the schema up to date once per process; later calls return immediately."""
+    global _schema_version
+    if _schema_version is not None:
+        return
+    with _schema_lock:
+        if _schema_version is None:
+            _schema_version = _run_migrations(conn)
+
+
+def _resolve_playlist_id_from_entry(
+    conn, entry: Dict[str, Any], cache: Optional[Dict[str, Optional[int]]] = None
+) -> Optional[int]:
+    playlist_id = entry.get("playlist_id")
+    if playlist_id is not None:
+        return int(playlist_id)
+    genre_value = (entry.get("genre") or "").strip() or None
+    if not genre_value:
+        return None
+    if cache is None:
+        return _upsert_playlist_cur(conn, name=genre_value)
+    if genre_value not in cache:
+        cache[genre_value] = _upsert_playlist_cur(conn, name=genre_value)
+    return cache[genre_value]
+
+
+_NEW_TRACKS_SELECT = (
+    "SELECT nt.id, nt.track, nt.reference_url, nt.playlist_id, nt.release_year, nt.energy, "
+    "nt.copy_title_count, nt.image_url, p.name AS genre, "
+    "p.artwork_url AS playlist_artwork_url "
+    "FROM new_tracks nt "
+    "LEFT JOIN playlist p ON p.id = nt.playlist_id "
+)
+
+
+def _row_to_track(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": row["id"],
+        "track": row["track"],
+        "reference_url": row["reference_url"] or None,
+        "playlist_id": row.get("playlist_id") or None,
+        "genre": row.get("genre") or None,
+        "release_year": row.get("release_year") or None,
+        "energy": float(row["energy"]) if row.get("energy") is not None else None,
+        "copy_title_count": int(row.get("copy_title_count") or 0),
+        "image_url": row.get("image_url") or None,
+        "playlist_artwork_url": row.get("playlist_artwork_url") or None,
+    }
+
+
+def iter_new_tracks(has_url: Optional[bool] = None) -> Iterator[NewTrack]:
+    """Stream new_tracks rows ordered by track name as compact NewTrack tuples.
+
+    SQLite steps the query one row at a time, so memory stays flat however
+    large the backlog is.
+    """
+    sql = _NEW_TRACKS_SELECT
+    if has_url is True:
+        sql += "WHERE nt.reference_url IS NOT NULL AND nt.reference_url != '' "
+    elif has_url is False:
+        sql += "WHERE nt.reference_url IS NULL OR nt.reference_url = '' "
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        cur = conn.cursor()
+        cur.row_factory = None
+        try:
+            for row in cur.execute(sql + "ORDER BY nt.track ASC"):
+                yield new_track_from_row(row)
+        finally:
+            cur.close()
+    finally:
+        conn.close()
+
+
+def load_new_tracks() -> List[Dict[str, Any]]:
+    """Load all new_tracks rows ordered by track name."""
+    return [track._asdict() for track in iter_new_tracks()]
+
+
+def _new_tracks_filters(
+    genre: Optional[str], playlist_id: Optional[int], has_url: Optional[bool]
+) -> tuple[List[str], List[Any]]:
+    where: List[str] = []
+    params: List[Any] = []
+    if playlist_id is not None:
+        where.append("nt.playlist_id = ?")
+        params.append(int(playlist_id))
+    if genre:
+        if genre == UNCATEGORIZED_GENRE:
+            where.append("(p.id IS NULL OR TRIM(p.name) = '')")
+        else:
+            where.append("p.name = ?")
+            params.append(genre)
+    if has_url is True:
+        where.append("nt.reference_url IS NOT NULL AND nt.reference_url != ''")
+    elif has_url is False:
+        where.append("(nt.reference_url IS NULL OR nt.reference_url = '')")
+    return where, params
+
+
+def query_new_tracks(
+    genre: Optional[str] = None,
+    playlist_id: Optional[int] = None,
+    has_url: Optional[bool] = None,
+    search: Optional[str] = None,
+    limit: Optional[int] = None,
+    after: Optional[tuple[str, int]] = None,
+) -> List[Dict[str, Any]]:
+    """Load new_tracks filtered in SQL, ordered by (track, id).
+
+    Same filters and keyset cursor as ``mysql_store.query_new_tracks``.
+    """
+    where, params = _new_tracks_filters(genre, playlist_id, has_url)
+    term = (search or "").strip()
+    if term:
+        escaped = escape_like(term)
+        where.append("nt.track LIKE ? ESCAPE '\\'")
+        params.append(f"%{escaped}%")
+    if after is not None:
+        after_track, after_id = after
+        where.append("(nt.track > ? OR (nt.track = ? AND nt.id > ?))")
+        params.extend([after_track, after_track, int(after_id)])
+
+    sql = _NEW_TRACKS_SELECT
+    if where:
+        sql += "WHERE " + " AND ".join(where) + " "
+    sql += "ORDER BY nt.track ASC, nt.id ASC"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(max(1, int(limit)))
+
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        return [_row_to_track(row) for row in conn.execute(sql, params)]
+    finally:
+        conn.close()
+
+
+# The trigram tokenizer needs three characters; shorter words fall back to LIKE.
+_FULLTEXT_MIN_TERM = 3
+
+
+def search_new_tracks(
+    query: str,
+    genre: Optional[str] = None,
+    has_url: Optional[bool] = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    """Full-text search over new_tracks.track, best matches first.
+
+    Same contract as ``mysql_store.search_new_tracks``, backed by the
+    new_tracks_fts table and ranked by bm25.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    where, params = _new_tracks_filters(genre, None, has_url)
+    indexed = [term for term in terms if len(term) >= _FULLTEXT_MIN_TERM]
+    for term in terms:
+        if len(term) < _FULLTEXT_MIN_TERM:
+            where.append("nt.track LIKE ? ESCAPE '\\'")
+            params.append(f"%{escape_like(term)}%")
+
+    sql = _NEW_TRACKS_SELECT
+    order_by = "nt.track ASC, nt.id ASC"
+    if indexed:
+        sql += "JOIN new_tracks_fts f ON f.rowid = nt.id "
+        where.insert(0, "new_tracks_fts MATCH ?")
+        params.insert(0, " ".join(f'"{term}"' for term in indexed))
+        order_by = "f.rank, " + order_by
+    sql += "WHERE " + " AND ".join(where) + f" ORDER BY {order_by} LIMIT ? OFFSET ?"
+    params.extend([max(1, int(limit)), max(0, int(offset))])
+
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        return [_row_to_track(row) for row in conn.execute(sql, params)]
+    finally:
+        conn.close()
+
+
+def update_new_track_reference_url(track_id: int, reference_url: Optional[str]) -> bool:
+    """Update reference_url for a single new_tracks row. Empty string clears the URL."""
+    url = normalize_reference_url(reference_url)
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        updated = conn.execute(
+            "UPDATE new_tracks SET reference_url = ? WHERE id = ?", (url, track_id)
+        ).rowcount > 0
+        conn.commit()
+        return updated
+    except Exception as e:
+        conn.rollback()
+        print(f"Error updating reference URL: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def increment_new_track_copy_title_count(track_id: int) -> Optional[int]:
+    """Increment copy_title_count for a track. Returns new count or None if not found."""
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        row = conn.execute(
+            "UPDATE new_tracks SET copy_title_count = copy_title_count + 1 WHERE id = ? "
+            "RETURNING copy_title_count",
+            (track_id,),
+        ).fetchone()
+        conn.commit()
+        return int(row["copy_title_count"]) if row else None
+    except Exception as e:
+        conn.rollback()
+        print(f"Error incrementing copy title count: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def delete_new_track(track_id: int) -> bool:
+    """Delete a single new_tracks row."""
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        deleted = conn.execute("DELETE FROM new_tracks WHERE id = ?", (track_id,)).rowcount > 0
+        conn.commit()
+        return deleted
+    except Exception as e:
+        conn.rollback()
+        print(f"Error deleting track: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def strip_radio_suffixes_from_db() -> tuple[int, int]:
+    """Remove radio edit/mix suffixes from new_tracks.
+
+    Same resolution as ``mysql_store.strip_radio_suffixes_from_db``: names are
+    normalized once, staged in a temporary table and applied set-wise.
+    """
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        rows = []
+        for row in conn.execute(
+            "SELECT id, track, reference_url FROM new_tracks "
+            "WHERE track LIKE '%radio edit%' OR track LIKE '%radio mix%' ORDER BY id"
+        ):
+            normalized = normalize_track_name(row["track"])
+            if normalized != row["track"]:
+                rows.append((row["id"], normalized, row["reference_url"]))
+        if not rows:
+            return 0, 0
+
+        conn.execute("DROP TABLE IF EXISTS temp.radio_strip")
+        conn.execute(
+            "CREATE TEMP TABLE radio_strip ("
+            "id INTEGER PRIMARY KEY, "
+            "track TEXT NOT NULL COLLATE NOCASE, "
+            "reference_url TEXT NULL, "
+            "group_min INTEGER NULL, "
+            "keeper_id INTEGER NULL"
+            ")"
+        )
+        conn.execute("CREATE INDEX temp.idx_radio_strip_track ON radio_strip (track)")
+        conn.executemany(
+            "INSERT INTO radio_strip (id, track, reference_url) VALUES (?, ?, ?)", rows
+        )
+        # Clean name already taken by another row: merge into that row.
+        conn.execute(
+            "UPDATE radio_strip SET keeper_id = ("
+            "  SELECT MIN(nt.id) FROM new_tracks nt "
+            "  WHERE nt.track = radio_strip.track AND nt.id != radio_strip.id"
+            ")"
+        )
+        # Otherwise the lowest id per clean name keeps it; its siblings merge into it.
+        conn.execute(
+            "UPDATE radio_strip SET group_min = ("
+            "  SELECT MIN(r.id) FROM radio_strip r "
+            "  WHERE r.track = radio_strip.track AND r.keeper_id IS NULL"
+            ") WHERE keeper_id IS NULL"
+        )
+        conn.execute(
+            "UPDATE radio_strip SET keeper_id = group_min "
+            "WHERE keeper_id IS NULL AND group_min != id"
+        )
+        # A survivor without a URL takes it from its first merged row that has one.
+        conn.execute(
+            "UPDATE new_tracks SET reference_url = ("
+            "  SELECT r.reference_url FROM radio_strip r "
+            "  WHERE r.keeper_id = new_tracks.id "
+            "  AND r.reference_url IS NOT NULL AND r.reference_url != '' "
+            "  ORDER BY r.id LIMIT 1"
+            ") "
+            "WHERE (reference_url IS NULL OR reference_url = '') AND id IN ("
+            "  SELECT keeper_id FROM radio_strip "
+            "  WHERE reference_url IS NOT NULL AND reference_url != ''"
+            ")"
+        )
+        deleted = conn.execute(
+            "DELETE FROM new_tracks WHERE id IN "
+            "(SELECT id FROM radio_strip WHERE keeper_id IS NOT NULL)"
+        ).rowcount
+        conn.execute(
+            "UPDATE new_tracks SET track = "
+            "(SELECT r.track FROM radio_strip r WHERE r.id = new_tracks.id) "
+            "WHERE id IN (SELECT id FROM radio_strip WHERE keeper_id IS NULL)"
+        )
+        conn.execute("DROP TABLE temp.radio_strip")
+        conn.commit()
+        return len(rows) - deleted, deleted
+    except Exception as e:
+        conn.rollback()
+        print(f"Error cleaning radio edit/mix suffixes: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def create_new_track(
+    track: str,
+    reference_url: Optional[str] = None,
+    genre: Optional[str] = None,
+    energy: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Insert a single new_tracks row. Raises ValueError if track is empty or already exists."""
+    track_name = normalize_track_name((track or "").strip())
+    if not track_name:
+        raise ValueError("Track name is required")
+
+    url = normalize_reference_url(reference_url)
+    genre_value = (genre or "").strip() or None
+    energy_value = normalize_energy(energy)
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        playlist_id = None
+        if genre_value:
+            playlist_id = _upsert_playlist_cur(conn, name=genre_value)
+        track_id = conn.execute(
+            "INSERT INTO new_tracks (track, reference_url, playlist_id, release_year, energy) "
+            "VALUES (?, ?, ?, NULL, ?)",
+            (track_name, url, playlist_id, energy_value),
+        ).lastrowid
+        conn.commit()
+        return {
+            "id": track_id,
+            "track": track_name,
+            "reference_url": url,
+            "playlist_id": playlist_id,
+            "genre": genre_value,
+            "energy": energy_value,
+            "copy_title_count": 0,
+            "image_url": None,
+        }
+    except sqlite3.IntegrityError as e:
+        conn.rollback()
+        raise ValueError("Track already exists") from e
+    except Exception as e:
+        conn.rollback()
+        print(f"Error adding track: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def save_new_tracks(tracks: List[Dict[str, Any]], replace: bool = False) -> tuple[int, int]:
+    """Persist tracks (track + reference_url, optional genre, release_year, energy)."""
+    if not tracks:
+        return 0, 0
+
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        rows = []
+        seen_in_batch: set[str] = set()
+        playlist_ids: Dict[str, Optional[int]] = {}
+        total_valid = 0
+        for entry in tracks:
+            track_display = normalize_track_name(entry.get("track") or entry.get("Track") or "")
+            if not track_display:
+                continue
+            total_valid += 1
+            if track_display in seen_in_batch:
+                continue
+            seen_in_batch.add(track_display)
+            rows.append(
+                (
+                    track_display,
+                    normalize_reference_url(entry.get("reference_url")),
+                    _resolve_playlist_id_from_entry(conn, entry, playlist_ids),
+                    normalize_release_year(entry.get("release_year")),
+                    normalize_energy(entry.get("energy")),
+                    (entry.get("image_url") or "").strip() or None,
+                )
+            )
+
+        if not rows:
+            return 0, total_valid
+
+        insert_sql = (
+            "INSERT INTO new_tracks (track, reference_url, playlist_id, release_year, energy, image_url) "
+            "VALUES (?, ?, ?, ?, ?, ?)"
+        )
+        if replace:
+            conn.execute("DELETE FROM new_tracks")
+            conn.executemany(insert_sql, rows)
+            inserted = len(rows)
+        else:
+            inserted = max(
+                conn.executemany(insert_sql + " ON CONFLICT(track) DO NOTHING", rows).rowcount, 0
+            )
+        conn.commit()
+        if any(row[5] for row in rows):
+            _backfill_playlist_artwork(conn)
+        skipped = 0 if replace else total_valid - inserted
+        return inserted, skipped
+    except Exception as e:
+        conn.rollback()
+        print(f"Error saving new tracks: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def load_genre_images() -> Dict[str, str]:
+    """Load playlist cover art URLs keyed by playlist name."""
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        return {
+            row["name"]: row["artwork_url"]
+            for row in conn.execute(
+                "SELECT name, artwork_url FROM playlist WHERE artwork_url IS NOT NULL"
+            )
+            if row.get("name") and row.get("artwork_url")
+        }
+    finally:
+        conn.close()
+
+
+_GENRE_COUNTS_SQL = (
+    "SELECT g.playlist_id, p.name AS genre, g.track_count, "
+    "COALESCE(NULLIF(TRIM(p.artwork_url), ''), gi.image_url, fi.image_url) AS image_url "
+    "FROM (SELECT playlist_id, COUNT(*) AS track_count FROM new_tracks GROUP BY playlist_id) g "
+    "LEFT JOIN playlist p ON p.id = g.playlist_id "
+    "LEFT JOIN genre_images gi ON gi.genre = p.name "
+    "LEFT JOIN ("
+    "  SELECT playlist_id, image_url FROM ("
+    "    SELECT playlist_id, image_url, "
+    "    ROW_NUMBER() OVER (PARTITION BY playlist_id ORDER BY track, id) AS rn "
+    "    FROM new_tracks "
+    "    WHERE playlist_id IS NOT NULL AND image_url IS NOT NULL AND image_url != ''"
+    "  ) ranked WHERE rn = 1"
+    ") fi ON fi.playlist_id = g.playlist_id"
+)
+
+
+def load_genre_counts() -> List[Dict[str, Any]]:
+    """Count tracks per playlist/genre and resolve each one's image in a single query.
+
+    Same result shape as ``mysql_store.load_genre_counts``.
+    """
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        counts: Dict[Optional[str], Dict[str, Any]] = {}
+        for row in conn.execute(_GENRE_COUNTS_SQL):
+            genre = (row.get("genre") or "").strip() or None
+            entry = counts.setdefault(
+                genre, {"genre": genre, "track_count": 0, "image_url": None}
+            )
+            entry["track_count"] += int(row["track_count"])
+            if genre is not None and not entry["image_url"]:
+                entry["image_url"] = row.get("image_url") or None
+        return list(counts.values())
+    finally:
+        conn.close()
+
+
+def save_genre_image(genre: str, image_url: Optional[str]) -> None:
+    """Persist cover art for a playlist (by name)."""
+    genre_name = (genre or "").strip()
+    url = (image_url or "").strip()
+    if not genre_name or not url:
+        return
+    upsert_playlist(genre_name, url)
+
+
+def resolve_genre_image(
+    genre: str,
+    *,
+    genre_images: Optional[Dict[str, str]] = None,
+    tracks: Optional[List[Dict[str, Any]]] = None,
+) -> Optional[str]:
+    """Return playlist artwork, falling back to the first track image in that playlist."""
+    genre_name = (genre or "").strip()
+    if not genre_name:
+        return None
+
+    images = genre_images if genre_images is not None else load_genre_images()
+    if genre_name in images:
+        return images[genre_name]
+
+    conn = get_connection()
+    try:
+        _ensure_schema(conn)
+        row = conn.execute(
+            "SELECT artwork_url FROM playlist WHERE name = ? LIMIT 1", (genre_name,)
+        ).fetchone()
+        if row and row.get("artwork_url"):
+            return row["artwork_url"]
+    finally:
+        conn.close()
+
+    if tracks is None:
+        tracks = load_new_tracks()
+    for track in tracks:
+        if (track.get("genre") or "").strip() != genre_name:
+            continue
+        artwork = track.get("playlist_artwork_url") or track.get("image_url")
+        if artwork:
+            return artwork
+    return None
+
+
+def _job_timestamp() -> str:
+    # Microseconds keep the updated_at ordering of rapid progress writes.
+    return utc_now().isoformat(sep=" ", timespec="microseconds")
+
+
+def create_job(job_id: str, kind: str, fields: Dict[str, Any]) -> None:
+    """Insert a job row; ``fields`` holds status, worker_pid and the JSON state."""
+    columns, state = split_job_fields(fields)
+    now = _job_timestamp()
+    conn = _job_connection()
+    try:
+        _ensure_schema(conn)
+        conn.execute(
+            "INSERT INTO job (job_id, kind, status, worker_pid, state, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                job_id,
+                kind,
+                columns.get("status") or "running",
+                columns.get("worker_pid"),
+                json.dumps(state, ensure_ascii=False),
+                now,
+                now,
+            ),
+        )
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"Error creating job: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def update_job(job_id: str, fields: Dict[str, Any], *, expected_status: Optional[str] = None) -> bool:
+    """Merge ``fields`` into a job (see ``mysql_store.update_job``)."""
+    columns, state_updates = split_job_fields(fields)
+    conn = _job_connection()
+    try:
+        _ensure_schema(conn)
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(
+            "SELECT status, worker_pid, state FROM job WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        if row is None or (expected_status is not None and row["status"] != expected_status):
+            conn.rollback()
+            return False
+        state = json.loads(row["state"] or "{}")
+        state.update(state_updates)
+        conn.execute(
+            "UPDATE job SET status = ?, worker_pid = ?, state = ?, updated_at = ? WHERE job_id = ?",
+            (
+                columns.get("status", row["status"]),
+                columns.get("worker_pid", row["worker_pid"]),
+                json.dumps(state, ensure_ascii=False),
+                _job_timestamp(),
+                job_id,
+            ),
+        )
+        conn.commit()
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"Error updating job: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def load_job(job_id: str) -> Optional[Dict[str, Any]]:
+    conn = _job_connection()
+    try:
+        _ensure_schema(conn)
+        row = conn.execute("SELECT * FROM job WHERE job_id = ?", (job_id,)).fetchone()
+        return job_from_row(row) if row else None
+    finally:
+        conn.close()
+
+
+def load_running_jobs(kind: str) -> List[Dict[str, Any]]:
+    """Running jobs of one kind, most recently updated first."""
+    conn = _job_connection()
+    try:
+        _ensure_schema(conn)
+        rows = conn.execute(
+            "SELECT * FROM job WHERE kind = ? AND status = 'running' ORDER BY updated_at DESC",
+            (kind,),
+        ).fetchall()
+        return [job_from_row(row) for row in rows]
+    finally:
+        conn.close()
+
+
+def delete_finished_jobs(retention_days: int) -> int:
+    """Delete jobs that finished more than ``retention_days`` ago."""
+    cutoff = utc_now() - timedelta(days=retention_days)
+    conn = _job_connection()
+    try:
+        _ensure_schema(conn)
+        deleted = conn.execute(
+            "DELETE FROM job WHERE status != 'running' AND updated_at < ?",
+            (cutoff.isoformat(sep=" ", timespec="microseconds"),),
+        ).rowcount
+        conn.commit()
+        return deleted
+    except Exception as e:
+        conn.rollback()
+        print(f"Error deleting finished jobs: {e}")
+        raise
+    finally:
+        conn.close()
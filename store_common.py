@@ -1,10 +1,21 @@
-"""Shared helpers for MySQL storage."""
+"""Shared helpers for the storage backends."""
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, Optional
+import json
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
 from urllib.parse import parse_qs, urlparse
 
+TRACK_URI_PREFIX = "spotify:track:"
+TRACK_ID_LENGTH = 22
+DEFAULT_SYNC_DAYS_BACK = 7
+UNCATEGORIZED_GENRE = "Uncategorized"
+_VALID_UI_SKINS = frozenset({"light", "dark", "retroui", "winxp"})
+_VALID_LOCALES = frozenset({"en", "nl", "brab"})
+# Job fields stored in their own (indexed) columns; the rest is the job's JSON state.
+JOB_COLUMNS = ("status", "worker_pid")
+
 
 def dt_to_iso_str(value: Any) -> Optional[str]:
     if value is None:
@@ -59,3 +70,106 @@ def normalize_reference_url(url: Optional[str]) -> Optional[str]:
         return f"https://www.youtube.com/watch?v={video_id}"
 
     return cleaned
+
+
+def search_terms(query: Optional[str]) -> List[str]:
+    """Split a search box query into words; quotes and full-text operators are dropped."""
+    return re.findall(r"\w+", query or "")
+
+
+def escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def track_id_from_uri(uri: str) -> Optional[str]:
+    """Return the 22-character base62 id of a track URI, or None for other URIs."""
+    if uri.startswith(TRACK_URI_PREFIX) and len(uri) == len(TRACK_URI_PREFIX) + TRACK_ID_LENGTH:
+        return uri[len(TRACK_URI_PREFIX):]
+    return None
+
+
+def normalize_ui_skin(skin: Optional[str]) -> str:
+    value = (skin or "light").strip().lower()
+    if value in {"neon", "colorful"}:
+        value = "winxp"
+    elif value == "simple":
+        value = "light"
+    return value if value in _VALID_UI_SKINS else "light"
+
+
+def normalize_locale(locale: Optional[str]) -> str:
+    value = (locale or "en").strip().lower()
+    return value if value in _VALID_LOCALES else "en"
+
+
+class NewTrack(NamedTuple):
+    """One new_tracks row as yielded by ``iter_new_tracks`` (a plain tuple, no per-row dict)."""
+
+    id: int
+    track: str
+    reference_url: Optional[str]
+    playlist_id: Optional[int]
+    genre: Optional[str]
+    release_year: Optional[int]
+    energy: Optional[float]
+    copy_title_count: int
+    image_url: Optional[str]
+    playlist_artwork_url: Optional[str]
+
+
+def new_track_from_row(row: Sequence[Any]) -> NewTrack:
+    """Build a NewTrack from a tuple row in the backends' ``_NEW_TRACKS_SELECT`` column order."""
+    (
+        track_id,
+        track,
+        reference_url,
+        playlist_id,
+        release_year,
+        energy,
+        copy_title_count,
+        image_url,
+        genre,
+        playlist_artwork_url,
+    ) = row
+    return NewTrack(
+        id=track_id,
+        track=track,
+        reference_url=reference_url or None,
+        playlist_id=playlist_id or None,
+        genre=genre or None,
+        release_year=release_year or None,
+        energy=float(energy) if energy is not None else None,
+        copy_title_count=int(copy_title_count or 0),
+        image_url=image_url or None,
+        playlist_artwork_url=playlist_artwork_url or None,
+    )
+
+
+def utc_now() -> datetime:
+    """Naive UTC timestamp, as stored in the job table."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def split_job_fields(fields: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Split job fields into (column values, JSON state values)."""
+    columns = {key: value for key, value in fields.items() if key in JOB_COLUMNS}
+    state = {
+        key: value
+        for key, value in fields.items()
+        if key not in JOB_COLUMNS and key not in ("job_id", "kind", "created_at", "updated_at")
+    }
+    return columns, state
+
+
+def job_from_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a job row (columns plus JSON state) into one dict."""
+    job = json.loads(row.get("state") or "{}")
+    job.update(
+        job_id=row["job_id"],
+        kind=row["kind"],
+        status=row["status"],
+        worker_pid=row.get("worker_pid"),
+        created_at=dt_to_iso_str(parse_datetime(row.get("created_at"))),
+        updated_at=dt_to_iso_str(parse_datetime(row.get("updated_at"))),
+    )
+    return job